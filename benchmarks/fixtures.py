@@ -0,0 +1,73 @@
+"""Generated fixture pages and a local HTTP server for the benchmarks"""
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+SVG_IMAGE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="64" height="64">'
+    '<rect width="64" height="64" fill="#{color:06x}"/></svg>'
+)
+
+
+def write_file(path, content):
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def generate_fixtures(root, dom_nodes=20000, images=200, scripts=100):
+    """Write the fixture pages into root and return their relative paths"""
+    os.makedirs(os.path.join(root, 'img'), exist_ok=True)
+    os.makedirs(os.path.join(root, 'js'), exist_ok=True)
+
+    write_file(os.path.join(root, 'blank.html'),
+               "<!DOCTYPE html><html><head><title>Blank</title></head><body></body></html>")
+
+    rows = ''.join(
+        f'<div class="row"><span>Item {i}</span><a href="#item{i}">link {i}</a></div>'
+        for i in range(dom_nodes)
+    )
+    write_file(os.path.join(root, 'heavy_dom.html'),
+               f"<!DOCTYPE html><html><head><title>Heavy DOM</title></head><body>{rows}</body></html>")
+
+    for i in range(images):
+        write_file(os.path.join(root, 'img', f'{i}.svg'), SVG_IMAGE.format(color=(i * 2654435761) & 0xffffff))
+    tags = ''.join(f'<img src="img/{i}.svg" width="64" height="64">' for i in range(images))
+    write_file(os.path.join(root, 'many_images.html'),
+               f"<!DOCTYPE html><html><head><title>Many Images</title></head><body>{tags}</body></html>")
+
+    for i in range(scripts):
+        write_file(os.path.join(root, 'js', f'{i}.js'),
+                   f"window.fixture{i} = (function() {{ var s = 0; for (var j = 0; j < 10000; j++) s += j; return s; }})();")
+    tags = ''.join(f'<script src="js/{i}.js"></script>' for i in range(scripts))
+    write_file(os.path.join(root, 'many_scripts.html'),
+               f"<!DOCTYPE html><html><head><title>Many Scripts</title>{tags}</head><body>scripts</body></html>")
+
+    return ['blank.html', 'heavy_dom.html', 'many_images.html', 'many_scripts.html']
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serve a directory over HTTP on localhost from a background thread"""
+
+    def __init__(self, root):
+        handler = functools.partial(QuietHandler, directory=root)
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,316 @@
+"""Headless benchmarks for LightPy Browser
+
+Runs BrowserWindow on the offscreen Qt platform against generated fixture
+pages served from localhost and writes a JSON report. Run from the
+repository root:
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --compare old.json new.json
+
+Every run uses one engine performance profile (--perf-profile), so runs
+of different profiles on the same machine and fixtures can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from benchmarks.fixtures import FixtureServer, generate_fixtures
+
+
+def summarize(samples):
+    """Summary statistics for a list of millisecond samples"""
+    ordered = sorted(samples)
+    return {
+        'samples': len(ordered),
+        'mean': statistics.mean(ordered),
+        'median': statistics.median(ordered),
+        'p90': ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def wait_for(signal, trigger, timeout_ms=30000):
+    """Call trigger and run the event loop until signal fires; returns its args or None"""
+    from PyQt5.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    result = []
+
+    def handler(*args):
+        result.append(args)
+        loop.quit()
+
+    signal.connect(handler)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    trigger()
+    if not result:
+        loop.exec_()
+    signal.disconnect(handler)
+    return result[0] if result else None
+
+
+def total_rss_mb(window):
+    """RSS of the browser process plus every distinct renderer process"""
+    from browser.tab_discarder import read_process_rss_mb
+
+    pids = {os.getpid()}
+    for i in range(window.tab_manager.count()):
+        widget = window.tab_manager.widget(i)
+        if not hasattr(widget, 'page'):
+            continue
+        page = widget.page()
+        if hasattr(page, 'renderProcessPid') and page.renderProcessPid():
+            pids.add(page.renderProcessPid())
+    return sum(read_process_rss_mb(pid) or 0 for pid in pids)
+
+
+def bench_tab_open(window, url, count):
+    open_samples = []
+    load_samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        browser = window.add_new_tab(url)
+        open_samples.append((time.perf_counter() - start) * 1000)
+        wait_for(browser.loadFinished, lambda: None)
+        load_samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'tab_open_ms': summarize(open_samples),
+        'tab_open_to_load_finished_ms': summarize(load_samples),
+        'view_pool_hit_rate': window.get_view_pool_stats()['hit_rate'],
+    }
+
+
+def bench_navigation(window, base_url, pages, rounds):
+    results = {}
+    browser = window.get_current_browser()
+    from PyQt5.QtCore import QUrl
+    for page in pages:
+        samples = []
+        for i in range(rounds):
+            url = QUrl(f"{base_url}{page}?run={i}")
+            start = time.perf_counter()
+            if wait_for(browser.loadFinished, lambda: browser.setUrl(url)) is not None:
+                samples.append((time.perf_counter() - start) * 1000)
+        if samples:
+            results[f'navigation_ms[{page}]'] = summarize(samples)
+    return results
+
+
+def bench_tab_switch(window, url, tabs, rounds):
+    from PyQt5.QtWidgets import QApplication
+
+    while window.tab_manager.count() < tabs:
+        browser = window.add_new_tab(url)
+        wait_for(browser.loadFinished, lambda: None)
+    samples = []
+    for i in range(rounds):
+        index = i % window.tab_manager.count()
+        start = time.perf_counter()
+        window.tab_manager.setCurrentIndex(index)
+        QApplication.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'tab_switch_ms': summarize(samples)}
+
+
+def bench_bookmark_toggle(window, sizes, rounds):
+    results = {}
+    manager = window.bookmark_manager
+    for size in sizes:
+        synthetic = [
+            {'url': f"https://bookmark{i}.example.com/page/{i}", 'title': f"Bookmark {i}"}
+            for i in range(size)
+        ]
+        manager.add_bookmarks(synthetic)
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            window.toggle_bookmark()
+            samples.append((time.perf_counter() - start) * 1000)
+        if window.bookmark_manager.is_bookmarked(window.get_current_browser().url().toString()):
+            window.toggle_bookmark()
+        manager.remove_bookmarks([b['url'] for b in synthetic])
+        results[f'bookmark_toggle_ms[{size}]'] = summarize(samples)
+    return results
+
+
+def bench_bookmark_import(window, sizes, rounds):
+    """Parse time per file format and add_bookmarks time per import batch"""
+    from browser.bookmark_formats import (
+        parse_chrome_json, parse_netscape_html, write_chrome_json, write_netscape_html,
+    )
+    from browser.bookmark_io import IMPORT_BATCH
+
+    results = {}
+    manager = window.bookmark_manager
+    formats = {
+        'html': (write_netscape_html, parse_netscape_html),
+        'json': (write_chrome_json, parse_chrome_json),
+    }
+    with tempfile.TemporaryDirectory() as root:
+        for size in sizes:
+            synthetic = [
+                {'url': f"https://import{i}.example.com/?a={i}&b=\"{i}\"", 'title': f"Import & <{i}>"}
+                for i in range(size)
+            ]
+            for fmt, (write, parse) in formats.items():
+                path = os.path.join(root, f'bookmarks-{size}.{fmt}')
+                with open(path, 'w', encoding='utf-8') as f:
+                    write(synthetic, f)
+                samples = []
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    with open(path, 'r', encoding='utf-8') as f:
+                        for _bookmark in parse(f):
+                            pass
+                    samples.append((time.perf_counter() - start) * 1000)
+                results[f'bookmark_parse_ms[{fmt},{size}]'] = summarize(samples)
+
+            samples = []
+            for offset in range(0, size, IMPORT_BATCH):
+                start = time.perf_counter()
+                manager.add_bookmarks(synthetic[offset:offset + IMPORT_BATCH])
+                samples.append((time.perf_counter() - start) * 1000)
+            manager.remove_bookmarks([b['url'] for b in synthetic])
+            results[f'bookmark_import_batch_ms[{size}]'] = summarize(samples)
+    return results
+
+
+def bench_rss_per_tab(window, url, tabs):
+    from PyQt5.QtWidgets import QApplication
+
+    QApplication.processEvents()
+    before = total_rss_mb(window)
+    for _ in range(tabs):
+        browser = window.add_new_tab(url)
+        wait_for(browser.loadFinished, lambda: None)
+    after = total_rss_mb(window)
+    return {
+        'rss_total_mb': after,
+        'rss_per_tab_mb': (after - before) / tabs,
+    }
+
+
+def run(args):
+    from PyQt5.QtCore import QStandardPaths, QT_VERSION_STR, PYQT_VERSION_STR
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5 import QtWebEngineWidgets
+    from browser.settings import apply_performance_profile, resolve_performance_profile
+
+    # The engine reads its flags when the application starts
+    args.perf_profile = resolve_performance_profile(args.perf_profile)
+    flags = apply_performance_profile(args.perf_profile)
+
+    # Keep benchmark data out of the user's profile
+    QStandardPaths.setTestModeEnabled(True)
+    app = QApplication([sys.argv[0]])
+    app.setApplicationName("LightPy Browser Benchmark")
+
+    from browser.browser_window import BrowserWindow
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        pages = generate_fixtures(root)
+        with FixtureServer(root) as server:
+            base_url = server.base_url
+            window = BrowserWindow(ephemeral=True, performance_profile=args.perf_profile)
+            window.show()
+            first = window.add_new_tab(base_url + 'blank.html')
+            wait_for(first.loadFinished, lambda: None)
+            window.finish_startup()
+
+            results.update(bench_tab_open(window, base_url + 'blank.html', args.rounds))
+            results.update(bench_navigation(window, base_url, pages, args.rounds))
+            results.update(bench_tab_switch(window, base_url + 'blank.html', args.tabs, args.rounds * 5))
+            results.update(bench_bookmark_toggle(window, args.bookmarks, args.rounds))
+            results.update(bench_bookmark_import(window, args.bookmarks, args.rounds))
+            results.update(bench_rss_per_tab(window, base_url + 'heavy_dom.html', args.tabs))
+
+            window.close()
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'performance_profile': args.perf_profile,
+        'chromium_flags': flags,
+        'results': results,
+    }
+
+
+def compare(old_path, new_path, threshold):
+    """Print changes between two reports; returns True if any metric regressed"""
+    with open(old_path) as f:
+        old_report = json.load(f)
+    with open(new_path) as f:
+        new_report = json.load(f)
+    old = old_report['results']
+    new = new_report['results']
+
+    old_profile = old_report.get('performance_profile')
+    new_profile = new_report.get('performance_profile')
+    print(f"Performance profile: {old_profile} -> {new_profile}")
+    if old_report.get('platform') != new_report.get('platform'):
+        print("Warning: reports come from different platforms")
+
+    regressed = False
+    for name in sorted(set(old) & set(new)):
+        old_value = old[name]['median'] if isinstance(old[name], dict) else old[name]
+        new_value = new[name]['median'] if isinstance(new[name], dict) else new[name]
+        change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+        # Rates are better when higher; everything else is a time or a size
+        worse = -change if name.endswith('_rate') else change
+        flag = ''
+        if worse > threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(f"{name:45} {old_value:10.2f} -> {new_value:10.2f}  {change:+6.1f}%{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LightPy Browser benchmarks")
+    parser.add_argument('--output', default='bench_results.json', help="path of the JSON report")
+    parser.add_argument('--rounds', type=int, default=5, help="samples per measurement")
+    parser.add_argument('--tabs', type=int, default=10, help="tabs for switch and memory measurements")
+    parser.add_argument('--bookmarks', type=int, nargs='+', default=[10000, 100000],
+                        help="bookmark store sizes for the toggle and import benchmarks")
+    parser.add_argument('--perf-profile', default='balanced',
+                        help="engine performance profile to benchmark: low-memory, balanced or throughput")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two reports instead of running")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="percent slowdown reported as a regression by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(args.compare[0], args.compare[1], args.threshold) else 0)
+
+    report = run(args)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Headless batch rendering of URL lists to PDF, PNG or MHTML"""
+import json
+import os
+import re
+import time
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtWebEngineWidgets import *
+from .web_profile import create_profile
+
+FORMATS = ('pdf', 'png', 'mhtml')
+SLUG_RE = re.compile(r'[^A-Za-z0-9]+')
+
+
+def read_urls(path):
+    """Yield URLs from a file one line at a time, skipping blanks and comments"""
+    with open(path, 'r') as f:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith('#'):
+                if '://' not in url:
+                    url = 'https://' + url
+                yield url
+
+
+def output_name(index, url, fmt):
+    slug = SLUG_RE.sub('-', url.split('://', 1)[-1]).strip('-')[:80] or 'page'
+    return f"{index:05d}-{slug}.{fmt}"
+
+
+class BatchSlot:
+    """One pooled page and the job it is working on"""
+
+    def __init__(self, number):
+        self.number = number
+        self.page = None
+        self.view = None
+        self.job = None
+        self.jobs_done = 0
+
+
+class BatchRenderer(QObject):
+    """Renders a stream of URLs with a fixed pool of pages
+
+    Each slot loads a URL, waits for loadFinished plus the settle time and
+    writes the output, then takes the next URL from the iterator. URLs are
+    only read as slots become free and pages are recycled every
+    recycle_after jobs, so memory stays flat however long the list is.
+    Every result is printed and appended to report.jsonl in out_dir.
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, urls, out_dir, fmt='pdf', concurrency=4, settle_ms=1000,
+                 timeout_ms=30000, viewport=QSize(1280, 800), recycle_after=50, parent=None):
+        super().__init__(parent)
+        self.urls = enumerate(urls, 1)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.settle_ms = settle_ms
+        self.timeout_ms = timeout_ms
+        self.viewport = viewport
+        self.recycle_after = recycle_after
+        self.exhausted = False
+        self.results = {'ok': 0, 'failed': 0}
+        self.started = time.monotonic()
+
+        os.makedirs(out_dir, exist_ok=True)
+        self.report = open(os.path.join(out_dir, 'report.jsonl'), 'a')
+
+        self.profile = create_profile({}, ephemeral=True, parent=self)
+        self.profile.setHttpCacheMaximumSize(32 * 1024 * 1024)
+        self.profile.downloadRequested.connect(self.on_download_requested)
+
+        self.slots = [BatchSlot(number) for number in range(max(1, concurrency))]
+
+    def start(self):
+        for slot in self.slots:
+            self.next_job(slot)
+
+    def create_page(self, slot):
+        if slot.view is not None:
+            slot.view.deleteLater()
+            slot.view = None
+        if slot.page is not None:
+            slot.page.deleteLater()
+        slot.page = QWebEnginePage(self.profile, self)
+        slot.page.loadStarted.connect(lambda: self.on_load_started(slot))
+        slot.page.loadFinished.connect(lambda ok: self.on_load_finished(slot, ok))
+        slot.page.pdfPrintingFinished.connect(lambda path, ok: self.on_output_written(slot, ok))
+        if self.fmt == 'png':
+            # Screenshots need a view to render into; it stays offscreen
+            slot.view = QWebEngineView()
+            slot.view.setAttribute(Qt.WA_DontShowOnScreen)
+            slot.view.setPage(slot.page)
+            slot.view.resize(self.viewport)
+            slot.view.show()
+        slot.jobs_done = 0
+
+    def next_job(self, slot):
+        slot.job = None
+        if not self.exhausted:
+            try:
+                index, url = next(self.urls)
+            except StopIteration:
+                self.exhausted = True
+            else:
+                if slot.page is None or slot.jobs_done >= self.recycle_after:
+                    self.create_page(slot)
+                slot.jobs_done += 1
+                job = slot.job = {
+                    'index': index,
+                    'url': url,
+                    'output': os.path.join(self.out_dir, output_name(index, url, self.fmt)),
+                    'started': time.monotonic(),
+                    'loading': False,
+                    'load_ms': None,
+                }
+                QTimer.singleShot(self.timeout_ms, lambda: self.on_timeout(slot, job))
+                slot.page.setUrl(QUrl(url))
+                return
+        if all(s.job is None for s in self.slots):
+            self.finish()
+
+    def on_load_started(self, slot):
+        if slot.job is not None:
+            slot.job['loading'] = True
+
+    def on_load_finished(self, slot, ok):
+        # Ignore late signals from a load that was stopped for an earlier job
+        job = slot.job
+        if job is None or not job['loading'] or job['load_ms'] is not None:
+            return
+        job['load_ms'] = (time.monotonic() - job['started']) * 1000
+        if not ok:
+            self.complete(slot, job, "load failed")
+            return
+        QTimer.singleShot(self.settle_ms, lambda: self.write_output(slot, job))
+
+    def write_output(self, slot, job):
+        if slot.job is not job:
+            return
+        if self.fmt == 'pdf':
+            slot.page.printToPdf(job['output'])
+        elif self.fmt == 'mhtml':
+            slot.page.save(job['output'], QWebEngineDownloadItem.MimeHtmlSaveFormat)
+        else:
+            ok = slot.view.grab().save(job['output'], 'PNG')
+            self.complete(slot, job, None if ok else "could not write image")
+
+    def on_download_requested(self, item):
+        # MHTML saves arrive as downloads with the path already set
+        for slot in self.slots:
+            if slot.page is not None and item.page() is slot.page:
+                item.finished.connect(
+                    lambda: self.on_output_written(slot, item.state() == QWebEngineDownloadItem.DownloadCompleted)
+                )
+                item.accept()
+                return
+        item.cancel()
+
+    def on_output_written(self, slot, ok):
+        if slot.job is not None:
+            self.complete(slot, slot.job, None if ok else "could not write output")
+
+    def on_timeout(self, slot, job):
+        if slot.job is job:
+            self.complete(slot, job, f"timed out after {self.timeout_ms / 1000:.0f}s")
+            slot.page.triggerAction(QWebEnginePage.Stop)
+
+    def complete(self, slot, job, error):
+        if slot.job is not job:
+            return
+        record = {
+            'index': job['index'],
+            'url': job['url'],
+            'ok': error is None,
+            'load_ms': job['load_ms'],
+            'total_ms': (time.monotonic() - job['started']) * 1000,
+            'output': job['output'] if error is None else None,
+            'error': error,
+        }
+        self.results['ok' if error is None else 'failed'] += 1
+        self.report.write(json.dumps(record) + '\n')
+        self.report.flush()
+        if error is None:
+            print(f"[ok]     {record['total_ms'] / 1000:6.2f}s  {job['url']} -> {job['output']}")
+        else:
+            print(f"[failed] {record['total_ms'] / 1000:6.2f}s  {job['url']}: {error}")
+        # Start the next job once this signal handler has returned
+        slot.job = None
+        QTimer.singleShot(0, lambda: self.next_job(slot))
+
+    def finish(self):
+        if self.report.closed:
+            return
+        self.report.close()
+        elapsed = time.monotonic() - self.started
+        print(f"Batch done: {self.results['ok']} ok, {self.results['failed']} failed in {elapsed:.1f}s")
+        self.finished.emit()
+
+
+def run_batch(app, args):
+    """Run a batch from parsed command line options; returns the exit code"""
+    if not os.path.isfile(args.batch):
+        print(f"Batch error: {args.batch} not found")
+        return 2
+    width, _, height = args.viewport.partition('x')
+    try:
+        urls = read_urls(args.batch)
+        renderer = BatchRenderer(
+            urls, args.out, args.format, args.concurrency,
+            settle_ms=args.settle, timeout_ms=int(args.timeout * 1000),
+            viewport=QSize(int(width), int(height))
+        )
+    except (OSError, ValueError) as e:
+        print(f"Batch error: {e}")
+        return 2
+    renderer.finished.connect(app.quit)
+    QTimer.singleShot(0, renderer.start)
+    app.exec_()
+    return 1 if renderer.results['failed'] else 0
@@ -0,0 +1,205 @@
+import os
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from .bookmark_io import BookmarkImporter, BookmarkExporter
+
+FILE_FILTERS = "Bookmark files (*.html *.htm *.json);;Netscape HTML (*.html *.htm);;Chrome JSON (*.json);;All files (*)"
+
+FETCH_BATCH = 200
+
+class BookmarkListModel(QAbstractListModel):
+    """Filtered list of bookmarks fetched lazily in batches
+
+    Rows are only materialized as the view scrolls, so the model costs the
+    same to open with a hundred bookmarks as with a hundred thousand.
+    """
+
+    def __init__(self, bookmark_manager, parent=None):
+        super().__init__(parent)
+        self.bookmark_manager = bookmark_manager
+        self.filter_text = ''
+        self.reset_source()
+
+    def reset_source(self):
+        self.source = self.bookmark_manager.get_bookmarks()
+        self.scan_pos = 0
+        self.rows = []
+
+    def set_filter(self, text):
+        self.beginResetModel()
+        self.filter_text = text.strip().lower()
+        self.reset_source()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        bookmark = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{bookmark['title']} - {bookmark['url']}"
+        if role == Qt.ToolTipRole or role == Qt.UserRole:
+            return bookmark['url']
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.scan_pos < len(self.source)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Scan forward until another batch of matching bookmarks is found"""
+        matches = []
+        while self.scan_pos < len(self.source) and len(matches) < FETCH_BATCH:
+            bookmark = self.source[self.scan_pos]
+            self.scan_pos += 1
+            if self.matches(bookmark):
+                matches.append(bookmark)
+        if matches:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(matches) - 1)
+            self.rows.extend(matches)
+            self.endInsertRows()
+
+    def matches(self, bookmark):
+        if not self.filter_text:
+            return True
+        return (self.filter_text in bookmark['title'].lower()
+                or self.filter_text in bookmark['url'].lower())
+
+    def remove_rows(self, rows):
+        """Remove rows from the model, highest first"""
+        for row in sorted(rows, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self.endRemoveRows()
+
+class BookmarkManagerDialog(QDialog):
+    bookmark_opened = pyqtSignal(str)
+
+    def __init__(self, bookmark_manager, parent=None):
+        super().__init__(parent)
+        self.bookmark_manager = bookmark_manager
+        self.importer = None
+        self.exporter = None
+        self.setup_ui()
+        self.finished.connect(self.cancel_import)
+
+    def setup_ui(self):
+        self.setWindowTitle("Manage Bookmarks")
+        self.setGeometry(200, 200, 500, 400)
+
+        layout = QVBoxLayout(self)
+
+        # Filter box
+        self.filter_box = QLineEdit()
+        self.filter_box.setPlaceholderText("Filter bookmarks...")
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_box.textChanged.connect(self.filter_timer.start)
+        layout.addWidget(self.filter_box)
+
+        # Bookmark list
+        self.model = BookmarkListModel(self.bookmark_manager, self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setModel(self.model)
+        self.list_view.activated.connect(self.open_bookmark)
+        layout.addWidget(self.list_view)
+
+        # Import and export progress
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        delete_btn = QPushButton("Delete Selected")
+        delete_btn.clicked.connect(self.delete_selected)
+        self.import_btn = QPushButton("Import...")
+        self.import_btn.clicked.connect(self.import_bookmarks)
+        self.export_btn = QPushButton("Export...")
+        self.export_btn.clicked.connect(self.export_bookmarks)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+
+        button_layout.addWidget(delete_btn)
+        button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(self.export_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def apply_filter(self):
+        self.model.set_filter(self.filter_box.text())
+
+    def open_bookmark(self, index):
+        self.bookmark_opened.emit(index.data(Qt.UserRole))
+
+    def delete_selected(self):
+        """Delete all selected bookmarks in one go"""
+        indexes = self.list_view.selectionModel().selectedRows()
+        if not indexes:
+            return
+        rows = [index.row() for index in indexes]
+        urls = [self.model.rows[row]['url'] for row in rows]
+        self.model.remove_rows(rows)
+        self.bookmark_manager.remove_bookmarks(urls)
+
+    def set_busy(self, busy):
+        self.progress_bar.setVisible(busy)
+        self.import_btn.setEnabled(not busy)
+        self.export_btn.setEnabled(not busy)
+
+    def import_bookmarks(self):
+        """Import a Netscape HTML or Chrome JSON bookmark file in the background"""
+        path, _ = QFileDialog.getOpenFileName(self, "Import Bookmarks", os.path.expanduser('~'), FILE_FILTERS)
+        if not path:
+            return
+        self.importer = BookmarkImporter(self.bookmark_manager, path, parent=self)
+        self.importer.progress.connect(self.on_import_progress)
+        self.importer.finished.connect(self.on_import_finished)
+        self.set_busy(True)
+        self.status_label.setText("Importing...")
+        self.importer.start()
+
+    def on_import_progress(self, read_count, added_count):
+        self.status_label.setText(f"Read {read_count} bookmarks, added {added_count}")
+
+    def on_import_finished(self, read_count, added_count, error):
+        self.importer = None
+        self.set_busy(False)
+        if error:
+            self.status_label.setText(f"Import failed: {error}")
+        else:
+            skipped = read_count - added_count
+            self.status_label.setText(f"Imported {added_count} bookmarks ({skipped} already present)")
+        self.apply_filter()
+
+    def cancel_import(self):
+        if self.importer:
+            self.importer.cancel()
+
+    def export_bookmarks(self):
+        """Export all bookmarks as Netscape HTML or Chrome JSON, by file extension"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Bookmarks", os.path.expanduser('~/bookmarks.html'), FILE_FILTERS
+        )
+        if not path:
+            return
+        self.exporter = BookmarkExporter(self.bookmark_manager.get_bookmarks(), path, parent=self)
+        self.exporter.finished.connect(self.on_export_finished)
+        self.set_busy(True)
+        self.status_label.setText("Exporting...")
+        self.exporter.start()
+
+    def on_export_finished(self, count, error):
+        self.exporter = None
+        self.set_busy(False)
+        self.status_label.setText(f"Export failed: {error}" if error else f"Exported {count} bookmarks")
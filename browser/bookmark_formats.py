@@ -0,0 +1,112 @@
+"""Netscape HTML and Chrome JSON bookmark file formats"""
+import html
+import json
+import os
+from html.parser import HTMLParser
+
+READ_CHUNK = 64 * 1024
+SKIPPED_SCHEMES = ('javascript:', 'place:', 'data:')
+
+
+def detect_format(path):
+    """'html' or 'json' from a file name, or None"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.html', '.htm'):
+        return 'html'
+    if ext == '.json' or os.path.basename(path) == 'Bookmarks':
+        return 'json'
+    return None
+
+
+def make_bookmark(url, title):
+    url = (url or '').strip()
+    if not url or url.lower().startswith(SKIPPED_SCHEMES):
+        return None
+    return {'url': url, 'title': (title or '').strip()}
+
+
+class NetscapeBookmarkParser(HTMLParser):
+    """Collects <A HREF> entries of a Netscape bookmark file as it is fed"""
+
+    def __init__(self):
+        super().__init__()
+        self.bookmarks = []
+        self.href = None
+        self.title = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            self.href = dict(attrs).get('href')
+            self.title = []
+
+    def handle_data(self, data):
+        if self.href is not None:
+            self.title.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.href is not None:
+            bookmark = make_bookmark(self.href, ''.join(self.title))
+            if bookmark:
+                self.bookmarks.append(bookmark)
+            self.href = None
+
+
+def parse_netscape_html(f):
+    """Yield bookmarks from a Netscape bookmark file, reading it in chunks"""
+    parser = NetscapeBookmarkParser()
+    while True:
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        if parser.bookmarks:
+            yield from parser.bookmarks
+            parser.bookmarks = []
+    parser.close()
+    yield from parser.bookmarks
+
+
+def parse_chrome_json(f):
+    """Yield the URL entries of a Chrome Bookmarks file, folders flattened in order"""
+    data = json.load(f)
+    roots = data.get('roots', {}) if isinstance(data, dict) else {}
+    stack = [node for node in reversed(list(roots.values())) if isinstance(node, dict)]
+    while stack:
+        node = stack.pop()
+        if node.get('type') == 'url':
+            bookmark = make_bookmark(node.get('url'), node.get('name'))
+            if bookmark:
+                yield bookmark
+        else:
+            stack.extend(child for child in reversed(node.get('children', [])) if isinstance(child, dict))
+
+
+def write_netscape_html(bookmarks, f):
+    f.write('<!DOCTYPE NETSCAPE-Bookmark-file-1>\n'
+            '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+            '<TITLE>Bookmarks</TITLE>\n'
+            '<H1>Bookmarks</H1>\n'
+            '<DL><p>\n')
+    for bookmark in bookmarks:
+        f.write(f'    <DT><A HREF="{html.escape(bookmark["url"])}">'
+                f'{html.escape(bookmark["title"] or bookmark["url"], quote=False)}</A>\n')
+    f.write('</DL><p>\n')
+
+
+def write_chrome_json(bookmarks, f):
+    def folder(folder_id, name, children):
+        return {'children': children, 'date_added': '0', 'id': str(folder_id), 'name': name, 'type': 'folder'}
+
+    children = [
+        {'date_added': '0', 'id': str(number), 'name': bookmark['title'], 'type': 'url', 'url': bookmark['url']}
+        for number, bookmark in enumerate(bookmarks, 4)
+    ]
+    json.dump({
+        'checksum': '',
+        'roots': {
+            'bookmark_bar': folder(1, 'Bookmarks bar', children),
+            'other': folder(2, 'Other bookmarks', []),
+            'synced': folder(3, 'Mobile bookmarks', []),
+        },
+        'version': 1,
+    }, f, indent=3)
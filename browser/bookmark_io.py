@@ -0,0 +1,122 @@
+"""Background bookmark import and export without blocking the UI"""
+import os
+import tempfile
+import threading
+from PyQt5.QtCore import *
+from .bookmark_formats import (
+    detect_format, parse_chrome_json, parse_netscape_html, write_chrome_json, write_netscape_html
+)
+
+IMPORT_BATCH = 1000
+
+
+class BookmarkImporter(QObject):
+    """Imports a bookmark file into the bookmark manager without blocking the UI
+
+    The file is parsed on a worker thread and handed over in batches that
+    are added with add_bookmarks, which skips URLs already stored. At most
+    two batches are in flight, so the parser never runs far ahead of the
+    GUI thread.
+    """
+
+    progress = pyqtSignal(int, int)  # bookmarks read, bookmarks added
+    finished = pyqtSignal(int, int, str)  # bookmarks read, bookmarks added, error
+    batch_ready = pyqtSignal(list)
+    parse_finished = pyqtSignal(str)
+
+    def __init__(self, bookmark_manager, path, fmt=None, parent=None):
+        super().__init__(parent)
+        self.bookmark_manager = bookmark_manager
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        self.read_count = 0
+        self.added_count = 0
+        self.cancelled = False
+        self.slots = threading.Semaphore(2)
+        self.batch_ready.connect(self.on_batch_ready)
+        self.parse_finished.connect(self.on_parse_finished)
+
+    def start(self):
+        if self.fmt not in ('html', 'json'):
+            self.finished.emit(0, 0, "Unknown bookmark file format")
+            return
+        threading.Thread(target=self._run, name="bookmark-import", daemon=True).start()
+
+    def cancel(self):
+        self.cancelled = True
+        # Unblock the parser if its batches will never be taken
+        self.slots.release()
+        self.slots.release()
+
+    def on_batch_ready(self, batch):
+        self.read_count += len(batch)
+        if not self.cancelled:
+            self.added_count += len(self.bookmark_manager.add_bookmarks(batch))
+        self.slots.release()
+        self.progress.emit(self.read_count, self.added_count)
+
+    def on_parse_finished(self, error):
+        # Queued after the last batch, so every batch has been added
+        self.finished.emit(self.read_count, self.added_count, error)
+
+    def _run(self):
+        error = ''
+        try:
+            with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+                bookmarks = parse_netscape_html(f) if self.fmt == 'html' else parse_chrome_json(f)
+                batch = []
+                for bookmark in bookmarks:
+                    if self.cancelled:
+                        break
+                    batch.append(bookmark)
+                    if len(batch) >= IMPORT_BATCH:
+                        self._emit_batch(batch)
+                        batch = []
+                if batch and not self.cancelled:
+                    self._emit_batch(batch)
+        except Exception as e:
+            error = str(e)
+            print(f"Error importing bookmarks: {e}")
+        self.parse_finished.emit(error)
+
+    def _emit_batch(self, batch):
+        self.slots.acquire()
+        self.batch_ready.emit(batch)
+
+
+class BookmarkExporter(QObject):
+    """Writes a snapshot of the bookmarks to a file on a worker thread"""
+
+    finished = pyqtSignal(int, str)  # bookmarks written, error
+
+    def __init__(self, bookmarks, path, fmt=None, parent=None):
+        super().__init__(parent)
+        self.bookmarks = bookmarks
+        self.path = path
+        self.fmt = fmt or detect_format(path) or 'html'
+
+    def start(self):
+        threading.Thread(target=self._run, name="bookmark-export", daemon=True).start()
+
+    def _run(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-bookmarks-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    if self.fmt == 'json':
+                        write_chrome_json(self.bookmarks, f)
+                    else:
+                        write_netscape_html(self.bookmarks, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except Exception as e:
+            print(f"Error exporting bookmarks: {e}")
+            self.finished.emit(0, str(e))
+            return
+        self.finished.emit(len(self.bookmarks), '')
@@ -1,47 +1,127 @@
-import json
-import os
+from urllib.parse import urlsplit, urlunsplit
+from .storage import get_data_file, load_json, atomic_write_json
+
+DEFAULT_PORTS = {'http': 80, 'https': 443, 'ftp': 21}
+
+def normalize_url(url):
+    """Normalize a URL so equivalent spellings share one index key"""
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        netloc = (parts.hostname or '').lower()
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            netloc += f":{parts.port}"
+        if parts.username:
+            netloc = f"{parts.username}@{netloc}"
+        path = parts.path or '/'
+        return urlunsplit((scheme, netloc, path, parts.query, ''))
+    except ValueError:
+        return url
 
 class BookmarkManager:
-    def __init__(self):
-        self.bookmarks_file = "bookmarks.json"
-        self.bookmarks = self.load_bookmarks()
-        
+    def __init__(self, persistence=None):
+        self.bookmarks_file = get_data_file("bookmarks.json")
+        self.persistence = persistence
+        # Normalized URL -> bookmark, kept in insertion order
+        self.bookmarks = {}
+        self._view = None
+        self.listeners = []
+        for bookmark in self.load_bookmarks():
+            self.bookmarks.setdefault(normalize_url(bookmark['url']), bookmark)
+
     def load_bookmarks(self):
-        try:
-            if os.path.exists(self.bookmarks_file):
-                with open(self.bookmarks_file, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return []
-        
+        bookmarks = load_json(self.bookmarks_file, [])
+        return bookmarks if isinstance(bookmarks, list) else []
+
     def save_bookmarks(self):
+        """Persist bookmarks, in the background when a persistence service is set"""
+        snapshot = self.get_bookmarks()
+        if self.persistence:
+            self.persistence.schedule(self.bookmarks_file, snapshot)
+            return
         try:
-            with open(self.bookmarks_file, 'w') as f:
-                json.dump(self.bookmarks, f, indent=2)
-        except:
-            pass
-            
+            atomic_write_json(self.bookmarks_file, snapshot)
+        except Exception as e:
+            print(f"Error saving bookmarks: {e}")
+
+    def add_listener(self, callback):
+        """Call callback(change, bookmarks) with 'added' or 'removed' on every change
+
+        bookmarks lists everything added or removed by one call, so bulk
+        changes reach each listener once.
+        """
+        self.listeners.append(callback)
+
+    def notify(self, change, bookmarks):
+        for callback in self.listeners:
+            callback(change, bookmarks)
+
     def add_bookmark(self, url, title):
-        bookmark = {'url': url, 'title': title}
-        
-        if not any(b['url'] == url for b in self.bookmarks):
-            self.bookmarks.append(bookmark)
+        key = normalize_url(url)
+
+        if key not in self.bookmarks:
+            bookmark = self.bookmarks[key] = {'url': url, 'title': title}
+            self._view = None
             self.save_bookmarks()
+            self.notify('added', [bookmark])
             return True
         return False
-        
+
+    def add_bookmarks(self, bookmarks):
+        """Add several bookmarks with a single save, skipping known URLs
+
+        Returns the bookmarks that were actually added.
+        """
+        added = []
+        for bookmark in bookmarks:
+            key = normalize_url(bookmark['url'])
+            if key not in self.bookmarks:
+                bookmark = self.bookmarks[key] = {'url': bookmark['url'], 'title': bookmark.get('title', '')}
+                added.append(bookmark)
+        if added:
+            self._view = None
+            self.save_bookmarks()
+            self.notify('added', added)
+        return added
+
     def remove_bookmark(self, url):
-        self.bookmarks = [b for b in self.bookmarks if b['url'] != url]
-        self.save_bookmarks()
-        
+        self.remove_bookmarks([url])
+
+    def remove_bookmarks(self, urls):
+        """Remove several bookmarks with a single save"""
+        removed = []
+        for url in urls:
+            bookmark = self.bookmarks.pop(normalize_url(url), None)
+            if bookmark is not None:
+                removed.append(bookmark)
+        if removed:
+            self._view = None
+            self.save_bookmarks()
+            self.notify('removed', removed)
+
     def toggle_bookmark(self, url, title):
-        if any(b['url'] == url for b in self.bookmarks):
+        if self.is_bookmarked(url):
             self.remove_bookmark(url)
             return False
         else:
             self.add_bookmark(url, title)
             return True
-            
+
+    def is_bookmarked(self, url):
+        """Check whether a URL is bookmarked"""
+        return normalize_url(url) in self.bookmarks
+
+    def get_bookmark(self, url):
+        """Get the bookmark stored for a URL, or None"""
+        return self.bookmarks.get(normalize_url(url))
+
     def get_bookmarks(self):
-        return self.bookmarks.copy()
+        """Read-only, insertion-ordered view of all bookmarks
+
+        The view is rebuilt only after the bookmarks change, so repeated
+        calls don't copy the store.
+        """
+        if self._view is None:
+            self._view = tuple(self.bookmarks.values())
+        return self._view
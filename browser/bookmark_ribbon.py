@@ -1,86 +1,137 @@
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
+from .bookmark_manager import normalize_url
+from .speculation import url_origin
+
+MAX_OVERFLOW_ITEMS = 500
 
 class BookmarkRibbon(QToolBar):
     bookmark_clicked = pyqtSignal(str)
-    
-    def __init__(self, bookmark_manager):
-        super().__init__()
+    bookmark_hovered = pyqtSignal(str)
+
+    def __init__(self, bookmark_manager, max_visible=30, favicons=None):
+        super().__init__("Bookmarks")
         self.bookmark_manager = bookmark_manager
+        self.max_visible = max_visible
+        self.favicons = favicons
+        # Normalized URL -> action, for the bookmarks shown on the bar
+        self.bookmark_actions = {}
         self.setup_ui()
         self.refresh_bookmarks()
-        
+        self.bookmark_manager.add_listener(self.on_bookmarks_changed)
+        if self.favicons:
+            self.favicons.icon_ready.connect(self.on_icon_ready)
+
     def setup_ui(self):
         self.setMovable(False)
         self.setFloatable(False)
         self.setOrientation(Qt.Horizontal)
-        
-    def refresh_bookmarks(self):
-        """Refresh the bookmark buttons"""
-        # Clear existing buttons
-        self.clear()
-        
-        # Add bookmark buttons
-        bookmarks = self.bookmark_manager.get_bookmarks()
-        for bookmark in bookmarks[:10]:  # Show first 10 bookmarks
-            btn = QToolButton()
-            btn.setText(bookmark['title'][:15] + '...' if len(bookmark['title']) > 15 else bookmark['title'])
-            btn.setToolTip(f"{bookmark['title']}\n{bookmark['url']}")
-            btn.setMaximumWidth(120)
-            btn.clicked.connect(lambda checked, url=bookmark['url']: self.bookmark_clicked.emit(url))
-            self.addWidget(btn)
-        
-        # Add spacer if there are bookmarks
-        if bookmarks:
-            spacer = QWidget()
-            spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-            self.addWidget(spacer)
-        
+        self.setIconSize(QSize(16, 16))
+        self.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+
+        # Chevron menu for bookmarks that don't fit on the bar, filled on demand
+        self.overflow_menu = QMenu(self)
+        self.overflow_menu.aboutToShow.connect(self.populate_overflow_menu)
+        overflow_btn = QToolButton()
+        overflow_btn.setText('»')
+        overflow_btn.setToolTip('More bookmarks')
+        overflow_btn.setPopupMode(QToolButton.InstantPopup)
+        overflow_btn.setMenu(self.overflow_menu)
+        self.overflow_action = self.addWidget(overflow_btn)
+
+        spacer = QWidget()
+        spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.addWidget(spacer)
+
         # Add manage bookmarks button
         manage_btn = QToolButton()
         manage_btn.setText("Manage Bookmarks")
         manage_btn.clicked.connect(self.show_bookmark_manager)
         self.addWidget(manage_btn)
-        
+
+    def create_bookmark_action(self, bookmark, parent):
+        title = bookmark['title'] or bookmark['url']
+        action = QAction(title[:25] + '...' if len(title) > 25 else title, parent)
+        action.setToolTip(f"{bookmark['title']}\n{bookmark['url']}")
+        action.triggered.connect(lambda checked=False, url=bookmark['url']: self.bookmark_clicked.emit(url))
+        action.hovered.connect(lambda url=bookmark['url']: self.bookmark_hovered.emit(url))
+        if self.favicons:
+            # Icons not in memory yet arrive through on_icon_ready
+            action.setData(url_origin(bookmark['url']))
+            icon = self.favicons.icon(bookmark['url'])
+            if icon is not None:
+                action.setIcon(icon)
+        return action
+
+    def on_icon_ready(self, origin, icon):
+        for action in list(self.bookmark_actions.values()) + self.overflow_menu.actions():
+            if action.data() == origin:
+                action.setIcon(icon)
+
+    def refresh_bookmarks(self):
+        """Rebuild the bookmark actions from scratch"""
+        for action in self.bookmark_actions.values():
+            self.removeAction(action)
+            action.deleteLater()
+        self.bookmark_actions.clear()
+
+        for bookmark in self.bookmark_manager.get_bookmarks()[:self.max_visible]:
+            self.append_bookmark(bookmark)
+        self.update_overflow()
+
+    def append_bookmark(self, bookmark):
+        action = self.create_bookmark_action(bookmark, self)
+        self.insertAction(self.overflow_action, action)
+        self.bookmark_actions[normalize_url(bookmark['url'])] = action
+
+    def on_bookmarks_changed(self, change, bookmarks):
+        """Apply added or removed bookmarks to the bar"""
+        if change == 'added':
+            for bookmark in bookmarks:
+                if len(self.bookmark_actions) >= self.max_visible:
+                    break
+                self.append_bookmark(bookmark)
+        elif change == 'removed':
+            removed = False
+            for bookmark in bookmarks:
+                action = self.bookmark_actions.pop(normalize_url(bookmark['url']), None)
+                if action:
+                    self.removeAction(action)
+                    action.deleteLater()
+                    removed = True
+            if removed:
+                # Promote the first overflowing bookmarks onto the bar
+                all_bookmarks = self.bookmark_manager.get_bookmarks()
+                while len(self.bookmark_actions) < min(self.max_visible, len(all_bookmarks)):
+                    self.append_bookmark(all_bookmarks[len(self.bookmark_actions)])
+        self.update_overflow()
+
+    def update_overflow(self):
+        overflow = len(self.bookmark_manager.get_bookmarks()) > len(self.bookmark_actions)
+        self.overflow_action.setVisible(overflow)
+
+    def populate_overflow_menu(self):
+        """Fill the chevron menu with the bookmarks not shown on the bar"""
+        for action in self.overflow_menu.actions():
+            action.deleteLater()
+        self.overflow_menu.clear()
+
+        bookmarks = self.bookmark_manager.get_bookmarks()
+        start = len(self.bookmark_actions)
+        for bookmark in bookmarks[start:start + MAX_OVERFLOW_ITEMS]:
+            self.overflow_menu.addAction(self.create_bookmark_action(bookmark, self.overflow_menu))
+
+        remaining = len(bookmarks) - start - MAX_OVERFLOW_ITEMS
+        if remaining > 0:
+            self.overflow_menu.addSeparator()
+            more_action = self.overflow_menu.addAction(f"{remaining} more in Manage Bookmarks...")
+            more_action.triggered.connect(self.show_bookmark_manager)
+
     def show_bookmark_manager(self):
         """Show bookmark management dialog"""
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QListWidget, QPushButton, QHBoxLayout
-        
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Manage Bookmarks")
-        dialog.setGeometry(200, 200, 500, 400)
-        
-        layout = QVBoxLayout(dialog)
-        
-        # Bookmark list
-        list_widget = QListWidget()
-        bookmarks = self.bookmark_manager.get_bookmarks()
-        for bookmark in bookmarks:
-            list_widget.addItem(f"{bookmark['title']} - {bookmark['url']}")
-        
-        layout.addWidget(list_widget)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        delete_btn = QPushButton("Delete Selected")
-        delete_btn.clicked.connect(lambda: self.delete_bookmark(list_widget))
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(dialog.close)
-        
-        button_layout.addWidget(delete_btn)
-        button_layout.addWidget(close_btn)
-        layout.addLayout(button_layout)
-        
+        from .bookmark_dialog import BookmarkManagerDialog
+
+        dialog = BookmarkManagerDialog(self.bookmark_manager, self)
+        dialog.bookmark_opened.connect(self.bookmark_clicked)
         dialog.exec_()
-        
-    def delete_bookmark(self, list_widget):
-        """Delete selected bookmark"""
-        current_row = list_widget.currentRow()
-        if current_row >= 0:
-            bookmarks = self.bookmark_manager.get_bookmarks()
-            if current_row < len(bookmarks):
-                bookmark = bookmarks[current_row]
-                self.bookmark_manager.remove_bookmark(bookmark['url'])
-                self.refresh_bookmarks()
-                list_widget.takeItem(current_row)
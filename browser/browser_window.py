@@ -6,23 +6,226 @@ from PyQt5.QtWebEngineWidgets import QWebEngineSettings
 from .tab_manager import TabManager
 from .navigation_bar import NavigationBar
 from .bookmark_manager import BookmarkManager
-import json
+from .tab_discarder import TabDiscarder, DiscardedTab
+from .web_profile import create_profile, get_cache_dir
+from .storage import PersistenceService, get_data_dir, get_data_file, load_json
+from .formatting import format_size
+from .startup_trace import startup_trace
+from .settings import DEFAULT_PERFORMANCE_PROFILE, SETTINGS_FILE
 import os
+import time
 
 class BrowserWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, ephemeral=False, performance_profile=None):
+        from .favicons import FaviconStore
+        from .lite_mode import LiteModePolicies
+        from .load_metrics import PageLoadRecorder
+        
         super().__init__()
         self.setWindowTitle("LightPy Browser")
         self.setGeometry(100, 100, 1200, 800)
         
         # Initialize managers
-        self.bookmark_manager = BookmarkManager()
+        self.persistence = PersistenceService()
+        self.bookmark_manager = BookmarkManager(self.persistence)
         self.settings = self.load_settings()
+        self.performance_profile = performance_profile
+        
+        # Per-site data saver settings, enforced by the request interceptor
+        self.lite_mode = LiteModePolicies(
+            self.persistence,
+            default_lite=self.settings.get('lite_mode_default', False),
+            image_size_threshold=self.settings.get('lite_mode_image_threshold_kb', 100) * 1024
+        )
+        
+        # Web profile and history are created after the first paint
+        self.ephemeral = ephemeral or self.settings.get('ephemeral_profile', False)
+        self.profile = None
+        self.history_manager = None
+        self.content_blocker = None
+        
+        # Site icons for tabs and the bookmarks bar, read from disk rather than the network
+        self.favicons = FaviconStore(
+            self.persistence,
+            max_icons=self.settings.get('favicon_cache_size', 500),
+            persist=not self.ephemeral,
+            parent=self
+        )
+        self.favicons.icon_ready.connect(self.on_favicon_ready)
+        
+        # Per-tab page load timings, logged as JSON lines
+        log_path = None
+        if self.settings.get('load_metrics_log', True) and not self.ephemeral:
+            log_path = get_data_file("page_loads.jsonl")
+        self.load_recorder = PageLoadRecorder(log_path, self)
+        self.load_recorder.overlay_enabled = self.settings.get('show_load_metrics', False)
+        
+        # Download manager, created with the web profile
+        self.download_manager = None
+        self.downloads_panel = None
+        
+        # Tab services, created with the web profile
+        self.session = None
+        self.lazy_loader = None
+        self.view_pool = None
+        self.thumbnails = None
+        self.tab_preview = None
+        self.tab_search = None
+        self.speculation = None
+        self.task_manager = None
+        self.startup_finished = False
         
         self.setup_ui()
         self.setup_shortcuts()
+        self.installEventFilter(self)
+        
+    def eventFilter(self, obj, event):
+        """Finish startup once the window chrome has been painted"""
+        if obj is self and event.type() == QEvent.Paint and not self.startup_finished:
+            startup_trace.mark("first-paint")
+            self.removeEventFilter(self)
+            QTimer.singleShot(0, self.finish_startup)
+        return super().eventFilter(obj, event)
+        
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Fallback in case no paint event reaches the main window
+        QTimer.singleShot(500, self.finish_startup)
+        
+    def init_web_engine(self):
+        """Create the web profile, history store and tab services on first use"""
+        if self.profile is not None:
+            return
+        from .content_blocker import ContentBlockingInterceptor
+        from .download_manager import DownloadManager
+        from .history_manager import HistoryManager
+        from .session import SessionRecorder, LazyTabLoader
+        from .speculation import SpeculationEngine
+        from .tab_search import TabContentIndex
+        from .task_manager import TaskManagerService
+        from .thumbnails import ThumbnailService, TabHoverPreview
+        from .view_pool import ViewPool
+        
+        # Shared web profile with a persistent disk cache
+        self.profile = create_profile(self.settings, self.ephemeral, self)
+        
+        # Ad and tracker blocking and lite mode; rule lists are compiled in the background
+        self.content_blocker = ContentBlockingInterceptor(self, lite_mode=self.lite_mode)
+        self.profile.setUrlRequestInterceptor(self.content_blocker)
+        if self.settings.get('content_blocking', True):
+            self.content_blocker.engine_loaded.connect(self.on_content_blocker_loaded)
+            self.content_blocker.load_async(
+                os.path.join(get_data_dir(), 'filters'),
+                os.path.join(get_cache_dir(), 'filters.cache')
+            )
+        
+        self.load_recorder.install(self.profile)
+        
+        # Downloads from every tab go through one queue
+        self.download_manager = DownloadManager(
+            self.settings.get('download_path', os.path.expanduser('~/Downloads')),
+            max_concurrent=self.settings.get('max_concurrent_downloads', 3),
+            parent=self
+        )
+        self.download_manager.download_finished.connect(self.on_download_finished)
+        self.download_manager.attach(self.profile)
+        
+        # Browsing history
+        self.history_manager = HistoryManager(
+            get_data_file("history.db"),
+            retention_days=self.settings.get('history_retention_days', 90)
+        )
+        
+        # Open tabs are journaled continuously and reopened lazily on restart
+        if self.settings.get('restore_session', True) and not self.ephemeral:
+            self.session = SessionRecorder(self.tab_manager, get_data_file("session.jsonl"), parent=self)
+        self.lazy_loader = LazyTabLoader(
+            self.tab_manager,
+            self.tab_discarder.restore,
+            interval=self.settings.get('session_load_interval_ms', 2000),
+            can_load=lambda: self.get_memory_headroom() > self.tab_discarder.tab_memory_estimate_mb,
+            parent=self
+        )
+        
+        # Ready-made browser views for new and restored tabs
+        self.view_pool = ViewPool(
+            self.create_pooled_browser,
+            size=self.settings.get('view_pool_size', 2),
+            memory_cap_mb=self.settings.get('view_pool_memory_cap_mb', 64),
+            can_grow=lambda: self.get_memory_headroom() > 0,
+            parent=self
+        )
+        
+        # Downscaled tab snapshots for hover previews and the tab overview
+        spill_thumbnails = self.settings.get('thumbnail_spill_to_disk', True) and not self.ephemeral
+        self.thumbnails = ThumbnailService(
+            self.tab_manager,
+            max_bytes=self.settings.get('thumbnail_cache_mb', 16) * 1024 * 1024,
+            spill_dir=os.path.join(get_cache_dir(), 'thumbnails') if spill_thumbnails else None,
+            parent=self
+        )
+        self.tab_preview = TabHoverPreview(self.thumbnails, self.tab_manager, self)
+        
+        # Full-text index of open tabs for the tab search switcher
+        self.tab_search = TabContentIndex(
+            self.tab_manager,
+            max_bytes=self.settings.get('tab_search_index_mb', 32) * 1024 * 1024,
+            parent=self
+        )
+        
+        # Preconnect and prerender likely targets from the URL bar and bookmarks bar
+        self.speculation = SpeculationEngine(
+            self.create_page,
+            max_prerenders=self.settings.get('max_prerenders', 1),
+            max_preconnects=self.settings.get('max_preconnects', 4),
+            page_memory_mb=self.settings.get('tab_memory_estimate_mb', 150),
+            memory_headroom=self.get_memory_headroom,
+            parent=self
+        )
+        if self.settings.get('speculation_enabled', True):
+            self.omnibox.prediction_changed.connect(self.speculation.speculate)
+            self.bookmarks_bar.bookmark_hovered.connect(self.on_bookmark_hovered)
+        
+        # Renderer memory and CPU samples for the task manager and metrics dump
+        dump_interval = self.settings.get('metrics_dump_interval_s', 0)
+        self.task_manager = TaskManagerService(
+            self.tab_manager,
+            dump_path=get_data_file("metrics.jsonl") if dump_interval else None,
+            dump_interval=dump_interval,
+            parent=self
+        )
+        startup_trace.mark("web-engine-ready")
+        
+    def finish_startup(self):
+        """Initialize everything that isn't needed to show the window chrome"""
+        if self.startup_finished:
+            return
+        self.startup_finished = True
+        self.init_web_engine()
+        
+        # Seed URL bar suggestions
+        for bookmark in self.bookmark_manager.get_bookmarks():
+            self.omnibox.index.update(bookmark['url'], bookmark['title'], bookmarked=True)
+        self.omnibox.load_history_async(self.history_manager.top_urls)
+        
+        # Reopen the last session, or add a first tab
+        if self.tab_manager.count() == 0 and self.session:
+            self.restore_session()
+        if self.tab_manager.count() == 0:
+            self.add_new_tab("https://duckduckgo.com/", "Home")
+        startup_trace.mark("first-tab-created")
+        if self.session:
+            self.session.start()
+        self.view_pool.start()
+        
+        if self.performance_profile:
+            self.status_bar.showMessage(f"Performance profile: {self.performance_profile}", 5000)
         
     def setup_ui(self):
+        from .bookmark_ribbon import BookmarkRibbon
+        from .omnibox import OmniboxCompleter
+        from .tab_state import TabStateRegistry
+        
         # Create central widget and main layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -41,18 +244,32 @@ class BrowserWindow(QMainWindow):
         
         layout.addWidget(self.nav_bar)
         
-        # Create bookmarks bar
-        self.bookmarks_bar = QToolBar("Bookmarks")
-        self.bookmarks_bar.setIconSize(QSize(16, 16))
-        self.bookmarks_bar.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        # URL bar suggestions from bookmarks, history and open tabs
+        self.omnibox = OmniboxCompleter(self.nav_bar.url_bar, self.get_open_urls)
+        self.omnibox.url_chosen.connect(self.navigate_to_url)
+        self.bookmark_manager.add_listener(self.on_bookmarks_changed)
+        
+        # Create bookmarks bar, kept in sync with the bookmark manager
+        self.bookmarks_bar = BookmarkRibbon(
+            self.bookmark_manager,
+            max_visible=self.settings.get('bookmarks_bar_max_items', 30),
+            favicons=self.favicons
+        )
+        self.bookmarks_bar.bookmark_clicked.connect(self.open_bookmark)
         self.bookmarks_bar.setVisible(True)  # Can be toggled in settings later
         layout.addWidget(self.bookmarks_bar)
         
-        # Load bookmarks into bookmarks bar
-        self.refresh_bookmarks_bar()
-        
         # Create tab widget
         self.tab_manager = TabManager()
+        self.tab_discarder = TabDiscarder(
+            self.tab_manager,
+            self.take_browser,
+            memory_budget_mb=self.settings.get('tab_memory_budget_mb', 2048),
+            tab_memory_estimate_mb=self.settings.get('tab_memory_estimate_mb', 150)
+        )
+        self.tab_states = TabStateRegistry(
+            self.tab_manager, self.bookmark_manager, self.render_tab_state, parent=self
+        )
         self.tab_manager.currentChanged.connect(self.on_tab_changed)
         layout.addWidget(self.tab_manager)
         
@@ -60,27 +277,43 @@ class BrowserWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         
-        # Add first tab
-        self.add_new_tab("https://duckduckgo.com/", "Home")
-        
     def refresh_bookmarks_bar(self):
-        """Refresh the bookmarks bar with current bookmarks"""
-        # Clear existing bookmarks
-        self.bookmarks_bar.clear()
-        
-        # Add bookmarks to the bar
-        bookmarks = self.bookmark_manager.get_bookmarks()
-        for bookmark in bookmarks:
-            action = QAction(bookmark['title'], self)
-            action.setToolTip(bookmark['url'])
-            action.triggered.connect(lambda checked=False, url=bookmark['url']: self.open_bookmark(url))
-            self.bookmarks_bar.addAction(action)
+        """Rebuild the bookmarks bar from scratch"""
+        self.bookmarks_bar.refresh_bookmarks()
         
     def open_bookmark(self, url):
         """Open a bookmark in the current tab"""
         current_browser = self.get_current_browser()
         if current_browser:
-            current_browser.setUrl(QUrl(url))
+            self.load_url(current_browser, url)
+            
+    def on_bookmark_hovered(self, url):
+        # Hovering is a weaker signal than typing: warm the connection only
+        self.speculation.speculate(url, 0.5)
+        
+    def load_url(self, browser, url):
+        """Navigate browser to url, using a prerendered page when one matches"""
+        if not isinstance(browser, QWebEngineView):
+            browser.setUrl(QUrl(url))
+            return
+        # Swapping pages would drop the tab's back/forward history, so a
+        # prerender is only adopted by a tab that has none
+        page = self.speculation.take(url, adopt=browser.history().count() <= 1)
+        if page is None:
+            browser.setUrl(QUrl(url))
+            return
+        old_page = browser.page()
+        page.setParent(browser)
+        browser.setPage(page)
+        old_page.deleteLater()
+        state = self.tab_states.get(browser)
+        if state:
+            self.tab_states.sync_from_view(state)
+            
+    def get_memory_headroom(self):
+        """MB left in the tab memory budget"""
+        used = sum(self.tab_discarder.estimate_memory().values())
+        return self.tab_discarder.memory_budget_mb - used
         
     def setup_shortcuts(self):
         # Keyboard shortcuts
@@ -93,50 +326,114 @@ class BrowserWindow(QMainWindow):
         QShortcut(QKeySequence("Ctrl+0"), self, self.zoom_reset)
         QShortcut(QKeySequence("Ctrl+H"), self, self.show_history)
         QShortcut(QKeySequence("Ctrl+B"), self, self.show_bookmarks)
+        QShortcut(QKeySequence("Ctrl+J"), self, self.show_downloads)
+        QShortcut(QKeySequence("Ctrl+Shift+O"), self, self.show_tab_overview)
+        QShortcut(QKeySequence("Ctrl+Shift+A"), self, self.show_tab_search)
+        QShortcut(QKeySequence("Ctrl+Shift+L"), self, lambda: self.toggle_lite_mode(self.get_current_browser()))
         QShortcut(QKeySequence("Ctrl+Q"), self, self.close)
+        QShortcut(QKeySequence("Ctrl+Shift+Delete"), self, self.clear_cache)
+        QShortcut(QKeySequence("Ctrl+Shift+M"), self, self.toggle_load_metrics)
+        QShortcut(QKeySequence("Shift+Esc"), self, self.show_task_manager)
         QShortcut(QKeySequence("Ctrl+click"), self, self.open_link_in_new_tab)
         
     def create_browser(self):
         """Create a browser instance with SSL error handling"""
         browser = QWebEngineView()
+        browser.setPage(self.create_page(browser))
+        return browser
         
-        # Configure browser settings for better compatibility
-        settings = browser.settings()
-        settings.setAttribute(QWebEngineSettings.JavascriptEnabled, True)
-        settings.setAttribute(QWebEngineSettings.PluginsEnabled, True)
-        settings.setAttribute(QWebEngineSettings.FullScreenSupportEnabled, True)
-        settings.setAttribute(QWebEngineSettings.ScrollAnimatorEnabled, True)
-        settings.setAttribute(QWebEngineSettings.JavascriptCanOpenWindows, True)
-        settings.setAttribute(QWebEngineSettings.JavascriptCanAccessClipboard, True)
-        settings.setAttribute(QWebEngineSettings.LocalStorageEnabled, True)
-        settings.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, True)
-        settings.setAttribute(QWebEngineSettings.AllowRunningInsecureContent, True)
+    def create_page(self, parent=None):
+        """Create a web page on the shared profile"""
+        self.init_web_engine()
+        from .lite_mode import LiteModePage
         
-        return browser
+        # Web settings are inherited from the profile, see apply_page_defaults
+        return LiteModePage(self.profile, self.lite_mode, parent)
         
-    def add_new_tab(self, url=None, title="New Tab"):
-        """Add a new browser tab"""
-        if url is None:
-            url = self.settings.get('home_page', 'https://duckduckgo.com/')
-            
+    def create_tab_browser(self):
+        """Create a browser instance wired to the window's signal handlers"""
         browser = self.create_browser()
-        browser.setUrl(QUrl(url))
         
         # Connect signals
         browser.urlChanged.connect(lambda url: self.on_url_changed(browser, url))
         browser.titleChanged.connect(lambda title: self.on_title_changed(browser, title))
-        browser.loadProgress.connect(lambda progress: self.on_load_progress(progress))
-        browser.loadStarted.connect(self.on_load_started)
-        browser.loadFinished.connect(self.on_load_finished)
+        browser.loadFinished.connect(lambda success: self.on_load_finished(browser, success))
+        browser.iconChanged.connect(lambda icon: self.on_icon_changed(browser, icon))
+        self.tab_states.register(browser)
+        self.load_recorder.attach(browser)
+        self.thumbnails.attach(browser)
+        self.tab_search.attach(browser)
+        if self.session:
+            self.session.attach(browser)
         
         # Context menu for browser
         browser.setContextMenuPolicy(Qt.CustomContextMenu)
         browser.customContextMenuRequested.connect(
             lambda pos: self.show_context_menu(browser, pos)
         )
+        browser.renderProcessTerminated.connect(
+            lambda status, code: self.on_render_process_terminated(browser, status)
+        )
+        
+        return browser
+        
+    def create_pooled_browser(self):
+        """Create a tab browser sized for the tab area, ahead of time"""
+        browser = self.create_tab_browser()
+        current = self.tab_manager.currentWidget()
+        if current is not None:
+            browser.resize(current.size())
+        return browser
+        
+    def restore_session(self):
+        """Reopen the tabs of the last session as placeholders
+        
+        Only the active tab loads right away; the others load when selected
+        or, while there is memory headroom, through the lazy loader.
+        """
+        from .session import load_session, decode_history
+        
+        tabs, active = load_session(self.session.path)
+        if not tabs:
+            return
+        placeholders = []
+        self.tab_manager.blockSignals(True)
+        for tab in tabs:
+            placeholder = DiscardedTab(tab['url'], tab.get('title') or '', decode_history(tab.get('history')))
+            index = self.tab_manager.add_tab(placeholder, '')
+            self.tab_manager.set_tab_title(placeholder, placeholder.title() or tab['url'], index)
+            self.tab_manager.set_tab_discarded(index, True)
+            if tab.get('pinned'):
+                self.tab_manager.set_tab_pinned(index, True)
+            self.update_tab_icon(placeholder)
+            placeholders.append(placeholder)
+        active_tab = placeholders[active]
+        self.tab_manager.setCurrentWidget(active_tab)
+        self.tab_manager.blockSignals(False)
+        
+        self.on_tab_changed(self.tab_manager.currentIndex())
+        self.lazy_loader.enqueue(p for p in placeholders if p is not active_tab)
+        
+    def take_browser(self):
+        """Get a tab browser from the view pool, creating one on a miss"""
+        self.init_web_engine()
+        return self.view_pool.checkout()
+        
+    def add_new_tab(self, url=None, title="New Tab"):
+        """Add a new browser tab"""
+        start = time.perf_counter()
+        if url is None:
+            url = self.settings.get('home_page', 'https://duckduckgo.com/')
+            
+        browser = self.take_browser()
+        browser.setUrl(QUrl(url))
         
         tab_index = self.tab_manager.add_tab(browser, title)
+        self.update_tab_icon(browser)
         self.tab_manager.setCurrentIndex(tab_index)
+        self.tab_discarder.touch(browser)
+        self.tab_discarder.enforce_budget()
+        self.view_pool.record_open_time((time.perf_counter() - start) * 1000)
         
         # Focus URL bar when new tab is created
         QTimer.singleShot(100, self.focus_url_bar)
@@ -166,7 +463,7 @@ class BrowserWindow(QMainWindow):
         
         current_browser = self.get_current_browser()
         if current_browser:
-            current_browser.setUrl(QUrl(url))
+            self.load_url(current_browser, url)
             
     def go_back(self):
         """Navigate back"""
@@ -211,9 +508,6 @@ class BrowserWindow(QMainWindow):
                 self.nav_bar.bookmark_btn.setToolTip('Bookmark this page')
                 self.status_bar.showMessage("Bookmark removed", 3000)
             
-            # Refresh bookmarks bar
-            self.refresh_bookmarks_bar()
-            
     def focus_url_bar(self):
         """Focus the URL bar"""
         self.nav_bar.url_bar.selectAll()
@@ -244,26 +538,116 @@ class BrowserWindow(QMainWindow):
             current_browser.setZoomFactor(1.0)
             self.status_bar.showMessage("Zoom reset to 100%", 2000)
             
+    def show_task_manager(self):
+        """Show per-tab memory and CPU usage"""
+        from .task_manager import TaskManagerDialog
+        
+        self.init_web_engine()
+        dialog = TaskManagerDialog(self.task_manager, self)
+        dialog.exec_()
+        
+    def toggle_load_metrics(self):
+        """Show or hide the page load timing overlay"""
+        enabled = not self.load_recorder.overlay_enabled
+        self.load_recorder.set_overlay_enabled(enabled)
+        self.settings['show_load_metrics'] = enabled
+        self.status_bar.showMessage(f"Load metrics overlay {'on' if enabled else 'off'}", 2000)
+        
+    def clear_cache(self):
+        """Clear the HTTP cache of the browser profile"""
+        self.init_web_engine()
+        self.profile.clearHttpCache()
+        self.status_bar.showMessage("Cache cleared", 3000)
+        
     def show_history(self):
-        """Show browsing history (placeholder)"""
-        self.status_bar.showMessage("History feature coming soon...", 3000)
+        """Show browsing history"""
+        from .history_dialog import HistoryDialog
+        
+        self.init_web_engine()
+        dialog = HistoryDialog(self.history_manager, self)
+        dialog.url_selected.connect(self.open_bookmark)
+        dialog.exec_()
         
     def show_bookmarks(self):
         """Show bookmarks manager"""
-        bookmarks = self.bookmark_manager.get_bookmarks()
-        if bookmarks:
-            msg = "Bookmarks:\n" + "\n".join([f"• {b['title']}" for b in bookmarks[:5]])
-            if len(bookmarks) > 5:
-                msg += f"\n... and {len(bookmarks) - 5} more"
-        else:
-            msg = "No bookmarks yet"
-            
-        QMessageBox.information(self, "Bookmarks", msg)
+        self.bookmarks_bar.show_bookmark_manager()
             
+    def show_downloads(self):
+        """Show the downloads panel"""
+        from .download_manager import DownloadsPanel
+        
+        self.init_web_engine()
+        if self.downloads_panel is None:
+            self.downloads_panel = DownloadsPanel(self.download_manager, self)
+        self.downloads_panel.show()
+        self.downloads_panel.raise_()
+        self.downloads_panel.activateWindow()
+        
+    def show_tab_overview(self):
+        """Show thumbnails of all open tabs"""
+        from .thumbnails import TabOverviewDialog
+        
+        self.init_web_engine()
+        self.thumbnails.capture(self.get_current_browser())
+        dialog = TabOverviewDialog(self.thumbnails, self.tab_manager, self)
+        dialog.exec_()
+        
+    def show_tab_search(self):
+        """Find a tab by the text of its page"""
+        from .tab_search import TabSearchDialog
+        
+        self.init_web_engine()
+        dialog = TabSearchDialog(self.tab_search, self.tab_manager, self)
+        dialog.exec_()
+        
+    def on_download_finished(self, entry):
+        self.status_bar.showMessage(f"Download {entry.state}: {entry.filename}", 3000)
+        
     def get_current_browser(self):
         """Get current browser widget"""
         return self.tab_manager.currentWidget()
         
+    def on_bookmarks_changed(self, change, bookmarks):
+        """Keep URL bar suggestions in sync with the bookmarks"""
+        self.omnibox.index.update_many(
+            ((bookmark['url'], bookmark['title']) for bookmark in bookmarks),
+            bookmarked=(change == 'added')
+        )
+        
+    def get_blocked_count(self, browser):
+        """Number of requests blocked for the page shown in browser"""
+        if not self.content_blocker or not browser:
+            return 0
+        return self.content_blocker.blocked_count(browser.url().toString())
+        
+    def on_content_blocker_loaded(self):
+        rule_count = self.content_blocker.engine.rule_count
+        if rule_count:
+            self.status_bar.showMessage(f"Content blocking: {rule_count} rules loaded", 3000)
+        
+    def get_open_urls(self):
+        """URLs of all open tabs"""
+        return {
+            self.tab_manager.widget(i).url().toString()
+            for i in range(self.tab_manager.count())
+        }
+        
+    def get_tab_discard_stats(self):
+        """Get tab discard and restore counts for monitoring"""
+        return self.tab_discarder.get_stats()
+        
+    def get_view_pool_stats(self):
+        """Get view pool hit rate and tab-open latency for monitoring"""
+        return self.view_pool.get_stats()
+        
+    def get_tab_search_stats(self):
+        """Get tab search index size and memory use for monitoring"""
+        return self.tab_search.get_stats()
+        
+    def get_speculation_stats(self):
+        """Get preconnect and prerender hit/miss counts for monitoring"""
+        return self.speculation.get_stats()
+        
     def show_context_menu(self, browser, position):
         """Show right-click context menu"""
         menu = QMenu(self)
@@ -286,6 +670,19 @@ class BrowserWindow(QMainWindow):
             save_link_action = menu.addAction("Save Link As...")
             menu.addSeparator()
             
+        # Per-site lite mode
+        host = browser.url().host()
+        policy = self.lite_mode.policy(host)
+        lite_action = menu.addAction("Lite Mode for This Site")
+        lite_action.setCheckable(True)
+        lite_action.setChecked(policy.lite)
+        lite_action.setEnabled(bool(host))
+        javascript_action = menu.addAction("JavaScript for This Site")
+        javascript_action.setCheckable(True)
+        javascript_action.setChecked(policy.javascript)
+        javascript_action.setEnabled(bool(host))
+        menu.addSeparator()
+        
         # Page actions
         view_source_action = menu.addAction("View Page Source")
         inspect_action = menu.addAction("Inspect Element")
@@ -304,6 +701,8 @@ class BrowserWindow(QMainWindow):
             open_link_new_tab_action.triggered.connect(lambda: self.add_new_tab(link_url))
             save_link_action.triggered.connect(lambda: self.save_link_as(link_url))
             
+        lite_action.triggered.connect(lambda: self.toggle_lite_mode(browser))
+        javascript_action.triggered.connect(lambda: self.toggle_site_javascript(browser))
         view_source_action.triggered.connect(lambda: self.view_page_source(browser))
         inspect_action.triggered.connect(lambda: browser.page().triggerAction(QWebEnginePage.InspectElement))
         copy_action.triggered.connect(lambda: browser.page().triggerAction(QWebEnginePage.Copy))
@@ -311,42 +710,50 @@ class BrowserWindow(QMainWindow):
         
         menu.exec_(browser.mapToGlobal(position))
         
+    def toggle_lite_mode(self, browser):
+        """Turn lite mode on or off for the site shown in browser and reload it"""
+        if not isinstance(browser, QWebEngineView):
+            return
+        host = browser.url().host()
+        if not host:
+            return
+        lite = not self.lite_mode.policy(host).lite
+        self.lite_mode.set_site(host, lite=lite)
+        self.status_bar.showMessage(f"Lite mode {'on' if lite else 'off'} for {host}", 3000)
+        if lite:
+            # Learn the sizes of the images already loaded before reloading
+            self.lite_mode.collect_sizes(browser.page(), browser.reload)
+        else:
+            browser.reload()
+        
+    def toggle_site_javascript(self, browser):
+        """Allow or block JavaScript for the site shown in browser and reload it"""
+        host = browser.url().host()
+        if not host:
+            return
+        javascript = not self.lite_mode.policy(host).javascript
+        self.lite_mode.set_site(host, javascript=javascript)
+        self.status_bar.showMessage(f"JavaScript {'allowed' if javascript else 'blocked'} for {host}", 3000)
+        browser.reload()
+        
     def save_link_as(self, link_url):
         """Save link target to downloads directory"""
-        try:
-            # Extract filename from URL or use a default name
-            filename = os.path.basename(link_url)
-            if not filename or '.' not in filename:
-                filename = "downloaded_file"
-                
-            # Get downloads directory
-            downloads_dir = self.settings.get('download_path', os.path.expanduser('~/Downloads'))
-            os.makedirs(downloads_dir, exist_ok=True)
-            
-            # Create file path
-            file_path = os.path.join(downloads_dir, filename)
-            
-            # Download the file
-            current_browser = self.get_current_browser()
-            if current_browser:
-                current_browser.page().profile().downloadRequested.connect(
-                    lambda download: download.setPath(file_path)
-                )
-                
-            # Start download
-            current_browser.page().profile().download(link_url)
-            self.status_bar.showMessage(f"Downloading: {filename}", 3000)
-            
-        except Exception as e:
-            QMessageBox.warning(self, "Download Error", f"Failed to download file: {str(e)}")
+        current_browser = self.get_current_browser()
+        if not isinstance(current_browser, QWebEngineView):
+            return
+        # The download manager's downloadRequested handler picks the path
+        current_browser.page().download(QUrl(link_url))
+        self.status_bar.showMessage(f"Downloading: {link_url}", 3000)
         
     def view_page_source(self, browser):
-        """View page source in new tab"""
-        def handle_source(content):
-            source_browser = self.add_new_tab(None, "Page Source")
-            source_browser.setHtml(f"<pre>{content}</pre>")
-            
-        browser.page().toPlainText(handle_source)
+        """View page source in a source viewer window"""
+        from PyQt5 import sip
+        from .source_viewer import PageSourceViewer
+        
+        viewer = PageSourceViewer(browser.url().toString(), self)
+        viewer.show()
+        # The viewer deletes itself on close, possibly before the HTML arrives
+        browser.page().toHtml(lambda html: sip.isdeleted(viewer) or viewer.set_source(html))
         
     def open_link_in_new_tab(self):
         """Handle Ctrl+click to open links in new tabs"""
@@ -356,85 +763,164 @@ class BrowserWindow(QMainWindow):
         
     # Signal handlers
     def on_url_changed(self, browser, url):
-        if browser == self.get_current_browser():
-            self.nav_bar.url_bar.setText(url.toString())
+        self.update_tab_icon(browser)
+        if not self.ephemeral:
+            # The title is still the previous page's; on_title_changed fills it in
+            self.history_manager.add_visit(url.toString(), '')
+            self.omnibox.index.add_visit(url.toString(), '')
             
-            # Update bookmark button state
-            current_url = url.toString()
-            is_bookmarked = any(b['url'] == current_url for b in self.bookmark_manager.get_bookmarks())
-            self.nav_bar.bookmark_btn.setText('★' if is_bookmarked else '☆')
-            self.nav_bar.bookmark_btn.setToolTip(
-                'Remove bookmark' if is_bookmarked else 'Bookmark this page'
-            )
+    def on_icon_changed(self, browser, icon):
+        # Pages report an empty icon while navigating; keep the stored one
+        if icon.isNull():
+            return
+        self.favicons.store(browser.url().toString(), icon)
+        index = self.tab_manager.indexOf(browser)
+        if index >= 0:
+            self.tab_manager.setTabIcon(index, icon)
+            
+    def update_tab_icon(self, browser):
+        """Show the stored icon of the browser's site on its tab"""
+        index = self.tab_manager.indexOf(browser)
+        if index >= 0:
+            icon = self.favicons.icon(browser.url().toString())
+            self.tab_manager.setTabIcon(index, icon if icon is not None else QIcon())
+            
+    def on_favicon_ready(self, origin, icon):
+        from .speculation import url_origin
+        
+        for index in range(self.tab_manager.count()):
+            widget = self.tab_manager.widget(index)
+            if hasattr(widget, 'url') and url_origin(widget.url().toString()) == origin:
+                self.tab_manager.setTabIcon(index, icon)
             
     def on_title_changed(self, browser, title):
-        self.tab_manager.set_tab_title(browser, title)
-        if browser == self.get_current_browser():
-            self.setWindowTitle(f"{title} - LightPy Browser")
+        if not self.ephemeral:
+            self.history_manager.update_title(browser.url().toString(), title)
+            self.omnibox.index.update(browser.url().toString(), title)
             
     def on_tab_changed(self, index):
-        browser = self.tab_manager.widget(index)
+        from .tab_state import ALL_FIELDS
+        
+        # Rebuild the page if this tab was discarded
+        browser = self.tab_discarder.restore(index)
         if browser:
-            current_url = browser.url().toString()
-            self.nav_bar.url_bar.setText(current_url)
+            self.tab_discarder.touch(browser)
+            state = self.tab_states.get(browser)
+            if state:
+                if not state.url:
+                    self.tab_states.sync_from_view(state)
+                self.render_tab_state(state, ALL_FIELDS)
+            
+    def render_tab_state(self, state, fields):
+        """Update the window chrome from the current tab's cached state"""
+        if 'url' in fields:
+            self.nav_bar.url_bar.setText(state.url)
             
-            # Update bookmark button for current page
-            is_bookmarked = any(b['url'] == current_url for b in self.bookmark_manager.get_bookmarks())
-            self.nav_bar.bookmark_btn.setText('★' if is_bookmarked else '☆')
+        if 'bookmarked' in fields:
+            self.nav_bar.bookmark_btn.setText('★' if state.bookmarked else '☆')
             self.nav_bar.bookmark_btn.setToolTip(
-                'Remove bookmark' if is_bookmarked else 'Bookmark this page'
+                'Remove bookmark' if state.bookmarked else 'Bookmark this page'
             )
             
-    def on_load_progress(self, progress):
-        self.nav_bar.update_load_progress(progress)
-        
-    def on_load_started(self):
-        self.status_bar.showMessage("Loading...")
+        if 'title' in fields:
+            self.setWindowTitle(f"{state.title} - LightPy Browser" if state.title else "LightPy Browser")
+            
+        if 'progress' in fields or 'load' in fields:
+            self.nav_bar.update_load_progress(state.progress if state.load_state == 'loading' else 0)
+            
+        if 'load' in fields:
+            if state.load_state == 'loading':
+                self.status_bar.showMessage("Loading...")
+            elif state.load_state == 'finished':
+                message = "Ready"
+                blocked = self.get_blocked_count(state.browser)
+                if blocked:
+                    message += f" - {blocked} requests blocked"
+                saved_requests, saved_bytes = self.lite_mode.saved(state.url)
+                if saved_requests:
+                    message += f" - Lite mode saved {format_size(saved_bytes)} in {saved_requests} requests"
+                self.status_bar.showMessage(message)
+            elif state.load_state == 'failed':
+                self.status_bar.showMessage("Failed to load page")
+            else:
+                self.status_bar.clearMessage()
+            
+    def on_render_process_terminated(self, browser, status):
+        if status != QWebEnginePage.NormalTerminationStatus and browser == self.get_current_browser():
+            self.status_bar.showMessage("The page's renderer process ended - reload to restore it")
         
-    def on_load_finished(self, success):
-        if success:
-            self.status_bar.showMessage("Ready")
-        else:
-            self.status_bar.showMessage("Failed to load page")
-        self.nav_bar.update_load_progress(0)
+    def on_load_finished(self, browser, success):
+        startup_trace.finish("first-load-finished")
         
     def load_settings(self):
         """Load browser settings"""
-        settings_file = "browser_settings.json"
+        settings_file = get_data_file(SETTINGS_FILE)
         default_settings = {
             'home_page': 'https://duckduckgo.com/',
             'search_engine': 'https://duckduckgo.com/search?q=',
             'download_path': os.path.expanduser('~/Downloads'),
-            'default_zoom': 1.0
+            'default_zoom': 1.0,
+            'tab_memory_budget_mb': 2048,
+            'tab_memory_estimate_mb': 150,
+            'cache_max_size_mb': 256,
+            'ephemeral_profile': False,
+            'history_retention_days': 90,
+            'bookmarks_bar_max_items': 30,
+            'content_blocking': True,
+            'load_metrics_log': True,
+            'show_load_metrics': False,
+            'metrics_dump_interval_s': 0,
+            'max_concurrent_downloads': 3,
+            'performance_profile': DEFAULT_PERFORMANCE_PROFILE,
+            'extra_chromium_flags': [],
+            'speculation_enabled': True,
+            'max_prerenders': 1,
+            'max_preconnects': 4,
+            'thumbnail_cache_mb': 16,
+            'thumbnail_spill_to_disk': True,
+            'lite_mode_default': False,
+            'lite_mode_image_threshold_kb': 100,
+            'view_pool_size': 2,
+            'view_pool_memory_cap_mb': 64,
+            'favicon_cache_size': 500,
+            'restore_session': True,
+            'session_load_interval_ms': 2000,
+            'tab_search_index_mb': 32
         }
         
-        try:
-            if os.path.exists(settings_file):
-                with open(settings_file, 'r') as f:
-                    loaded_settings = json.load(f)
-                    return {**default_settings, **loaded_settings}
-        except Exception as e:
-            print(f"Error loading settings: {e}")
+        loaded_settings = load_json(settings_file, {})
+        if isinstance(loaded_settings, dict):
+            return {**default_settings, **loaded_settings}
             
         return default_settings
         
     def save_settings(self):
         """Save browser settings"""
-        settings_file = "browser_settings.json"
-        try:
-            with open(settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        settings_file = get_data_file(SETTINGS_FILE)
+        self.persistence.schedule(settings_file, dict(self.settings), indent=2)
         
     def closeEvent(self, event):
-        """Save settings when closing"""
+        """Save settings and the session when closing"""
+        if self.session:
+            self.session.stop()
+        if self.lazy_loader:
+            self.lazy_loader.stop()
         self.save_settings()
+        # The favicon index is saved through the persistence service
+        self.favicons.stop()
+        self.persistence.stop()
+        if self.profile is not None:
+            self.speculation.clear()
+            self.view_pool.clear()
+            self.thumbnails.stop()
+            self.tab_search.stop()
+        if self.history_manager:
+            self.history_manager.close()
         
         # Close all browser tabs properly
         for i in range(self.tab_manager.count()):
             browser = self.tab_manager.widget(i)
-            if browser:
+            if isinstance(browser, QWebEngineView):
                 browser.stop()
                 browser.deleteLater()
                 
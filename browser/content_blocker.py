@@ -0,0 +1,337 @@
+import os
+import re
+import pickle
+import threading
+from PyQt5.QtCore import *
+from PyQt5.QtWebEngineCore import *
+
+CACHE_VERSION = 1
+
+# Tokens found in almost every URL make poor bucket keys
+COMMON_TOKENS = {'http', 'https', 'www', 'com', 'net', 'org', 'html', 'php', 'js'}
+
+TOKEN_RE = re.compile(r'[a-z0-9%]{3,}')
+RULE_TOKEN_RE = re.compile(r'(?<=[^a-z0-9%*])[a-z0-9%]{3,}(?=[^a-z0-9%*])')
+DOMAIN_RULE_RE = re.compile(r'^\|\|([a-z0-9.-]+)\^?$')
+
+RESOURCE_OPTIONS = {
+    'script', 'image', 'stylesheet', 'object', 'xmlhttprequest', 'subdocument',
+    'ping', 'media', 'font', 'websocket', 'other',
+}
+IGNORED_OPTIONS = {'important'}
+
+
+def base_domain(host):
+    """Approximate registrable domain: the last two labels of host"""
+    return '.'.join(host.split('.')[-2:])
+
+
+def parent_domains(host):
+    """host and each of its parent domains, most specific first"""
+    parts = host.split('.')
+    return ['.'.join(parts[i:]) for i in range(len(parts) - 1)] or [host]
+
+
+def pattern_to_regex(pattern):
+    """Translate an Adblock Plus URL pattern into a regular expression"""
+    regex = ''
+    if pattern.startswith('||'):
+        regex = r'^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?'
+        pattern = pattern[2:]
+    elif pattern.startswith('|'):
+        regex = '^'
+        pattern = pattern[1:]
+    end_anchor = pattern.endswith('|')
+    if end_anchor:
+        pattern = pattern[:-1]
+
+    for char in pattern:
+        if char == '*':
+            regex += '.*'
+        elif char == '^':
+            regex += r'(?:[^\w\-.%]|$)'
+        else:
+            regex += re.escape(char)
+    if end_anchor:
+        regex += '$'
+    return regex
+
+
+class Rule:
+    __slots__ = ('source', 'regex', 'match_case', 'third_party', 'types', 'excluded_types',
+                 'include_domains', 'exclude_domains', 'compiled')
+
+    def __init__(self, source, regex, match_case=False, third_party=None, types=None,
+                 excluded_types=None, include_domains=None, exclude_domains=None):
+        self.source = source
+        self.regex = regex
+        self.match_case = match_case
+        self.third_party = third_party
+        self.types = types
+        self.excluded_types = excluded_types
+        self.include_domains = include_domains
+        self.exclude_domains = exclude_domains
+        self.compiled = None
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__[:-1])
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__[:-1], state):
+            setattr(self, name, value)
+        self.compiled = None
+
+    def matches(self, url, lower_url, first_party_host, resource_type, third_party):
+        if self.types is not None and resource_type not in self.types:
+            return False
+        if self.excluded_types is not None and resource_type in self.excluded_types:
+            return False
+        if self.third_party is not None and self.third_party != third_party:
+            return False
+        if self.include_domains or self.exclude_domains:
+            domains = parent_domains(first_party_host)
+            if self.exclude_domains and any(d in self.exclude_domains for d in domains):
+                return False
+            if self.include_domains and not any(d in self.include_domains for d in domains):
+                return False
+        if self.compiled is None:
+            self.compiled = re.compile(self.regex, 0 if self.match_case else re.IGNORECASE)
+        return self.compiled.search(url if self.match_case else lower_url) is not None
+
+
+def parse_rule(line):
+    """Parse one filter list line into (is_exception, Rule), or None if unsupported"""
+    line = line.strip()
+    if not line or line.startswith(('!', '[')) or '##' in line or '#@#' in line or '#?#' in line:
+        return None
+
+    exception = line.startswith('@@')
+    if exception:
+        line = line[2:]
+
+    options = {}
+    if '$' in line:
+        line, _, option_text = line.rpartition('$')
+        for option in option_text.split(','):
+            name, _, value = option.strip().lower().partition('=')
+            options[name] = value
+
+    # Regular expression rules are rare and slow; skip them
+    if not line or (line.startswith('/') and line.endswith('/') and len(line) > 1):
+        return None
+
+    rule = Rule(line, pattern_to_regex(line.lower() if 'match-case' not in options else line))
+    types = set()
+    excluded_types = set()
+    for name, value in options.items():
+        inverse = name.startswith('~')
+        key = name.lstrip('~')
+        if key in RESOURCE_OPTIONS:
+            (excluded_types if inverse else types).add(key)
+        elif key == 'third-party':
+            rule.third_party = not inverse
+        elif key == 'match-case':
+            rule.match_case = True
+        elif key == 'domain':
+            domains = [d for d in value.split('|') if d]
+            rule.include_domains = frozenset(d for d in domains if not d.startswith('~')) or None
+            rule.exclude_domains = frozenset(d[1:] for d in domains if d.startswith('~')) or None
+        elif key not in IGNORED_OPTIONS:
+            return None
+    rule.types = frozenset(types) or None
+    rule.excluded_types = frozenset(excluded_types) or None
+    return exception, rule
+
+
+def rule_token(rule):
+    """Pick the bucket token for a rule, or '' for the generic bucket
+
+    Only runs delimited on both sides by a separator or anchor qualify, so
+    the token is guaranteed to appear as a whole token in matching URLs.
+    """
+    candidates = [t for t in RULE_TOKEN_RE.findall(rule.source.lower()) if t not in COMMON_TOKENS]
+    return max(candidates, key=len) if candidates else ''
+
+
+class FilterEngine:
+    """Compiled set of EasyList-style blocking and exception rules
+
+    Plain ||domain^ rules go into a hash set checked against the request
+    host and its parents. Every other rule is filed under one token of its
+    pattern; a request only tests the rules filed under tokens that occur
+    in its URL, plus a small generic bucket.
+    """
+
+    def __init__(self):
+        self.blocked_domains = set()
+        self.block_rules = {}      # token -> [Rule]
+        self.exception_rules = {}  # token -> [Rule]
+        self.rule_count = 0
+
+    def add_line(self, line):
+        parsed = parse_rule(line)
+        if parsed is None:
+            return
+        exception, rule = parsed
+        domain_match = DOMAIN_RULE_RE.match(rule.source.lower())
+        if not exception and domain_match and not (rule.types or rule.excluded_types or
+                                                  rule.third_party is not None or
+                                                  rule.include_domains or rule.exclude_domains):
+            self.blocked_domains.add(domain_match.group(1))
+        else:
+            buckets = self.exception_rules if exception else self.block_rules
+            buckets.setdefault(rule_token(rule), []).append(rule)
+        self.rule_count += 1
+
+    def load_file(self, path):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                self.add_line(line)
+
+    def find_match(self, buckets, url, lower_url, tokens, first_party_host, resource_type, third_party):
+        for token in tokens:
+            for rule in buckets.get(token, ()):
+                if rule.matches(url, lower_url, first_party_host, resource_type, third_party):
+                    return rule
+        for rule in buckets.get('', ()):
+            if rule.matches(url, lower_url, first_party_host, resource_type, third_party):
+                return rule
+        return None
+
+    def should_block(self, url, host, first_party_host, resource_type='other'):
+        """Decide whether a request should be blocked"""
+        lower_url = url.lower()
+        host = host.lower()
+        first_party_host = first_party_host.lower()
+        third_party = bool(first_party_host) and base_domain(host) != base_domain(first_party_host)
+        tokens = set(TOKEN_RE.findall(lower_url))
+
+        blocked = any(domain in self.blocked_domains for domain in parent_domains(host))
+        if not blocked:
+            blocked = self.find_match(self.block_rules, url, lower_url, tokens,
+                                      first_party_host, resource_type, third_party) is not None
+        if not blocked:
+            return False
+        return self.find_match(self.exception_rules, url, lower_url, tokens,
+                               first_party_host, resource_type, third_party) is None
+
+
+def list_filter_files(filters_dir):
+    if not os.path.isdir(filters_dir):
+        return []
+    return sorted(
+        os.path.join(filters_dir, name) for name in os.listdir(filters_dir)
+        if name.endswith('.txt')
+    )
+
+
+def load_engine(filters_dir, cache_path):
+    """Build a FilterEngine from the lists in filters_dir, using a compiled cache
+
+    The cache is reused as long as the set of list files and their sizes
+    and modification times are unchanged.
+    """
+    files = list_filter_files(filters_dir)
+    signature = (CACHE_VERSION, tuple((path, os.path.getsize(path), os.path.getmtime(path)) for path in files))
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_signature, engine = pickle.load(f)
+        if cached_signature == signature:
+            return engine
+    except (OSError, EOFError, pickle.PickleError, ValueError, AttributeError):
+        pass
+
+    engine = FilterEngine()
+    for path in files:
+        try:
+            engine.load_file(path)
+        except OSError as e:
+            print(f"Error loading filter list {path}: {e}")
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((signature, engine), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Error caching filter lists: {e}")
+    return engine
+
+
+RESOURCE_TYPES = {
+    QWebEngineUrlRequestInfo.ResourceTypeScript: 'script',
+    QWebEngineUrlRequestInfo.ResourceTypeImage: 'image',
+    QWebEngineUrlRequestInfo.ResourceTypeFavicon: 'image',
+    QWebEngineUrlRequestInfo.ResourceTypeStylesheet: 'stylesheet',
+    QWebEngineUrlRequestInfo.ResourceTypeObject: 'object',
+    QWebEngineUrlRequestInfo.ResourceTypePluginResource: 'object',
+    QWebEngineUrlRequestInfo.ResourceTypeXhr: 'xmlhttprequest',
+    QWebEngineUrlRequestInfo.ResourceTypeSubFrame: 'subdocument',
+    QWebEngineUrlRequestInfo.ResourceTypePing: 'ping',
+    QWebEngineUrlRequestInfo.ResourceTypeMedia: 'media',
+    QWebEngineUrlRequestInfo.ResourceTypeFontResource: 'font',
+}
+
+
+class ContentBlockingInterceptor(QWebEngineUrlRequestInterceptor):
+    """Profile request interceptor that blocks requests matched by a FilterEngine
+
+    Blocked requests are counted per first-party page URL, which is how
+    they are attributed to tabs. A page's count is reset when it is
+    navigated to again. A profile has a single interceptor, so requests
+    that pass the filters are also checked against the per-site lite mode
+    policies when lite_mode is set.
+    """
+
+    engine_loaded = pyqtSignal()
+
+    def __init__(self, parent=None, lite_mode=None):
+        super().__init__(parent)
+        self.lite_mode = lite_mode
+        self.engine = FilterEngine()
+        self.blocked_counts = {}  # first-party URL -> blocked requests
+        self.total_blocked = 0
+
+    def load_async(self, filters_dir, cache_path):
+        """Load the filter lists on a worker thread and swap the engine in"""
+        def worker():
+            try:
+                self.engine = load_engine(filters_dir, cache_path)
+            except Exception as e:
+                print(f"Error loading content blocking rules: {e}")
+            self.engine_loaded.emit()
+        threading.Thread(target=worker, name="content-blocker", daemon=True).start()
+
+    def interceptRequest(self, info):
+        resource_type = info.resourceType()
+        if resource_type == QWebEngineUrlRequestInfo.ResourceTypeMainFrame:
+            page_url = info.requestUrl().toString()
+            self.blocked_counts.pop(page_url, None)
+            if self.lite_mode is not None:
+                self.lite_mode.reset(page_url)
+            return
+
+        request_url = info.requestUrl()
+        url = request_url.toString()
+        host = request_url.host()
+        first_party_url = info.firstPartyUrl()
+        first_party_host = first_party_url.host()
+        type_name = RESOURCE_TYPES.get(resource_type, 'other')
+        if self.engine.should_block(url, host, first_party_host, type_name):
+            info.block(True)
+            page_url = first_party_url.toString()
+            self.blocked_counts[page_url] = self.blocked_counts.get(page_url, 0) + 1
+            self.total_blocked += 1
+            return
+
+        if self.lite_mode is not None:
+            saved = self.lite_mode.check(url, host, first_party_host, type_name)
+            if saved is not None:
+                info.block(True)
+                self.lite_mode.record(first_party_url.toString(), saved)
+
+    def blocked_count(self, page_url):
+        """Number of requests blocked for the page at page_url"""
+        return self.blocked_counts.get(page_url, 0)
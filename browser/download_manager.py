@@ -0,0 +1,313 @@
+import os
+import time
+from collections import deque
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtWebEngineWidgets import *
+from .formatting import format_size
+
+FINISHED_STATES = ('completed', 'cancelled', 'failed')
+
+
+def format_eta(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def unique_path(directory, filename):
+    """Path for filename in directory that doesn't overwrite an existing file"""
+    base, ext = os.path.splitext(filename)
+    path = os.path.join(directory, filename)
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{base} ({counter}){ext}")
+        counter += 1
+    return path
+
+
+class DownloadEntry:
+    """Progress and throughput of one download"""
+
+    def __init__(self, item, index):
+        self.item = item
+        self.index = index
+        self.path = item.path()
+        self.url = item.url().toString()
+        self.state = 'queued'  # queued, downloading, paused, completed, cancelled or failed
+        self.received = 0
+        self.total = -1
+        self.speed = 0.0  # bytes per second, smoothed
+        self.sample_bytes = 0
+        self.sample_time = time.monotonic()
+
+    @property
+    def filename(self):
+        return os.path.basename(self.path)
+
+    def update_progress(self, received, total):
+        self.received = received
+        self.total = total
+        now = time.monotonic()
+        elapsed = now - self.sample_time
+        if elapsed >= 0.5:
+            instant = (received - self.sample_bytes) / elapsed
+            self.speed = instant if not self.speed else 0.7 * self.speed + 0.3 * instant
+            self.sample_bytes = received
+            self.sample_time = now
+
+    def eta(self):
+        """Seconds left, or None if unknown"""
+        if self.state != 'downloading' or self.total <= 0 or self.speed <= 0:
+            return None
+        return (self.total - self.received) / self.speed
+
+    def describe(self):
+        if self.total > 0:
+            size = f"{format_size(self.received)} of {format_size(self.total)}"
+        else:
+            size = format_size(self.received)
+        if self.state == 'downloading':
+            parts = [size, f"{format_size(self.speed)}/s"]
+            eta = self.eta()
+            if eta is not None:
+                parts.append(f"{format_eta(eta)} left")
+            return ' - '.join(parts)
+        return f"{size} - {self.state.capitalize()}"
+
+
+class DownloadManager(QObject):
+    """Single downloadRequested handler with a bounded set of active downloads
+
+    Every download is accepted immediately so it isn't cancelled, then
+    paused if max_concurrent downloads are already running. Queued
+    downloads are resumed in order as active ones finish or are paused.
+    Progress updates are coalesced and published a few times a second.
+    """
+
+    download_added = pyqtSignal(object)
+    download_finished = pyqtSignal(object)
+    entries_updated = pyqtSignal(list)
+    entries_reset = pyqtSignal()
+
+    def __init__(self, download_dir, max_concurrent=3, parent=None):
+        super().__init__(parent)
+        self.download_dir = download_dir
+        self.max_concurrent = max_concurrent
+        self.entries = []
+        self.active = set()
+        self.queue = deque()
+        self.dirty = set()
+
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(250)
+        self.update_timer.timeout.connect(self.publish_updates)
+
+    def attach(self, profile):
+        profile.downloadRequested.connect(self.on_download_requested)
+
+    def on_download_requested(self, item):
+        try:
+            os.makedirs(self.download_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Error creating download directory: {e}")
+        filename = os.path.basename(item.path()) or "downloaded_file"
+        item.setPath(unique_path(self.download_dir, filename))
+        item.accept()
+
+        entry = DownloadEntry(item, len(self.entries))
+        self.entries.append(entry)
+        item.downloadProgress.connect(lambda received, total: self.on_progress(entry, received, total))
+        item.finished.connect(lambda: self.on_finished(entry))
+
+        if len(self.active) < self.max_concurrent:
+            self.start(entry)
+        else:
+            item.pause()
+            self.queue.append(entry)
+        self.download_added.emit(entry)
+
+    def start(self, entry):
+        entry.state = 'downloading'
+        entry.sample_time = time.monotonic()
+        entry.sample_bytes = entry.received
+        self.active.add(entry)
+        if entry.item.isPaused():
+            entry.item.resume()
+        self.mark_dirty(entry)
+
+    def start_next(self):
+        while self.queue and len(self.active) < self.max_concurrent:
+            entry = self.queue.popleft()
+            if entry.state == 'queued':
+                self.start(entry)
+
+    def pause(self, entry):
+        if entry.state == 'downloading':
+            entry.item.pause()
+            entry.state = 'paused'
+            entry.speed = 0.0
+            self.active.discard(entry)
+            self.start_next()
+        elif entry.state == 'queued':
+            entry.state = 'paused'
+        self.mark_dirty(entry)
+
+    def resume(self, entry):
+        if entry.state != 'paused':
+            return
+        if len(self.active) < self.max_concurrent:
+            self.start(entry)
+        else:
+            entry.state = 'queued'
+            self.queue.append(entry)
+            self.mark_dirty(entry)
+
+    def cancel(self, entry):
+        if entry.state not in FINISHED_STATES:
+            entry.item.cancel()
+
+    def on_progress(self, entry, received, total):
+        entry.update_progress(received, total)
+        self.mark_dirty(entry)
+
+    def on_finished(self, entry):
+        state = entry.item.state()
+        if state == QWebEngineDownloadItem.DownloadCompleted:
+            entry.state = 'completed'
+        elif state == QWebEngineDownloadItem.DownloadCancelled:
+            entry.state = 'cancelled'
+        else:
+            entry.state = 'failed'
+        entry.speed = 0.0
+        self.active.discard(entry)
+        self.start_next()
+        self.mark_dirty(entry)
+        self.download_finished.emit(entry)
+
+    def clear_finished(self):
+        """Forget completed, cancelled and failed downloads"""
+        self.entries = [e for e in self.entries if e.state not in FINISHED_STATES]
+        for index, entry in enumerate(self.entries):
+            entry.index = index
+        self.dirty.clear()
+        self.entries_reset.emit()
+
+    def mark_dirty(self, entry):
+        self.dirty.add(entry)
+        if not self.update_timer.isActive():
+            self.update_timer.start()
+
+    def publish_updates(self):
+        dirty, self.dirty = self.dirty, set()
+        self.entries_updated.emit([entry.index for entry in dirty])
+
+    def active_count(self):
+        return len(self.active)
+
+
+class DownloadListModel(QAbstractListModel):
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.row_count = len(manager.entries)
+        manager.download_added.connect(self.on_download_added)
+        manager.entries_updated.connect(self.on_entries_updated)
+        manager.entries_reset.connect(self.on_entries_reset)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.manager.entries):
+            return None
+        entry = self.manager.entries[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{entry.filename}\n{entry.describe()}"
+        if role == Qt.ToolTipRole:
+            return f"{entry.url}\n{entry.path}"
+        if role == Qt.UserRole:
+            return entry
+        return None
+
+    def on_download_added(self, entry):
+        self.beginInsertRows(QModelIndex(), self.row_count, self.row_count)
+        self.row_count = len(self.manager.entries)
+        self.endInsertRows()
+
+    def on_entries_updated(self, rows):
+        for row in rows:
+            if 0 <= row < self.row_count:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+    def on_entries_reset(self):
+        self.beginResetModel()
+        self.row_count = len(self.manager.entries)
+        self.endResetModel()
+
+
+class DownloadsPanel(QDialog):
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.setup_ui()
+
+    def setup_ui(self):
+        self.setWindowTitle("Downloads")
+        self.setGeometry(250, 250, 550, 400)
+
+        layout = QVBoxLayout(self)
+
+        self.model = DownloadListModel(self.manager, self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.model)
+        self.list_view.activated.connect(self.open_file)
+        layout.addWidget(self.list_view)
+
+        button_layout = QHBoxLayout()
+        pause_btn = QPushButton("Pause/Resume")
+        pause_btn.clicked.connect(self.toggle_pause)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.cancel_selected)
+        folder_btn = QPushButton("Open Folder")
+        folder_btn.clicked.connect(self.open_folder)
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.manager.clear_finished)
+
+        button_layout.addWidget(pause_btn)
+        button_layout.addWidget(cancel_btn)
+        button_layout.addWidget(folder_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(clear_btn)
+        layout.addLayout(button_layout)
+
+    def selected_entry(self):
+        index = self.list_view.currentIndex()
+        return index.data(Qt.UserRole) if index.isValid() else None
+
+    def toggle_pause(self):
+        entry = self.selected_entry()
+        if not entry:
+            return
+        if entry.state == 'paused':
+            self.manager.resume(entry)
+        else:
+            self.manager.pause(entry)
+
+    def cancel_selected(self):
+        entry = self.selected_entry()
+        if entry:
+            self.manager.cancel(entry)
+
+    def open_file(self, index):
+        entry = index.data(Qt.UserRole)
+        if entry and entry.state == 'completed':
+            QDesktopServices.openUrl(QUrl.fromLocalFile(entry.path))
+
+    def open_folder(self):
+        QDesktopServices.openUrl(QUrl.fromLocalFile(self.manager.download_dir))
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from .speculation import url_origin
+from .storage import atomic_write_json, get_data_dir, get_data_file, load_json
+
+ICON_SIZE = 32
+
+
+class FaviconStore(QObject):
+    """Site icons kept on disk and in an in-memory LRU of QIcons by origin
+
+    Icons reported by pages are encoded as PNG on a worker thread and
+    stored once per content hash, so sites sharing an icon share a file.
+    An index maps each origin to its icon hash. Lookups that miss the LRU
+    read the file in the background and announce the icon through
+    icon_ready, so nothing waits on disk or the network. With persist off
+    new icons are only kept in memory.
+    """
+
+    icon_ready = pyqtSignal(str, QIcon)
+    image_stored = pyqtSignal(str, str)
+    image_loaded = pyqtSignal(str, QImage)
+
+    def __init__(self, persistence=None, max_icons=500, persist=True, parent=None):
+        super().__init__(parent)
+        self.persistence = persistence
+        self.max_icons = max_icons
+        self.persist = persist
+        self.icons_dir = os.path.join(get_data_dir(), 'favicons')
+        self.index_file = get_data_file("favicons.json")
+        index = load_json(self.index_file, {})
+        self.index = index if isinstance(index, dict) else {}  # origin -> content hash
+        self.cache = OrderedDict()  # origin -> QIcon, least recently used first
+        self.loading = set()
+
+        self.image_stored.connect(self.on_image_stored)
+        self.image_loaded.connect(self.on_image_loaded)
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="favicons", daemon=True)
+        self.thread.start()
+        if self.persist:
+            self.requests.put(('prune', set(self.index.values())))
+
+    def icon(self, url):
+        """Cached icon for the origin of url, or None
+
+        On a miss the icon is read from disk in the background if the
+        origin has one, and announced through icon_ready.
+        """
+        origin = url_origin(url)
+        if not origin:
+            return None
+        icon = self.cache.get(origin)
+        if icon is not None:
+            self.cache.move_to_end(origin)
+            return icon
+        content_hash = self.index.get(origin)
+        if content_hash and origin not in self.loading:
+            self.loading.add(origin)
+            self.requests.put(('load', origin, content_hash))
+        return None
+
+    def store(self, url, icon):
+        """Remember the icon a page at url reported"""
+        origin = url_origin(url)
+        if not origin or icon.isNull():
+            return
+        self.remember(origin, icon)
+        if not self.persist:
+            return
+        image = icon.pixmap(ICON_SIZE, ICON_SIZE).toImage()
+        if not image.isNull():
+            self.requests.put(('store', origin, image))
+
+    def remember(self, origin, icon):
+        self.cache.pop(origin, None)
+        self.cache[origin] = icon
+        while len(self.cache) > self.max_icons:
+            self.cache.popitem(last=False)
+
+    def on_image_stored(self, origin, content_hash):
+        if self.index.get(origin) == content_hash:
+            return
+        self.index[origin] = content_hash
+        self.save_index()
+
+    def on_image_loaded(self, origin, image):
+        self.loading.discard(origin)
+        if image.isNull():
+            # Missing or unreadable file; the next lookup tries again
+            return
+        icon = QIcon(QPixmap.fromImage(image))
+        self.remember(origin, icon)
+        self.icon_ready.emit(origin, icon)
+
+    def save_index(self):
+        snapshot = dict(self.index)
+        if self.persistence:
+            self.persistence.schedule(self.index_file, snapshot)
+            return
+        try:
+            atomic_write_json(self.index_file, snapshot)
+        except Exception as e:
+            print(f"Error saving favicon index: {e}")
+
+    def stop(self):
+        """Finish the queued work and apply the index updates it produced"""
+        self.requests.put(('stop',))
+        self.thread.join(timeout=5)
+        # Deliver the image_stored signals still queued for the GUI thread
+        QCoreApplication.sendPostedEvents(self, QEvent.MetaCall)
+
+    def _run(self):
+        while True:
+            request = self.requests.get()
+            op = request[0]
+            try:
+                if op == 'stop':
+                    return
+                if op == 'store':
+                    self._store(request[1], request[2])
+                elif op == 'load':
+                    self._load(request[1], request[2])
+                elif op == 'prune':
+                    self._prune(request[1])
+            except Exception as e:
+                print(f"Error processing favicon: {e}")
+
+    def _icon_path(self, content_hash):
+        return os.path.join(self.icons_dir, content_hash + '.png')
+
+    def _store(self, origin, image):
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, 'PNG')
+        buffer.close()
+        content = bytes(data)
+        content_hash = hashlib.sha1(content).hexdigest()
+        path = self._icon_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(self.icons_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        self.image_stored.emit(origin, content_hash)
+
+    def _load(self, origin, content_hash):
+        image = QImage()
+        try:
+            image = QImage(self._icon_path(content_hash))
+        finally:
+            # A null image still ends the load, so the origin is not stuck in loading
+            self.image_loaded.emit(origin, image)
+
+    def _prune(self, referenced):
+        """Remove icon files no origin refers to any more"""
+        if not os.path.isdir(self.icons_dir):
+            return
+        for entry in os.scandir(self.icons_dir):
+            name, ext = os.path.splitext(entry.name)
+            if ext in ('.png', '.tmp') and name not in referenced:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
@@ -0,0 +1,6 @@
+def format_size(size):
+    """Human-readable byte count, e.g. '1.5 MB'"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,95 @@
+import time
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+
+class HistoryDialog(QDialog):
+    url_selected = pyqtSignal(str)
+    search_finished = pyqtSignal(int, list)
+
+    def __init__(self, history_manager, parent=None):
+        super().__init__(parent)
+        self.history_manager = history_manager
+        self.search_seq = 0
+        self.search_finished.connect(self.on_search_finished)
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        self.setWindowTitle("History")
+        self.setGeometry(200, 200, 700, 500)
+
+        layout = QVBoxLayout(self)
+
+        # Search box, queried after a short pause in typing
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search history...")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.refresh)
+        self.search_box.textChanged.connect(self.search_timer.start)
+        layout.addWidget(self.search_box)
+
+        # Results
+        self.list_widget = QListWidget()
+        self.list_widget.itemActivated.connect(self.open_item)
+        layout.addWidget(self.list_widget)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        most_visited_btn = QPushButton("Most Visited")
+        most_visited_btn.clicked.connect(self.show_most_visited)
+        clear_btn = QPushButton("Clear History")
+        clear_btn.clicked.connect(self.clear_history)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+
+        button_layout.addWidget(most_visited_btn)
+        button_layout.addWidget(clear_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def refresh(self):
+        """Show search results, or recent pages when the search box is empty"""
+        # Results of searches started before this refresh are dropped
+        self.search_seq += 1
+        text = self.search_box.text().strip()
+        if text:
+            seq = self.search_seq
+            self.history_manager.search_async(text, lambda rows: self.search_finished.emit(seq, rows))
+            return
+        rows = [
+            (url, title, time.strftime('%Y-%m-%d %H:%M', time.localtime(last_visit)))
+            for url, title, last_visit in self.history_manager.recent()
+        ]
+        self.show_rows(rows)
+
+    def on_search_finished(self, seq, results):
+        if seq == self.search_seq:
+            self.show_rows([(url, title, f"{count} visits") for url, title, count in results])
+
+    def show_most_visited(self):
+        self.search_seq += 1
+        rows = [(url, title, f"{count} visits") for url, title, count in self.history_manager.most_visited(50)]
+        self.show_rows(rows)
+
+    def show_rows(self, rows):
+        self.list_widget.clear()
+        for url, title, detail in rows:
+            item = QListWidgetItem(f"{title or url}  -  {detail}")
+            item.setToolTip(url)
+            item.setData(Qt.UserRole, url)
+            self.list_widget.addItem(item)
+
+    def open_item(self, item):
+        self.url_selected.emit(item.data(Qt.UserRole))
+        self.close()
+
+    def clear_history(self):
+        reply = QMessageBox.question(self, "Clear History", "Delete all browsing history?")
+        if reply == QMessageBox.Yes:
+            self.history_manager.clear()
+            self.history_manager.flush()
+            self.refresh()
@@ -0,0 +1,303 @@
+import queue
+import sqlite3
+import threading
+import time
+
+RECORDED_SCHEMES = ('http://', 'https://', 'file://', 'ftp://')
+# Newest full-text matches that are ranked by visits; ranking every match
+# of a short prefix costs hundreds of ms on a large history
+SEARCH_CANDIDATES = 1000
+# Prefix lengths indexed by FTS5, so short prefix queries don't merge the
+# postings of every matching term
+FTS_PREFIX = "prefix='1 2 3'"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0,
+    last_visit REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS visits (
+    id INTEGER PRIMARY KEY,
+    url_id INTEGER NOT NULL,
+    visit_time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS visits_time ON visits(visit_time);
+CREATE INDEX IF NOT EXISTS visits_url ON visits(url_id);
+CREATE INDEX IF NOT EXISTS urls_visit_count ON urls(visit_count);
+CREATE INDEX IF NOT EXISTS urls_last_visit ON urls(last_visit);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS urls_fts USING fts5(
+    title, url, content='urls', content_rowid='id', {prefix}
+);
+CREATE TRIGGER IF NOT EXISTS urls_ai AFTER INSERT ON urls BEGIN
+    INSERT INTO urls_fts(rowid, title, url) VALUES (new.id, new.title, new.url);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_ad AFTER DELETE ON urls BEGIN
+    INSERT INTO urls_fts(urls_fts, rowid, title, url) VALUES ('delete', old.id, old.title, old.url);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_au AFTER UPDATE OF title, url ON urls BEGIN
+    INSERT INTO urls_fts(urls_fts, rowid, title, url) VALUES ('delete', old.id, old.title, old.url);
+    INSERT INTO urls_fts(rowid, title, url) VALUES (new.id, new.title, new.url);
+END;
+"""
+
+
+def has_fts5():
+    """Check whether the sqlite3 module was built with FTS5"""
+    try:
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        conn.close()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 prefix query"""
+    tokens = [t.replace('"', '""') for t in text.split() if t]
+    return ' '.join(f'"{t}"*' for t in tokens)
+
+
+class HistoryManager:
+    """SQLite-backed browsing history
+
+    Visits are queued from the GUI thread and written in batches by a
+    background thread, which also expires old rows on a schedule. Queries
+    run on a separate read connection, and search_async runs searches on a
+    thread of its own; the database uses WAL so reads don't wait for writes.
+    """
+
+    def __init__(self, db_path, retention_days=90, flush_interval=1.0, expire_interval=3600):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self.expire_interval = expire_interval
+        self.fts_enabled = has_fts5()
+        self.queue = queue.Queue()
+        self.searches = queue.Queue()
+
+        self.setup_database()
+        self.reader = sqlite3.connect(db_path)
+
+        self.thread = threading.Thread(target=self._run, name="history", daemon=True)
+        self.thread.start()
+        self.search_thread = threading.Thread(target=self._run_searches, name="history-search", daemon=True)
+        self.search_thread.start()
+
+    def setup_database(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        if self.fts_enabled:
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'urls_fts'").fetchone()
+            rebuild = row is None or FTS_PREFIX not in row[0]
+            if row is not None and rebuild:
+                # Created with other prefix indexes
+                conn.execute("DROP TABLE urls_fts")
+            conn.executescript(FTS_SCHEMA.format(prefix=FTS_PREFIX))
+            if rebuild:
+                conn.execute("INSERT INTO urls_fts(urls_fts) VALUES ('rebuild')")
+        conn.commit()
+        conn.close()
+
+    # Recording (called from the GUI thread)
+
+    def add_visit(self, url, title='', visit_time=None):
+        """Queue a visit to url"""
+        if url.startswith(RECORDED_SCHEMES):
+            self.queue.put(('visit', url, title, visit_time or time.time()))
+
+    def update_title(self, url, title):
+        """Queue a title update for an already visited url"""
+        if title and url.startswith(RECORDED_SCHEMES):
+            self.queue.put(('title', url, title, None))
+
+    def expire(self):
+        """Queue removal of visits older than the retention period"""
+        self.queue.put(('expire', None, None, None))
+
+    def clear(self):
+        """Queue removal of all history"""
+        self.queue.put(('clear', None, None, None))
+
+    def flush(self, timeout=5):
+        """Wait until all queued operations are written"""
+        done = threading.Event()
+        self.queue.put(('sync', done, None, None))
+        done.wait(timeout)
+
+    def close(self):
+        """Write pending visits and stop the writer thread"""
+        self.queue.put(('stop', None, None, None))
+        self.searches.put(None)
+        self.thread.join(timeout=5)
+        self.search_thread.join(timeout=5)
+        self.reader.close()
+
+    # Background writer
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        next_expire = time.monotonic()
+        running = True
+
+        while running:
+            try:
+                ops = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                ops = []
+            # Drain everything queued so far into one transaction
+            while True:
+                try:
+                    ops.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events = []
+            try:
+                with conn:
+                    for op, url, title, visit_time in ops:
+                        if op == 'visit':
+                            self._write_visit(conn, url, title, visit_time)
+                        elif op == 'title':
+                            conn.execute("UPDATE urls SET title = ? WHERE url = ?", (title, url))
+                        elif op == 'expire':
+                            next_expire = 0
+                        elif op == 'clear':
+                            conn.execute("DELETE FROM visits")
+                            conn.execute("DELETE FROM urls")
+                        elif op == 'sync':
+                            events.append(url)
+                        elif op == 'stop':
+                            running = False
+
+                    if time.monotonic() >= next_expire:
+                        self._expire(conn)
+                        next_expire = time.monotonic() + self.expire_interval
+            except sqlite3.Error as e:
+                print(f"Error writing history: {e}")
+
+            for event in events:
+                event.set()
+
+        conn.close()
+
+    def _write_visit(self, conn, url, title, visit_time):
+        conn.execute(
+            "INSERT INTO urls (url, title, visit_count, last_visit) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT(url) DO UPDATE SET visit_count = visit_count + 1, "
+            "last_visit = excluded.last_visit, "
+            "title = CASE WHEN excluded.title != '' THEN excluded.title ELSE title END",
+            (url, title or '', visit_time)
+        )
+        conn.execute(
+            "INSERT INTO visits (url_id, visit_time) SELECT id, ? FROM urls WHERE url = ?",
+            (visit_time, url)
+        )
+
+    def _expire(self, conn):
+        cutoff = time.time() - self.retention_days * 86400
+        conn.execute("DELETE FROM visits WHERE visit_time < ?", (cutoff,))
+        conn.execute("DELETE FROM urls WHERE last_visit < ?", (cutoff,))
+
+    # Queries (called from the GUI thread)
+
+    def most_visited(self, limit=20):
+        """Most visited pages as (url, title, visit_count) tuples"""
+        return self.reader.execute(
+            "SELECT url, title, visit_count FROM urls ORDER BY visit_count DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+    def recent(self, limit=100):
+        """Most recently visited pages as (url, title, last_visit) tuples"""
+        return self.reader.execute(
+            "SELECT url, title, last_visit FROM urls ORDER BY last_visit DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+    def visits_in_range(self, start, end, limit=1000):
+        """Visits between two timestamps as (url, title, visit_time) tuples, newest first"""
+        return self.reader.execute(
+            "SELECT urls.url, urls.title, visits.visit_time FROM visits "
+            "JOIN urls ON urls.id = visits.url_id "
+            "WHERE visits.visit_time >= ? AND visits.visit_time < ? "
+            "ORDER BY visits.visit_time DESC LIMIT ?",
+            (start, end, limit)
+        ).fetchall()
+
+    def top_urls(self, limit=100000):
+        """Most visited pages as (url, title, visit_count, last_visit) tuples
+
+        Uses its own connection so it can be called from any thread.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(
+                "SELECT url, title, visit_count, last_visit FROM urls "
+                "ORDER BY visit_count DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def search(self, text, limit=50):
+        """Search titles and URLs as (url, title, visit_count) tuples, most visited first"""
+        return self._search(self.reader, text, limit)
+
+    def search_async(self, text, callback, limit=50):
+        """Search on the search thread and call callback(rows) there
+
+        Searches queued while one runs are coalesced into the newest.
+        callback should hand the rows to the GUI thread, e.g. by emitting
+        a signal.
+        """
+        self.searches.put((text, limit, callback))
+
+    def _run_searches(self):
+        conn = sqlite3.connect(self.db_path)
+        while True:
+            requests = [self.searches.get()]
+            while True:
+                try:
+                    requests.append(self.searches.get_nowait())
+                except queue.Empty:
+                    break
+            if None in requests:
+                break
+            text, limit, callback = requests[-1]
+            try:
+                rows = self._search(conn, text, limit)
+            except sqlite3.Error as e:
+                print(f"Error searching history: {e}")
+                rows = []
+            try:
+                callback(rows)
+            except RuntimeError:
+                # The receiver was deleted while the search ran
+                pass
+        conn.close()
+
+    def _search(self, conn, text, limit):
+        if not text.strip():
+            return []
+        if self.fts_enabled:
+            return conn.execute(
+                "SELECT url, title, visit_count FROM urls WHERE id IN ("
+                "SELECT rowid FROM urls_fts WHERE urls_fts MATCH ? ORDER BY rowid DESC LIMIT ?) "
+                "ORDER BY visit_count DESC, last_visit DESC LIMIT ?",
+                (build_match_query(text), SEARCH_CANDIDATES, limit)
+            ).fetchall()
+        pattern = f"%{text.strip()}%"
+        return conn.execute(
+            "SELECT url, title, visit_count FROM urls WHERE title LIKE ? OR url LIKE ? "
+            "ORDER BY visit_count DESC LIMIT ?",
+            (pattern, pattern, limit)
+        ).fetchall()
@@ -1,2 +0,0 @@
-# This file makes the browser directory a Python package
-from .bookmark_ribbon import BookmarkRibbon
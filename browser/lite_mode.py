@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from PyQt5.QtCore import *
+from PyQt5.QtWebEngineWidgets import *
+from .content_blocker import base_domain
+from .storage import atomic_write_json, get_data_file, load_json
+
+# Encoded sizes of images and other subresources the page loaded. Cross-origin
+# resources without Timing-Allow-Origin report 0 and are skipped.
+SIZE_SCRIPT = """
+(function() {
+    return performance.getEntriesByType('resource')
+        .filter(function(e) { return e.encodedBodySize > 0; })
+        .map(function(e) { return [e.name, e.encodedBodySize]; });
+})();
+"""
+
+# Bytes assumed saved by a blocked request whose size was never observed
+DEFAULT_SIZE_ESTIMATES = {
+    'image': 60 * 1024,
+    'font': 40 * 1024,
+    'media': 500 * 1024,
+    'script': 30 * 1024,
+}
+MAX_KNOWN_SIZES = 20000
+
+
+class SitePolicy:
+    __slots__ = ('lite', 'javascript')
+
+    def __init__(self, lite, javascript):
+        self.lite = lite
+        self.javascript = javascript
+
+
+class LiteModePolicies:
+    """Per-site lite mode settings and the bytes saved by them
+
+    In lite mode a site's web fonts, media and third-party scripts are
+    blocked, along with images known to be larger than the threshold.
+    Image sizes are learned from the resource timings of lite pages, so
+    a large image is blocked from the next visit on. JavaScript can also
+    be turned off per site.
+
+    Lookups by host go through a resolved policy cache so the request
+    interceptor does constant work per request.
+    """
+
+    def __init__(self, persistence=None, default_lite=False, image_size_threshold=100 * 1024,
+                 block_fonts=True, block_media=True, block_third_party_scripts=True):
+        self.sites_file = get_data_file("lite_mode.json")
+        self.persistence = persistence
+        self.default_lite = default_lite
+        self.image_size_threshold = image_size_threshold
+        self.blocked_types = {'image'}
+        if block_fonts:
+            self.blocked_types.add('font')
+        if block_media:
+            self.blocked_types.add('media')
+        if block_third_party_scripts:
+            self.blocked_types.add('script')
+
+        sites = load_json(self.sites_file, {})
+        self.sites = sites if isinstance(sites, dict) else {}  # host -> {'lite', 'javascript'}
+        self.cache = {}  # host -> SitePolicy
+        self.known_sizes = OrderedDict()  # resource URL -> encoded bytes
+        self.savings = {}  # first-party URL -> [requests, bytes]
+
+    def policy(self, host):
+        policy = self.cache.get(host)
+        if policy is None:
+            site = self.sites.get(host, {})
+            policy = self.cache[host] = SitePolicy(
+                site.get('lite', self.default_lite),
+                site.get('javascript', True)
+            )
+        return policy
+
+    def set_site(self, host, lite=None, javascript=None):
+        """Change and persist the lite mode settings of a site"""
+        if not host:
+            return
+        site = self.sites.setdefault(host, {})
+        if lite is not None:
+            site['lite'] = lite
+        if javascript is not None:
+            site['javascript'] = javascript
+        self.cache.pop(host, None)
+        self.save_sites()
+
+    def save_sites(self):
+        snapshot = dict(self.sites)
+        if self.persistence:
+            self.persistence.schedule(self.sites_file, snapshot)
+            return
+        try:
+            atomic_write_json(self.sites_file, snapshot)
+        except Exception as e:
+            print(f"Error saving lite mode settings: {e}")
+
+    def check(self, url, host, first_party_host, resource_type):
+        """Estimated bytes saved if the request should be blocked, else None"""
+        if resource_type not in self.blocked_types or not self.policy(first_party_host).lite:
+            return None
+        size = self.known_sizes.get(url)
+        if resource_type == 'image':
+            if size is None or size <= self.image_size_threshold:
+                return None
+            return size
+        if resource_type == 'script' and base_domain(host) == base_domain(first_party_host):
+            return None
+        return size if size is not None else DEFAULT_SIZE_ESTIMATES[resource_type]
+
+    def record(self, page_url, size):
+        saved = self.savings.get(page_url)
+        if saved is None:
+            saved = self.savings[page_url] = [0, 0]
+        saved[0] += 1
+        saved[1] += size
+
+    def reset(self, page_url):
+        self.savings.pop(page_url, None)
+
+    def saved(self, page_url):
+        """(requests, bytes) saved for the page at page_url"""
+        saved = self.savings.get(page_url)
+        return tuple(saved) if saved else (0, 0)
+
+    def collect_sizes(self, page, callback=None):
+        """Learn resource sizes from the resource timings of a loaded page"""
+        def store(entries):
+            for url, size in entries or []:
+                self.known_sizes.pop(url, None)
+                self.known_sizes[url] = int(size)
+            while len(self.known_sizes) > MAX_KNOWN_SIZES:
+                self.known_sizes.popitem(last=False)
+            if callback:
+                callback()
+        page.runJavaScript(SIZE_SCRIPT, QWebEngineScript.ApplicationWorld, store)
+
+
+class LiteModePage(QWebEnginePage):
+    """Page that applies the per-site JavaScript and plugin policy on navigation"""
+
+    def __init__(self, profile, policies, parent=None):
+        super().__init__(profile, parent)
+        self.policies = policies
+        self.loadFinished.connect(self.on_load_finished)
+
+    def acceptNavigationRequest(self, url, navigation_type, is_main_frame):
+        if is_main_frame:
+            policy = self.policies.policy(url.host())
+            settings = self.settings()
+            if settings.testAttribute(QWebEngineSettings.JavascriptEnabled) != policy.javascript:
+                settings.setAttribute(QWebEngineSettings.JavascriptEnabled, policy.javascript)
+            settings.setAttribute(QWebEngineSettings.PluginsEnabled, not policy.lite)
+        return super().acceptNavigationRequest(url, navigation_type, is_main_frame)
+
+    def on_load_finished(self, ok):
+        if ok and self.policies.policy(self.url().host()).lite:
+            self.policies.collect_sizes(self)
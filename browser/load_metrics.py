@@ -0,0 +1,163 @@
+import json
+import time
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtWebEngineWidgets import *
+
+# Runs in the application world at document creation and buffers paint
+# timings, so they are available even if the page replaces performance
+# observers of its own.
+TIMING_SCRIPT = """
+(function() {
+    window.__lightpyPaint = {};
+    try {
+        new PerformanceObserver(function(list) {
+            list.getEntries().forEach(function(entry) {
+                window.__lightpyPaint[entry.name] = entry.startTime;
+            });
+        }).observe({type: 'paint', buffered: true});
+    } catch (e) {}
+})();
+"""
+
+COLLECT_SCRIPT = """
+(function() {
+    var nav = performance.getEntriesByType('navigation')[0];
+    var paint = window.__lightpyPaint || {};
+    if (paint['first-contentful-paint'] === undefined) {
+        performance.getEntriesByType('paint').forEach(function(entry) {
+            paint[entry.name] = entry.startTime;
+        });
+    }
+    return JSON.stringify({
+        ttfb: nav ? nav.responseStart : null,
+        dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+        load: nav ? (nav.loadEventEnd || nav.loadEventStart) : null,
+        fcp: paint['first-contentful-paint'] === undefined ? null : paint['first-contentful-paint']
+    });
+})();
+"""
+
+
+class LoadMetricsOverlay(QLabel):
+    """Small translucent label in the corner of a browser view"""
+
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 180); color: #ffffff; "
+            "padding: 4px; border-radius: 3px; font-family: monospace;"
+        )
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hide()
+
+    def show_record(self, record):
+        lines = [f"load: {record['wall_ms']:.0f} ms (wall)"]
+        for key, label in (('ttfb_ms', 'TTFB'), ('fcp_ms', 'FCP'),
+                           ('dom_content_loaded_ms', 'DCL'), ('load_ms', 'onload')):
+            if record.get(key) is not None:
+                lines.append(f"{label}: {record[key]:.0f} ms")
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - 8, parent.height() - self.height() - 8)
+        self.raise_()
+        self.show()
+
+
+class PageLoadRecorder(QObject):
+    """Per-tab page load instrumentation
+
+    Records wall-clock start and finish for every load of an attached
+    browser, collects Navigation Timing and Paint Timing values from the
+    page and appends one JSON record per load to a log file.
+    """
+
+    load_recorded = pyqtSignal(QWidget, dict)
+
+    def __init__(self, log_path=None, parent=None):
+        super().__init__(parent)
+        self.log_path = log_path
+        self.load_starts = {}  # browser -> (wall-clock start, monotonic start)
+        self.browsers = set()
+        self.overlay_enabled = False
+
+    def install(self, profile):
+        """Inject the timing script into every page of the profile"""
+        script = QWebEngineScript()
+        script.setName("lightpy-load-metrics")
+        script.setSourceCode(TIMING_SCRIPT)
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(QWebEngineScript.ApplicationWorld)
+        script.setRunsOnSubFrames(False)
+        profile.scripts().insert(script)
+
+    def attach(self, browser):
+        self.browsers.add(browser)
+        browser.destroyed.connect(lambda: self.detach(browser))
+        browser.loadStarted.connect(lambda: self.on_load_started(browser))
+        browser.loadFinished.connect(lambda ok: self.on_load_finished(browser, ok))
+
+    def detach(self, browser):
+        self.browsers.discard(browser)
+        self.load_starts.pop(browser, None)
+
+    def on_load_started(self, browser):
+        self.load_starts[browser] = (time.time(), time.monotonic())
+
+    def on_load_finished(self, browser, ok):
+        start = self.load_starts.pop(browser, None)
+        if start is None:
+            return
+        started_at, started = start
+        record = {
+            'started_at': started_at,
+            'url': browser.url().toString(),
+            'success': ok,
+            'wall_ms': (time.monotonic() - started) * 1000,
+            'ttfb_ms': None,
+            'dom_content_loaded_ms': None,
+            'load_ms': None,
+            'fcp_ms': None,
+        }
+        if not ok:
+            self.store(browser, record)
+            return
+
+        def handle_timings(result):
+            try:
+                timings = json.loads(result) if result else {}
+            except ValueError:
+                timings = {}
+            record['ttfb_ms'] = timings.get('ttfb')
+            record['dom_content_loaded_ms'] = timings.get('dom_content_loaded')
+            record['load_ms'] = timings.get('load')
+            record['fcp_ms'] = timings.get('fcp')
+            self.store(browser, record)
+
+        browser.page().runJavaScript(COLLECT_SCRIPT, QWebEngineScript.ApplicationWorld, handle_timings)
+
+    def store(self, browser, record):
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+            except OSError as e:
+                print(f"Error writing load metrics: {e}")
+        if browser not in self.browsers:
+            return
+        if self.overlay_enabled:
+            self.overlay_for(browser).show_record(record)
+        self.load_recorded.emit(browser, record)
+
+    def overlay_for(self, browser):
+        overlay = browser.findChild(LoadMetricsOverlay)
+        if overlay is None:
+            overlay = LoadMetricsOverlay(browser)
+        return overlay
+
+    def set_overlay_enabled(self, enabled):
+        self.overlay_enabled = enabled
+        if not enabled:
+            for overlay in self.parent().findChildren(LoadMetricsOverlay):
+                overlay.hide()
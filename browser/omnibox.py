@@ -0,0 +1,364 @@
+import re
+import time
+import threading
+from bisect import bisect_left, insort
+from heapq import heappush, heappushpop, nlargest
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+IGNORED_TOKENS = {'http', 'https', 'www', 'com', 'html'}
+MAX_CANDIDATES = 500
+BOOKMARK_BOOST = 140
+OPEN_TAB_BOOST = 80
+SCHEME_RE = re.compile(r'^(?:https?://)?(?:www\.)?')
+
+
+def recency_weight(age_days):
+    """Frecency weight of a visit age_days old; never grows as time passes"""
+    if age_days < 4:
+        return 100
+    if age_days < 14:
+        return 70
+    if age_days < 31:
+        return 50
+    if age_days < 90:
+        return 30
+    return 10
+
+
+def tokenize(url, title):
+    """Lower-case word tokens of a URL and title"""
+    tokens = set(TOKEN_RE.findall(url.lower())) - IGNORED_TOKENS
+    tokens.update(TOKEN_RE.findall(title.lower()))
+    return tokens
+
+
+class Suggestion:
+    __slots__ = ('url', 'title', 'tokens', 'visit_count', 'last_visit', 'bookmarked', 'rank_key')
+
+    def __init__(self, url):
+        self.url = url
+        self.title = ''
+        self.tokens = ()
+        self.visit_count = 0
+        self.last_visit = 0
+        self.bookmarked = False
+        self.rank_key = None
+
+    def frecency(self, now, open_urls):
+        """Visit count weighted by recency, boosted for bookmarks and open tabs"""
+        score = self.visit_count * recency_weight((now - self.last_visit) / 86400)
+        if self.bookmarked:
+            score += BOOKMARK_BOOST
+        if self.url in open_urls:
+            score += OPEN_TAB_BOOST
+        return score
+
+
+class SuggestionIndex:
+    """In-memory prefix/token index over bookmarks, history and open tabs
+
+    Every entry is indexed under the tokens of its URL and title. A sorted
+    token list gives prefix lookups by bisection; entries are updated in
+    place as pages are visited, retitled or bookmarked. A second list keeps
+    the entries ordered by an upper bound of their frecency, so short
+    prefixes that match much of the index are ranked without scoring every
+    match.
+    """
+
+    def __init__(self):
+        self.entries = {}   # url -> Suggestion
+        self.postings = {}  # token -> set of urls
+        self.tokens = []    # sorted keys of postings
+        self.new_tokens = None  # tokens added during update_many, sorted in at the end
+        self.ranked = []    # sorted (-frecency bound, url) of every entry
+        self.ranked_dirty = False  # ranked is rebuilt before its next use
+
+    def __len__(self):
+        return len(self.entries)
+
+    def update(self, url, title=None, visit_count=None, last_visit=None, bookmarked=None):
+        """Add or update the entry for url"""
+        entry = self.entries.get(url)
+        if entry is None:
+            entry = self.entries[url] = Suggestion(url)
+            self._reindex(entry, title or '')
+        elif title and title != entry.title:
+            self._reindex(entry, title)
+        if visit_count is not None:
+            entry.visit_count = visit_count
+        if last_visit is not None:
+            entry.last_visit = last_visit
+        if bookmarked is not None:
+            entry.bookmarked = bookmarked
+        self._rerank(entry)
+        return entry
+
+    def update_many(self, items, bookmarked=None):
+        """Add or update entries from update's positional arguments, e.g. (url, title) pairs
+
+        New tokens are merged into the sorted list once and the rank order
+        is rebuilt on its next use, instead of both being kept sorted entry
+        by entry.
+        """
+        self.new_tokens = set()
+        try:
+            for item in items:
+                self.update(*item, bookmarked=bookmarked)
+        finally:
+            # Tokens created and removed again within the batch have no postings
+            new_tokens, self.new_tokens = self.new_tokens, None
+            new_tokens = sorted(token for token in new_tokens if token in self.postings)
+            if new_tokens:
+                self.tokens = sorted(self.tokens + new_tokens)
+
+    def add_visit(self, url, title=None, visit_time=None):
+        """Record one visit to url"""
+        entry = self.update(url, title)
+        entry.visit_count += 1
+        entry.last_visit = visit_time or time.time()
+        self._rerank(entry)
+
+    def remove(self, url):
+        entry = self.entries.pop(url, None)
+        if entry:
+            self._unindex(entry)
+            if not self.ranked_dirty:
+                self._unrank(entry)
+
+    def _rerank(self, entry):
+        """Reposition entry in the rank order after its frecency inputs changed
+
+        The bound uses the recency weight as of now; weights only fall as
+        visits age, so the bound stays valid until the entry changes again.
+        """
+        bound = entry.visit_count * recency_weight((time.time() - entry.last_visit) / 86400)
+        if entry.bookmarked:
+            bound += BOOKMARK_BOOST
+        key = (-bound, entry.url)
+        if key == entry.rank_key:
+            return
+        if self.new_tokens is not None:
+            self.ranked_dirty = True
+        if not self.ranked_dirty:
+            self._unrank(entry)
+            insort(self.ranked, key)
+        entry.rank_key = key
+
+    def _unrank(self, entry):
+        if entry.rank_key is None:
+            return
+        i = bisect_left(self.ranked, entry.rank_key)
+        if i < len(self.ranked) and self.ranked[i] == entry.rank_key:
+            del self.ranked[i]
+
+    def _reindex(self, entry, title):
+        self._unindex(entry)
+        entry.title = title
+        entry.tokens = tuple(tokenize(entry.url, title))
+        for token in entry.tokens:
+            urls = self.postings.get(token)
+            if urls is None:
+                urls = self.postings[token] = set()
+                if self.new_tokens is not None:
+                    self.new_tokens.add(token)
+                else:
+                    insort(self.tokens, token)
+            urls.add(entry.url)
+
+    def _unindex(self, entry):
+        for token in entry.tokens:
+            urls = self.postings.get(token)
+            if urls is None:
+                continue
+            urls.discard(entry.url)
+            if not urls:
+                del self.postings[token]
+                i = bisect_left(self.tokens, token)
+                if i < len(self.tokens) and self.tokens[i] == token:
+                    del self.tokens[i]
+
+    def _prefix_tokens(self, term):
+        i = bisect_left(self.tokens, term)
+        while i < len(self.tokens) and self.tokens[i].startswith(term):
+            yield self.tokens[i]
+            i += 1
+
+    def _prefix_size(self, term, cap):
+        """Number of entries under tokens starting with term, counted up to cap"""
+        size = 0
+        for token in self._prefix_tokens(term):
+            size += len(self.postings[token])
+            if size >= cap:
+                break
+        return size
+
+    def query(self, text, limit=8, open_urls=frozenset()):
+        """Best matching entries for text, highest frecency first
+
+        Every term must prefix-match one of the entry's tokens. When the
+        most selective term matches fewer than MAX_CANDIDATES entries they
+        are all scored; otherwise entries are scanned in rank order until
+        none of the rest can beat the results found so far.
+        """
+        terms = set(TOKEN_RE.findall(text.lower()))
+        if not terms:
+            return []
+
+        now = time.time()
+        primary = min(terms, key=lambda term: self._prefix_size(term, MAX_CANDIDATES))
+        if self._prefix_size(primary, MAX_CANDIDATES) >= MAX_CANDIDATES:
+            return self._ranked_matches(terms, limit, now, open_urls)
+        terms.discard(primary)
+
+        candidates = set()
+        for token in self._prefix_tokens(primary):
+            candidates.update(self.postings[token])
+
+        entries = [self.entries[url] for url in candidates]
+        for term in terms:
+            entries = [e for e in entries if any(t.startswith(term) for t in e.tokens)]
+        return nlargest(limit, entries, key=lambda e: e.frecency(now, open_urls))
+
+    def _ranked_matches(self, terms, limit, now, open_urls):
+        if self.ranked_dirty:
+            self.ranked = sorted(entry.rank_key for entry in self.entries.values())
+            self.ranked_dirty = False
+        best = []  # min-heap of (frecency, -position, entry)
+        for position, (negative_bound, url) in enumerate(self.ranked):
+            # Later entries score at most their bound plus the open tab boost
+            if len(best) >= limit and OPEN_TAB_BOOST - negative_bound <= best[0][0]:
+                break
+            entry = self.entries[url]
+            if all(any(t.startswith(term) for t in entry.tokens) for term in terms):
+                item = (entry.frecency(now, open_urls), -position, entry)
+                if len(best) < limit:
+                    heappush(best, item)
+                else:
+                    heappushpop(best, item)
+        return [entry for _, _, entry in sorted(best, reverse=True)]
+
+
+def prediction_confidence(text, suggestions):
+    """How likely the user is to navigate to the top suggestion, from 0 to 1"""
+    if not suggestions:
+        return 0.0
+    top = suggestions[0]
+    typed = SCHEME_RE.sub('', text.strip().lower())
+    confidence = 0.4
+    if typed and SCHEME_RE.sub('', top.url.lower()).startswith(typed):
+        confidence += 0.3
+    if top.visit_count >= 5 or top.bookmarked:
+        confidence += 0.2
+    if len(suggestions) == 1:
+        confidence += 0.1
+    return confidence
+
+
+class SuggestionModel(QAbstractListModel):
+    """Popup model showing 'title - url' and completing to the url"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.suggestions = []
+
+    def set_suggestions(self, suggestions):
+        self.beginResetModel()
+        self.suggestions = suggestions
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.suggestions)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        suggestion = self.suggestions[index.row()]
+        if role == Qt.DisplayRole:
+            if suggestion.title:
+                return f"{suggestion.title} - {suggestion.url}"
+            return suggestion.url
+        if role == Qt.EditRole:
+            return suggestion.url
+        if role == Qt.ToolTipRole:
+            return suggestion.url
+        return None
+
+
+class OmniboxCompleter(QCompleter):
+    """As-you-type URL bar suggestions backed by a SuggestionIndex
+
+    The index is queried synchronously on each edit. History, the only slow
+    source, is read on a worker thread at startup and merged into the index
+    in small chunks so typing never waits on the database.
+    """
+
+    history_loaded = pyqtSignal(list)
+    url_chosen = pyqtSignal(str)
+    prediction_changed = pyqtSignal(str, float)
+
+    def __init__(self, url_bar, open_urls=None, limit=8):
+        super().__init__(url_bar)
+        self.url_bar = url_bar
+        self.open_urls = open_urls or (lambda: frozenset())
+        self.limit = limit
+        self.index = SuggestionIndex()
+        self.pending_rows = []
+
+        self.suggestion_model = SuggestionModel(self)
+        self.setModel(self.suggestion_model)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setWidget(url_bar)
+        self.activated[QModelIndex].connect(self.on_activated)
+
+        url_bar.textEdited.connect(self.update_suggestions)
+
+        self.merge_timer = QTimer(self)
+        self.merge_timer.setInterval(0)
+        self.merge_timer.timeout.connect(self.merge_pending_rows)
+        self.history_loaded.connect(self.on_history_loaded)
+
+    def update_suggestions(self, text):
+        suggestions = self.index.query(text, self.limit, self.open_urls()) if text.strip() else []
+        self.suggestion_model.set_suggestions(suggestions)
+        if suggestions:
+            self.complete()
+            self.prediction_changed.emit(suggestions[0].url, prediction_confidence(text, suggestions))
+        else:
+            self.popup().hide()
+
+    def on_activated(self, index):
+        url = index.data(Qt.EditRole)
+        self.url_bar.setText(url)
+        self.url_chosen.emit(url)
+
+    def load_history_async(self, load_rows):
+        """Fetch (url, title, visit_count, last_visit) rows on a worker thread"""
+        def worker():
+            try:
+                rows = load_rows()
+            except Exception as e:
+                print(f"Error loading history suggestions: {e}")
+                rows = []
+            self.history_loaded.emit(rows)
+        threading.Thread(target=worker, name="omnibox-history", daemon=True).start()
+
+    def on_history_loaded(self, rows):
+        self.pending_rows.extend(rows)
+        self.merge_timer.start()
+
+    def merge_pending_rows(self):
+        """Merge a chunk of loaded history rows into the index"""
+        chunk = self.pending_rows[-250:]
+        del self.pending_rows[-250:]
+        rows = []
+        for url, title, visit_count, last_visit in chunk:
+            entry = self.index.entries.get(url)
+            # Visits recorded since startup are already counted
+            if entry is None or entry.visit_count < visit_count:
+                rows.append((url, title, visit_count, max(last_visit, entry.last_visit if entry else 0)))
+        self.index.update_many(rows)
+        if not self.pending_rows:
+            self.merge_timer.stop()
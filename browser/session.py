@@ -0,0 +1,227 @@
+import json
+import os
+import queue
+import threading
+from collections import deque
+from PyQt5.QtCore import *
+from PyQt5.QtWebEngineWidgets import *
+from .tab_discarder import DiscardedTab, serialize_history
+from .session_journal import load_session
+
+
+def encode_history(data):
+    return bytes(data.toBase64()).decode('ascii') if data is not None and not data.isEmpty() else None
+
+
+def decode_history(text):
+    return QByteArray.fromBase64(text.encode('ascii')) if text else None
+
+
+class SessionRecorder(QObject):
+    """Journals the open tabs so they can be restored after a restart or crash
+
+    Tab changes mark the recorder dirty; at most once per flush_interval the
+    tab strip is diffed against what was last journaled and only the
+    differences are appended as JSON lines. Writes and fsyncs happen on a
+    worker thread. After compact_after appended records the journal is
+    rewritten from the current state.
+    """
+
+    def __init__(self, tab_manager, path, flush_interval=1000, compact_after=1000, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        self.path = path
+        self.compact_after = compact_after
+        self.running = False
+
+        self.ids = {}  # tab widget -> tab id
+        self.next_id = 1
+        self.dirty_widgets = set()
+        # What the journal currently says
+        self.tabs = {}  # tab id -> tab record
+        self.order = []
+        self.active = None
+        self.records_since_compaction = 0
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(flush_interval)
+        self.flush_timer.timeout.connect(self.flush)
+
+        self.requests = queue.Queue()
+        self.thread = None
+
+        self.tab_manager.currentChanged.connect(lambda index: self.schedule_flush())
+        self.tab_manager.tabBar().tabMoved.connect(lambda old, new: self.schedule_flush())
+        self.tab_manager.tab_closed.connect(lambda widget: self.schedule_flush())
+        self.tab_manager.tab_replaced.connect(self.on_tab_replaced)
+        self.tab_manager.tab_pinned.connect(lambda widget, pinned: self.mark_dirty(widget))
+
+    def attach(self, browser):
+        """Journal browser's tab whenever it navigates"""
+        browser.urlChanged.connect(lambda url: self.mark_dirty(browser))
+        browser.titleChanged.connect(lambda title: self.mark_dirty(browser))
+        browser.loadFinished.connect(lambda ok: self.mark_dirty(browser))
+
+    def start(self):
+        """Begin journaling, replacing the previous session with the open tabs"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="session", daemon=True)
+        self.thread.start()
+        self.dirty_widgets.update(self.tab_manager.widget(i) for i in range(self.tab_manager.count()))
+        self.flush(compact=True)
+
+    def stop(self):
+        """Journal the final state and wait for the writes to finish"""
+        if not self.running:
+            return
+        self.flush()
+        self.running = False
+        self.flush_timer.stop()
+        self.requests.put(('stop',))
+        self.thread.join(timeout=5)
+
+    def mark_dirty(self, widget):
+        if self.running:
+            self.dirty_widgets.add(widget)
+            self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.running and not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def on_tab_replaced(self, old, new):
+        tab_id = self.ids.pop(old, None)
+        if tab_id is not None:
+            self.ids[new] = tab_id
+        self.dirty_widgets.discard(old)
+        self.mark_dirty(new)
+
+    def tab_record(self, tab_id, widget):
+        if isinstance(widget, DiscardedTab):
+            history = encode_history(widget.history_data)
+        elif isinstance(widget, QWebEngineView):
+            history = encode_history(serialize_history(widget))
+        else:
+            return None
+        return {
+            'op': 'tab',
+            'id': tab_id,
+            'url': widget.url().toString(),
+            'title': widget.title(),
+            'history': history,
+            'pinned': self.tab_manager.is_pinned(widget),
+        }
+
+    def flush(self, compact=False):
+        """Append the changes since the last flush to the journal"""
+        if not self.running:
+            return
+        self.flush_timer.stop()
+        records = []
+        order = []
+        present = set()
+        for index in range(self.tab_manager.count()):
+            widget = self.tab_manager.widget(index)
+            tab_id = self.ids.get(widget)
+            if tab_id is None:
+                tab_id = self.ids[widget] = self.next_id
+                self.next_id += 1
+                self.dirty_widgets.add(widget)
+            present.add(widget)
+            order.append(tab_id)
+            if widget in self.dirty_widgets:
+                record = self.tab_record(tab_id, widget)
+                if record is not None and record != self.tabs.get(tab_id):
+                    self.tabs[tab_id] = record
+                    records.append(record)
+        self.dirty_widgets.clear()
+
+        for widget in [w for w in self.ids if w not in present]:
+            tab_id = self.ids.pop(widget)
+            if self.tabs.pop(tab_id, None) is not None:
+                records.append({'op': 'close', 'id': tab_id})
+        if order != self.order:
+            self.order = order
+            records.append({'op': 'order', 'ids': order})
+        current = self.ids.get(self.tab_manager.currentWidget())
+        if current != self.active:
+            self.active = current
+            records.append({'op': 'active', 'id': current})
+
+        self.records_since_compaction += len(records)
+        if compact or self.records_since_compaction >= self.compact_after:
+            snapshot = [self.tabs[tab_id] for tab_id in self.order if tab_id in self.tabs]
+            snapshot.append({'op': 'order', 'ids': self.order})
+            snapshot.append({'op': 'active', 'id': self.active})
+            self.requests.put(('compact', [json.dumps(record) for record in snapshot]))
+            self.records_since_compaction = 0
+        elif records:
+            self.requests.put(('append', [json.dumps(record) for record in records]))
+
+    def _run(self):
+        while True:
+            request = self.requests.get()
+            op = request[0]
+            try:
+                if op == 'stop':
+                    return
+                if op == 'append':
+                    self._write(request[1], 'a', self.path)
+                elif op == 'compact':
+                    tmp_path = self.path + '.tmp'
+                    self._write(request[1], 'w', tmp_path)
+                    os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Error saving session: {e}")
+
+    def _write(self, lines, mode, path):
+        with open(path, mode) as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class LazyTabLoader(QObject):
+    """Loads restored placeholder tabs in the background, one per interval
+
+    Tabs are loaded in order through load_callback(index). Ticks where
+    can_load() returns False are skipped, so loading resumes once memory
+    is freed. Tabs the user selects first are skipped.
+    """
+
+    def __init__(self, tab_manager, load_callback, interval=2000, can_load=None, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        self.load_callback = load_callback
+        self.can_load = can_load
+        self.pending = deque()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.load_next)
+
+    def enqueue(self, placeholders):
+        self.pending.extend(placeholders)
+        if self.pending and not self.timer.isActive():
+            self.timer.start()
+
+    def stop(self):
+        self.pending.clear()
+        self.timer.stop()
+
+    def load_next(self):
+        if self.can_load and not self.can_load():
+            return
+        while self.pending:
+            placeholder = self.pending.popleft()
+            try:
+                index = self.tab_manager.indexOf(placeholder)
+            except RuntimeError:
+                # Already restored by a tab switch and deleted
+                continue
+            if index >= 0:
+                self.load_callback(index)
+                break
+        if not self.pending:
+            self.timer.stop()
@@ -0,0 +1,36 @@
+"""Replay of the session journal, free of Qt so it can be tested on its own"""
+import json
+
+
+def load_session(path):
+    """Replay a session journal; returns (tabs in order, active index)
+
+    Each tab is a dict with url, title, history and pinned. A torn last
+    line left by a crash is skipped.
+    """
+    tabs = {}
+    order = []
+    active = None
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    op = record['op']
+                    if op == 'tab':
+                        tabs[record['id']] = record
+                    elif op == 'close':
+                        tabs.pop(record['id'], None)
+                    elif op == 'order':
+                        order = record['ids']
+                    elif op == 'active':
+                        active = record['id']
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError:
+        return [], 0
+
+    ids = [tab_id for tab_id in order if tab_id in tabs]
+    ids += [tab_id for tab_id in tabs if tab_id not in ids]
+    active_index = ids.index(active) if active in ids else 0
+    return [tabs[tab_id] for tab_id in ids], active_index
@@ -0,0 +1,112 @@
+import os
+from .storage import get_data_file, load_json
+
+SETTINGS_FILE = "browser_settings.json"
+
+DEFAULT_PERFORMANCE_PROFILE = 'balanced'
+
+# Flags every profile needs for site compatibility
+COMPATIBILITY_FLAGS = [
+    '--ignore-certificate-errors',
+    '--ignore-ssl-errors',
+    '--no-sandbox',
+    '--disable-web-security',
+    '--allow-running-insecure-content',
+    '--disable-features=BlockInsecurePrivateNetworkRequests',
+    '--enable-features=NetworkServiceInProcess',
+]
+
+# Engine tuning knobs per named profile:
+#   renderer_process_limit  maximum renderer processes, None for Chromium's default
+#   process_model           'process-per-site-instance' (default), 'process-per-site' or 'single-process'
+#   site_isolation          False shares renderers between sites to save memory
+#   gpu_rasterization       rasterize on the GPU instead of CPU raster threads
+#   raster_threads          CPU raster threads, None for Chromium's default
+#   background_throttling   throttle timers and lower priority of background tabs
+PERFORMANCE_PROFILES = {
+    'low-memory': {
+        'description': "fewest renderer processes, CPU raster, background tabs throttled",
+        'renderer_process_limit': 2,
+        'process_model': 'process-per-site',
+        'site_isolation': False,
+        'gpu_rasterization': False,
+        'raster_threads': 1,
+        'background_throttling': True,
+    },
+    'balanced': {
+        'description': "bounded renderer processes, Chromium's default raster, background tabs throttled",
+        'renderer_process_limit': 6,
+        'process_model': 'process-per-site',
+        'site_isolation': False,
+        'gpu_rasterization': False,
+        'raster_threads': None,
+        'background_throttling': True,
+    },
+    'throughput': {
+        'description': "a renderer per site instance, GPU raster, no background throttling",
+        'renderer_process_limit': None,
+        'process_model': 'process-per-site-instance',
+        'site_isolation': True,
+        'gpu_rasterization': True,
+        'raster_threads': 4,
+        'background_throttling': False,
+    },
+}
+
+
+def read_settings():
+    """Settings saved by the user, without defaults applied"""
+    settings = load_json(get_data_file(SETTINGS_FILE), {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def resolve_performance_profile(requested=None, settings=None):
+    """Name of the profile to use: the requested one, else the saved setting"""
+    name = requested or (settings or {}).get('performance_profile') or DEFAULT_PERFORMANCE_PROFILE
+    if name not in PERFORMANCE_PROFILES:
+        print(f"Unknown performance profile {name!r}, using {DEFAULT_PERFORMANCE_PROFILE!r}")
+        name = DEFAULT_PERFORMANCE_PROFILE
+    return name
+
+
+def chromium_flags(profile_name, extra_flags=()):
+    """Chromium command line flags for a performance profile"""
+    profile = PERFORMANCE_PROFILES[profile_name]
+    flags = list(COMPATIBILITY_FLAGS)
+
+    if profile['renderer_process_limit']:
+        flags.append(f"--renderer-process-limit={profile['renderer_process_limit']}")
+    if profile['process_model'] != 'process-per-site-instance':
+        flags.append(f"--{profile['process_model']}")
+    if not profile['site_isolation']:
+        flags.append('--disable-site-isolation-trials')
+
+    if profile['gpu_rasterization']:
+        flags.extend(['--enable-gpu-rasterization', '--ignore-gpu-blocklist'])
+    else:
+        flags.append('--disable-gpu-rasterization')
+    if profile['raster_threads']:
+        flags.append(f"--num-raster-threads={profile['raster_threads']}")
+
+    if not profile['background_throttling']:
+        flags.extend([
+            '--disable-background-timer-throttling',
+            '--disable-renderer-backgrounding',
+            '--disable-backgrounding-occluded-windows',
+        ])
+
+    flags.extend(extra_flags)
+    return flags
+
+
+def apply_performance_profile(profile_name, extra_flags=()):
+    """Export the profile's flags for QtWebEngine; call before QApplication is created
+
+    Flags already in QTWEBENGINE_CHROMIUM_FLAGS are kept and take precedence.
+    """
+    flags = chromium_flags(profile_name, extra_flags)
+    existing = os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS')
+    if existing:
+        flags.append(existing)
+    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = ' '.join(flags)
+    return flags
@@ -0,0 +1,294 @@
+import re
+import threading
+from array import array
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+
+CHUNK_BLOCKS = 2000
+# Longer lines (minified pages) are split so the text layout stays cheap
+MAX_LINE_LENGTH = 4000
+
+TOKEN_RE = re.compile(
+    r'(?P<comment><!--.*?(?:-->|$))'
+    r'|(?P<doctype><![^>]*>)'
+    r'|(?P<tag></?[A-Za-z][^\s/>]*)(?P<attrs>[^>]*)(?P<close>/?>)?',
+    re.S
+)
+ATTR_RE = re.compile(r'''([^\s=/>"']+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?''')
+
+FORMAT_COLORS = {
+    'comment': '#6a9955',
+    'doctype': '#808080',
+    'tag': '#569cd6',
+    'attr': '#9cdcfe',
+    'value': '#ce9178',
+}
+
+
+def tokenize(text):
+    """Yield (start, end, kind) spans of HTML syntax in order"""
+    for match in TOKEN_RE.finditer(text):
+        for kind in ('comment', 'doctype'):
+            if match.group(kind):
+                yield match.start(kind), match.end(kind), kind
+                break
+        else:
+            yield match.start('tag'), match.end('tag'), 'tag'
+            offset = match.start('attrs')
+            for attr in ATTR_RE.finditer(match.group('attrs')):
+                yield offset + attr.start(1), offset + attr.end(1), 'attr'
+                if attr.group(2):
+                    yield offset + attr.start(2), offset + attr.end(2), 'value'
+            if match.group('close'):
+                yield match.start('close'), match.end('close'), 'tag'
+
+
+def index_source(text, emit, cancelled=lambda: False):
+    """Split text into display blocks and call emit with batches of them
+
+    Each block is (text, source line number or 0 for a continuation of a
+    split line, [(start, length, kind), ...]).
+    """
+    tokens = tokenize(text)
+    pending = next(tokens, None)
+    blocks = []
+    pos = 0
+    line = 1
+    length = len(text)
+    while pos < length:
+        line_end = text.find('\n', pos)
+        if line_end < 0:
+            line_end = length
+        seg_start = pos
+        first = True
+        while True:
+            seg_end = min(line_end, seg_start + MAX_LINE_LENGTH)
+            spans = []
+            while pending and pending[0] < seg_end:
+                start, end, kind = pending
+                if end > seg_start:
+                    clipped = max(start, seg_start)
+                    spans.append((clipped - seg_start, min(end, seg_end) - clipped, kind))
+                if end > seg_end:
+                    break
+                pending = next(tokens, None)
+            blocks.append((text[seg_start:seg_end], line if first else 0, spans))
+            first = False
+            seg_start = seg_end
+            if seg_start >= line_end:
+                break
+        line += 1
+        pos = line_end + 1
+        if len(blocks) >= CHUNK_BLOCKS:
+            if cancelled():
+                return line - 1
+            emit(blocks)
+            blocks = []
+    if blocks:
+        emit(blocks)
+    return line - 1
+
+
+class SourceIndexer(QObject):
+    """Splits and tokenizes page source on a worker thread
+
+    Nothing is emitted once cancel has returned, so the indexer can be
+    deleted with its viewer while the worker is still running.
+    """
+
+    chunk_indexed = pyqtSignal(list)
+    indexing_finished = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cancelled = False
+        # Held around the cancelled check and each emit
+        self.lock = threading.Lock()
+
+    def start(self, text):
+        threading.Thread(target=self._run, args=(text,), name="source-indexer", daemon=True).start()
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+
+    def _run(self, text):
+        lines = index_source(text, lambda blocks: self._emit(self.chunk_indexed, blocks), lambda: self.cancelled)
+        self._emit(self.indexing_finished, lines)
+
+    def _emit(self, signal, value):
+        with self.lock:
+            if not self.cancelled:
+                signal.emit(value)
+
+
+class LineNumberArea(QWidget):
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+
+    def sizeHint(self):
+        return QSize(self.editor.line_number_width(), 0)
+
+    def paintEvent(self, event):
+        self.editor.paint_line_numbers(event)
+
+
+class SourceView(QPlainTextEdit):
+    """Read-only source text that highlights blocks when they become visible
+
+    Blocks are appended in batches as the indexer produces them. Syntax
+    spans are kept per block and only applied to the text layout of the
+    blocks on screen.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        self.setFont(font)
+
+        self.block_spans = []
+        self.block_lines = array('i')
+        self.line_blocks = array('i')  # first block of each source line
+        self.highlighted = bytearray()
+        self.line_count = 0
+        self.formats = {}
+        for kind, color in FORMAT_COLORS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            self.formats[kind] = text_format
+
+        self.line_number_area = LineNumberArea(self)
+        self.updateRequest.connect(self.on_update_request)
+        self.update_line_number_width()
+
+    def append_blocks(self, blocks):
+        if not blocks:
+            return
+        if self.block_spans:
+            # The previous last block is edited by the insert and loses its formats
+            self.highlighted[-1] = 0
+        text = '\n'.join(block[0] for block in blocks)
+        for _, line, spans in blocks:
+            if line:
+                self.line_blocks.append(len(self.block_spans))
+                self.line_count = line
+            self.block_spans.append(spans)
+            self.block_lines.append(line)
+        self.highlighted.extend(bytes(len(blocks)))
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(('\n' if len(self.block_spans) > len(blocks) else '') + text)
+        self.update_line_number_width()
+
+    def highlight_visible(self):
+        block = self.firstVisibleBlock()
+        top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
+        height = self.viewport().height()
+        while block.isValid() and top <= height:
+            number = block.blockNumber()
+            if number < len(self.block_spans) and not self.highlighted[number]:
+                self.highlighted[number] = 1
+                self.apply_spans(block, self.block_spans[number])
+            top += self.blockBoundingRect(block).height()
+            block = block.next()
+
+    def apply_spans(self, block, spans):
+        if not spans:
+            return
+        ranges = []
+        for start, length, kind in spans:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = self.formats[kind]
+            ranges.append(format_range)
+        block.layout().setFormats(ranges)
+        self.document().markContentsDirty(block.position(), block.length())
+
+    def go_to_line(self, line):
+        """Scroll to a source line number"""
+        if not self.line_blocks:
+            return
+        block_number = self.line_blocks[min(line, len(self.line_blocks)) - 1]
+        block = self.document().findBlockByNumber(block_number)
+        cursor = QTextCursor(block)
+        self.setTextCursor(cursor)
+        self.centerCursor()
+
+    def line_number_width(self):
+        digits = len(str(max(1, self.line_count)))
+        return 8 + self.fontMetrics().horizontalAdvance('9') * digits
+
+    def update_line_number_width(self):
+        self.setViewportMargins(self.line_number_width(), 0, 0, 0)
+
+    def on_update_request(self, rect, dy):
+        if dy:
+            self.line_number_area.scroll(0, dy)
+        else:
+            self.line_number_area.update(0, rect.y(), self.line_number_area.width(), rect.height())
+        self.highlight_visible()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        rect = self.contentsRect()
+        self.line_number_area.setGeometry(QRect(rect.left(), rect.top(), self.line_number_width(), rect.height()))
+
+    def paint_line_numbers(self, event):
+        painter = QPainter(self.line_number_area)
+        painter.fillRect(event.rect(), self.palette().color(QPalette.AlternateBase))
+        painter.setPen(self.palette().color(QPalette.PlaceholderText))
+        block = self.firstVisibleBlock()
+        top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
+        width = self.line_number_area.width() - 4
+        line_height = self.fontMetrics().height()
+        while block.isValid() and top <= event.rect().bottom():
+            number = block.blockNumber()
+            if number < len(self.block_lines) and self.block_lines[number]:
+                painter.drawText(0, int(top), width, line_height, Qt.AlignRight, str(self.block_lines[number]))
+            top += self.blockBoundingRect(block).height()
+            block = block.next()
+
+
+class PageSourceViewer(QDialog):
+    def __init__(self, url, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle(f"Source of {url}")
+        self.setGeometry(150, 150, 900, 700)
+
+        layout = QVBoxLayout(self)
+        self.view = SourceView()
+        layout.addWidget(self.view)
+        self.status_label = QLabel("Loading source...")
+        layout.addWidget(self.status_label)
+
+        QShortcut(QKeySequence("Ctrl+G"), self, self.ask_line)
+
+        self.indexer = SourceIndexer(self)
+        self.indexer.chunk_indexed.connect(self.view.append_blocks)
+        self.indexer.indexing_finished.connect(self.on_indexing_finished)
+        self.finished.connect(self.indexer.cancel)
+
+    def set_source(self, html):
+        self.status_label.setText(f"Indexing {len(html):,} characters...")
+        self.indexer.start(html)
+
+    def closeEvent(self, event):
+        # Stop the worker before WA_DeleteOnClose deletes the indexer
+        self.indexer.cancel()
+        super().closeEvent(event)
+
+    def on_indexing_finished(self, lines):
+        self.status_label.setText(f"{lines:,} lines")
+
+    def ask_line(self):
+        line, ok = QInputDialog.getInt(self, "Go to Line", "Line:", 1, 1, max(1, self.view.line_count))
+        if ok:
+            self.view.go_to_line(line)
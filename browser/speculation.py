@@ -0,0 +1,186 @@
+import time
+from collections import OrderedDict
+from html import escape
+from PyQt5.QtCore import *
+from .bookmark_manager import normalize_url
+
+PRECONNECT_CONFIDENCE = 0.3
+PRERENDER_CONFIDENCE = 0.8
+
+
+def url_origin(url):
+    """scheme://host[:port] of an http(s) URL, or None"""
+    qurl = QUrl(url)
+    if qurl.scheme() not in ('http', 'https') or not qurl.host():
+        return None
+    return qurl.adjusted(QUrl.RemovePath | QUrl.RemoveQuery | QUrl.RemoveFragment | QUrl.RemoveUserInfo).toString()
+
+
+class SpeculationEngine(QObject):
+    """Preconnects and prerenders likely navigation targets
+
+    speculate(url, confidence) is called as the user types or hovers. The
+    most recent candidate is acted on after a short debounce: its origin is
+    preconnected through a hidden page carrying preconnect and dns-prefetch
+    hints, and high-confidence targets are loaded in a hidden, muted page.
+    take(url) hands a matching prerendered page to the caller when the
+    navigation commits. Prerenders are limited by count, a memory headroom
+    check and a time to live; unused ones are dropped and counted as wasted.
+    """
+
+    def __init__(self, page_factory, max_prerenders=1, max_preconnects=4,
+                 prerender_ttl=30000, page_memory_mb=150, memory_headroom=None,
+                 debounce=150, parent=None):
+        super().__init__(parent)
+        self.page_factory = page_factory
+        self.max_prerenders = max_prerenders
+        self.max_preconnects = max_preconnects
+        self.prerender_ttl = prerender_ttl
+        self.page_memory_mb = page_memory_mb
+        self.memory_headroom = memory_headroom
+
+        self.prerenders = OrderedDict()  # normalized url -> (page, monotonic start)
+        self.preconnected = OrderedDict()  # origin -> monotonic time
+        self.preconnect_page = None
+        self.candidate = None
+
+        self.stats = {
+            'preconnects': 0,
+            'preconnect_hits': 0,
+            'prerenders': 0,
+            'prerender_hits': 0,
+            'prerender_warm_hits': 0,
+            'prerenders_wasted': 0,
+            'prerenders_skipped': 0,
+            'misses': 0,
+        }
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce)
+        self.debounce_timer.timeout.connect(self.run_candidate)
+
+        self.expire_timer = QTimer(self)
+        self.expire_timer.setInterval(max(1000, prerender_ttl // 3))
+        self.expire_timer.timeout.connect(self.expire)
+
+    def speculate(self, url, confidence):
+        """Note a likely navigation target"""
+        if confidence < PRECONNECT_CONFIDENCE or not url_origin(url):
+            return
+        self.candidate = (url, confidence)
+        self.debounce_timer.start()
+
+    def cancel_candidate(self):
+        self.candidate = None
+        self.debounce_timer.stop()
+
+    def run_candidate(self):
+        if not self.candidate:
+            return
+        url, confidence = self.candidate
+        self.candidate = None
+        self.preconnect(url_origin(url))
+        if confidence >= PRERENDER_CONFIDENCE:
+            self.prerender(url)
+
+    def preconnect(self, origin):
+        if origin in self.preconnected:
+            self.preconnected.move_to_end(origin)
+            self.preconnected[origin] = time.monotonic()
+            return
+        self.preconnected[origin] = time.monotonic()
+        while len(self.preconnected) > self.max_preconnects:
+            self.preconnected.popitem(last=False)
+        self.stats['preconnects'] += 1
+
+        if self.preconnect_page is None:
+            self.preconnect_page = self.page_factory(self)
+            self.preconnect_page.setAudioMuted(True)
+        hints = ''.join(
+            f'<link rel="preconnect" href="{escape(o)}"><link rel="dns-prefetch" href="{escape(o)}">'
+            for o in self.preconnected
+        )
+        self.preconnect_page.setHtml(f"<!DOCTYPE html><html><head>{hints}</head></html>")
+
+    def prerender(self, url):
+        key = normalize_url(url)
+        if key in self.prerenders:
+            self.prerenders.move_to_end(key)
+            return
+        if not self.max_prerenders:
+            return
+        if self.memory_headroom and self.memory_headroom() < self.page_memory_mb:
+            self.stats['prerenders_skipped'] += 1
+            return
+        while len(self.prerenders) >= self.max_prerenders:
+            _, (page, _) = self.prerenders.popitem(last=False)
+            self.drop(page)
+
+        page = self.page_factory(self)
+        page.setAudioMuted(True)
+        page.setUrl(QUrl(url))
+        self.prerenders[key] = (page, time.monotonic())
+        self.stats['prerenders'] += 1
+        self.expire_timer.start()
+
+    def take(self, url, adopt=True):
+        """Record a committed navigation; returns a prerendered page for it or None
+
+        The caller owns the returned page. With adopt=False a matching
+        prerender is only counted as a warm hit (its connections and cached
+        resources are reused by the real load) and dropped.
+        """
+        self.cancel_candidate()
+        origin = url_origin(url)
+        if origin in self.preconnected:
+            self.stats['preconnect_hits'] += 1
+            del self.preconnected[origin]
+
+        entry = self.prerenders.pop(normalize_url(url), None)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        page = entry[0]
+        if not adopt:
+            self.stats['prerender_warm_hits'] += 1
+            page.deleteLater()
+            return None
+        self.stats['prerender_hits'] += 1
+        page.setParent(None)
+        page.setAudioMuted(False)
+        return page
+
+    def drop(self, page):
+        self.stats['prerenders_wasted'] += 1
+        page.deleteLater()
+
+    def expire(self):
+        """Drop prerenders older than the time to live"""
+        cutoff = time.monotonic() - self.prerender_ttl / 1000
+        for key, (page, started) in list(self.prerenders.items()):
+            if started < cutoff:
+                del self.prerenders[key]
+                self.drop(page)
+        if not self.prerenders:
+            self.expire_timer.stop()
+
+    def clear(self):
+        """Drop all speculative pages"""
+        self.cancel_candidate()
+        for page, _ in self.prerenders.values():
+            self.drop(page)
+        self.prerenders.clear()
+        if self.preconnect_page is not None:
+            self.preconnect_page.deleteLater()
+            self.preconnect_page = None
+        self.preconnected.clear()
+
+    def get_stats(self):
+        """Speculation counters with the prerender hit rate"""
+        stats = dict(self.stats)
+        used = stats['prerender_hits'] + stats['prerender_warm_hits']
+        prerendered = used + stats['prerenders_wasted']
+        stats['prerender_hit_rate'] = used / prerendered if prerendered else 0.0
+        stats['active_prerenders'] = len(self.prerenders)
+        return stats
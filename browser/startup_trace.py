@@ -0,0 +1,42 @@
+import sys
+import time
+
+
+class StartupTrace:
+    """Timeline of startup milestones, printed with --startup-trace"""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.enabled = False
+        self.finished = False
+        self.marks = []
+
+    def start(self, start_time=None, enabled=False):
+        """Set the process start time and whether to print the timeline"""
+        if start_time is not None:
+            self.start_time = start_time
+        self.enabled = enabled
+
+    def mark(self, name):
+        """Record a milestone, relative to the start time"""
+        if not self.finished:
+            self.marks.append((name, time.perf_counter() - self.start_time))
+
+    def finish(self, name):
+        """Record the last milestone and print the timeline once"""
+        if self.finished:
+            return
+        self.mark(name)
+        self.finished = True
+        if self.enabled:
+            self.print_timeline()
+
+    def print_timeline(self, file=sys.stderr):
+        print("Startup timeline:", file=file)
+        previous = 0.0
+        for name, elapsed in self.marks:
+            print(f"  {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:7.1f} ms)  {name}", file=file)
+            previous = elapsed
+
+
+startup_trace = StartupTrace()
@@ -0,0 +1,125 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from PyQt5.QtCore import *
+
+# Files older versions kept in the working directory
+LEGACY_DATA_FILES = {'bookmarks.json', 'browser_settings.json'}
+
+
+def get_data_dir():
+    """Per-user directory for persistent browser data"""
+    path = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not path:
+        path = os.path.join(os.path.expanduser('~'), '.lightpy')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_data_file(filename):
+    """Path of a data file in the per-user data directory
+
+    The LEGACY_DATA_FILES older versions left in the working directory are
+    moved over the first time they are looked up.
+    """
+    path = os.path.join(get_data_dir(), filename)
+    if filename in LEGACY_DATA_FILES and not os.path.exists(path) and os.path.exists(filename):
+        try:
+            shutil.move(filename, path)
+        except OSError as e:
+            print(f"Error migrating {filename}: {e}")
+            return filename
+    return path
+
+
+def load_json(path, default):
+    """Load a JSON file, returning default if it is missing or unreadable"""
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error loading {path}: {e}")
+    return default
+
+
+def atomic_write_json(path, data, indent=None):
+    """Write JSON to a temp file next to path and rename it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class PersistenceService:
+    """Write-behind JSON persistence shared by bookmarks and settings
+
+    Saves are coalesced per file: everything scheduled within the delay
+    window is written once, with the latest data, on a background thread.
+    Callers must pass immutable snapshots (or data they no longer mutate).
+    """
+
+    def __init__(self, delay=1.0):
+        self.delay = delay
+        self.pending = {}  # path -> (data, indent)
+        self.deadline = None
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self.thread.start()
+
+    def schedule(self, path, data, indent=None):
+        """Queue data to be written to path"""
+        with self.condition:
+            self.pending[path] = (data, indent)
+            if self.deadline is None:
+                self.deadline = time.monotonic() + self.delay
+            self.condition.notify()
+
+    def flush(self):
+        """Write all pending data now, on the calling thread"""
+        with self.write_lock:
+            with self.condition:
+                pending, self.pending = self.pending, {}
+                self.deadline = None
+            self._write(pending)
+
+    def stop(self):
+        """Flush pending writes and stop the background thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.flush()
+        self.thread.join(timeout=5)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and (self.deadline is None or time.monotonic() < self.deadline):
+                    timeout = None if self.deadline is None else self.deadline - time.monotonic()
+                    self.condition.wait(timeout)
+                if not self.running:
+                    return
+            self.flush()
+
+    def _write(self, pending):
+        for path, (data, indent) in pending.items():
+            try:
+                atomic_write_json(path, data, indent)
+            except Exception as e:
+                print(f"Error saving {path}: {e}")
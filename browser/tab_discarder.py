@@ -0,0 +1,184 @@
+from collections import OrderedDict
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtWebEngineWidgets import *
+
+
+class DiscardedTab(QWidget):
+    """Lightweight placeholder that stands in for a torn down browser view"""
+
+    def __init__(self, url, title, history_data=None, scroll_position=None):
+        super().__init__()
+        self.tab_url = QUrl(url)
+        self.tab_title = title
+        self.history_data = history_data
+        self.scroll_position = scroll_position
+
+    def url(self):
+        return self.tab_url
+
+    def title(self):
+        return self.tab_title
+
+
+def serialize_history(browser):
+    """Serialize the navigation history of a browser view"""
+    data = QByteArray()
+    stream = QDataStream(data, QIODevice.WriteOnly)
+    stream << browser.history()
+    return data
+
+
+def restore_history(browser, data):
+    """Load serialized navigation history into a browser view"""
+    stream = QDataStream(data, QIODevice.ReadOnly)
+    stream >> browser.history()
+
+
+def read_process_rss_mb(pid):
+    """Resident memory of a process in MB, or None if it can't be read"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class TabDiscarder(QObject):
+    """Keeps live tabs within a memory budget by discarding background tabs"""
+
+    tab_discarded = pyqtSignal(int)
+    tab_restored = pyqtSignal(int)
+
+    def __init__(self, tab_manager, browser_factory, memory_budget_mb=2048,
+                 tab_memory_estimate_mb=150, check_interval=30000):
+        super().__init__(tab_manager)
+        self.tab_manager = tab_manager
+        self.browser_factory = browser_factory
+        self.memory_budget_mb = memory_budget_mb
+        self.tab_memory_estimate_mb = tab_memory_estimate_mb
+
+        # Live browser views, least recently used first
+        self.lru = OrderedDict()
+        self.discard_count = 0
+        self.restore_count = 0
+
+        self.tab_manager.tab_closed.connect(self.forget)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.enforce_budget)
+        self.timer.start(check_interval)
+
+    def touch(self, browser):
+        """Mark a live browser view as most recently used"""
+        if isinstance(browser, QWebEngineView):
+            self.lru.pop(browser, None)
+            self.lru[browser] = None
+
+    def forget(self, browser):
+        """Stop tracking a browser view"""
+        self.lru.pop(browser, None)
+
+    def estimate_memory(self):
+        """Estimate the memory used by each live tab in MB
+
+        Renderer RSS is split evenly between the tabs sharing that process.
+        Falls back to a fixed per-tab estimate when /proc is not available.
+        """
+        tabs_by_pid = {}
+        for browser in self.lru:
+            page = browser.page()
+            pid = page.renderProcessPid() if hasattr(page, 'renderProcessPid') else 0
+            tabs_by_pid.setdefault(pid, []).append(browser)
+
+        usage = {}
+        for pid, browsers in tabs_by_pid.items():
+            rss = read_process_rss_mb(pid) if pid else None
+            for browser in browsers:
+                usage[browser] = rss / len(browsers) if rss is not None else self.tab_memory_estimate_mb
+        return usage
+
+    def enforce_budget(self):
+        """Discard least recently used background tabs until under budget"""
+        usage = self.estimate_memory()
+        total = sum(usage.values())
+        current = self.tab_manager.currentWidget()
+
+        for browser in list(self.lru):
+            if total <= self.memory_budget_mb:
+                break
+            if browser is current:
+                continue
+            total -= usage.get(browser, 0)
+            self.discard(browser)
+
+    def discard(self, browser):
+        """Replace a background browser view with a placeholder"""
+        index = self.tab_manager.indexOf(browser)
+        if index < 0 or browser is self.tab_manager.currentWidget():
+            return False
+
+        placeholder = DiscardedTab(
+            browser.url(),
+            browser.title(),
+            serialize_history(browser),
+            browser.page().scrollPosition()
+        )
+        self.tab_manager.replace_tab_widget(index, placeholder)
+        self.tab_manager.set_tab_discarded(index, True)
+
+        self.forget(browser)
+        browser.stop()
+        browser.deleteLater()
+
+        self.discard_count += 1
+        self.tab_discarded.emit(index)
+        return True
+
+    def restore(self, index):
+        """Rebuild the browser view of a discarded tab and return it"""
+        placeholder = self.tab_manager.widget(index)
+        if not isinstance(placeholder, DiscardedTab):
+            return placeholder
+
+        browser = self.browser_factory()
+        if placeholder.history_data is not None and not placeholder.history_data.isEmpty():
+            restore_history(browser, placeholder.history_data)
+        else:
+            browser.setUrl(placeholder.url())
+
+        scroll_position = placeholder.scroll_position
+        if scroll_position is not None and not scroll_position.isNull():
+            def restore_scroll(ok):
+                browser.loadFinished.disconnect(restore_scroll)
+                if ok:
+                    browser.page().runJavaScript(
+                        f"window.scrollTo({scroll_position.x()}, {scroll_position.y()});"
+                    )
+            browser.loadFinished.connect(restore_scroll)
+
+        self.tab_manager.replace_tab_widget(index, browser)
+        self.tab_manager.set_tab_discarded(index, False)
+        placeholder.deleteLater()
+
+        self.touch(browser)
+        self.restore_count += 1
+        self.tab_restored.emit(index)
+        return browser
+
+    def get_stats(self):
+        """Discard statistics for monitoring"""
+        discarded = sum(
+            1 for i in range(self.tab_manager.count())
+            if isinstance(self.tab_manager.widget(i), DiscardedTab)
+        )
+        return {
+            'live_tabs': len(self.lru),
+            'discarded_tabs': discarded,
+            'discard_count': self.discard_count,
+            'restore_count': self.restore_count,
+            'memory_budget_mb': self.memory_budget_mb,
+        }
@@ -4,11 +4,21 @@ from PyQt5.QtWebEngineWidgets import *
 from PyQt5.QtGui import *
 
 class TabManager(QTabWidget):
+    tab_closed = pyqtSignal(QWidget)
+    tab_replaced = pyqtSignal(QWidget, QWidget)
+    tab_pinned = pyqtSignal(QWidget, bool)
+    
     def __init__(self):
         super().__init__()
         self.setTabsClosable(True)
         self.setMovable(True)
         self.tabCloseRequested.connect(self.close_tab)
+        # Pinned tabs sit at the front and can't be closed
+        self.pinned = set()
+        
+        self.tabBar().setContextMenuPolicy(Qt.CustomContextMenu)
+        self.tabBar().customContextMenuRequested.connect(self.show_tab_menu)
+        self.tabBar().tabMoved.connect(self.on_tab_moved)
         
         # Add new tab button
         self.setCornerWidget(self.create_new_tab_button())
@@ -22,17 +32,96 @@ class TabManager(QTabWidget):
     def add_tab(self, browser, title):
         """Add a new tab with browser widget"""
         index = self.addTab(browser, title)
+        self.set_close_button(index, browser)
         
-        # Create close button for tab
-        tab_bar = self.tabBar()
+        return index
+        
+    def set_close_button(self, index, widget):
+        """Create close button for the tab holding widget"""
         close_btn = QToolButton()
         close_btn.setText('×')
         close_btn.setCursor(Qt.ArrowCursor)
-        close_btn.clicked.connect(lambda: self.close_tab(index))
+        close_btn.clicked.connect(lambda: self.close_tab(self.indexOf(widget)))
         
-        tab_bar.setTabButton(index, QTabBar.RightSide, close_btn)
+        self.tabBar().setTabButton(index, QTabBar.RightSide, close_btn)
         
-        return index
+    def replace_tab_widget(self, index, widget):
+        """Swap the widget of a tab in place without emitting currentChanged"""
+        old = self.widget(index)
+        text = self.tabText(index)
+        tooltip = self.tabToolTip(index)
+        icon = self.tabIcon(index)
+        current_index = self.currentIndex()
+        
+        self.blockSignals(True)
+        self.removeTab(index)
+        self.insertTab(index, widget, icon, text)
+        self.setTabToolTip(index, tooltip)
+        self.set_close_button(index, widget)
+        self.setCurrentIndex(current_index)
+        self.blockSignals(False)
+        
+        if old in self.pinned:
+            self.pinned.discard(old)
+            self.pinned.add(widget)
+            self.set_close_button_visible(index, False)
+        self.tab_replaced.emit(old, widget)
+        
+    def is_pinned(self, widget):
+        return widget in self.pinned
+        
+    def set_tab_pinned(self, index, pinned):
+        """Pin a tab to the front of the tab bar, or unpin it"""
+        widget = self.widget(index)
+        if widget is None or self.is_pinned(widget) == pinned:
+            return
+        if pinned:
+            self.pinned.add(widget)
+            target = len(self.pinned) - 1
+        else:
+            self.pinned.discard(widget)
+            target = len(self.pinned)
+        self.tabBar().moveTab(index, target)
+        self.set_close_button_visible(target, not pinned)
+        self.tab_pinned.emit(widget, pinned)
+        
+    def set_close_button_visible(self, index, visible):
+        for side in (QTabBar.RightSide, QTabBar.LeftSide):
+            button = self.tabBar().tabButton(index, side)
+            if button is not None:
+                button.setVisible(visible)
+                
+    def on_tab_moved(self, from_index, to_index):
+        """Keep dragged tabs on their side of the pinned tabs"""
+        pinned_count = len(self.pinned)
+        if self.is_pinned(self.widget(to_index)):
+            if to_index >= pinned_count:
+                self.tabBar().moveTab(to_index, pinned_count - 1)
+        elif to_index < pinned_count:
+            self.tabBar().moveTab(to_index, pinned_count)
+        
+    def show_tab_menu(self, position):
+        index = self.tabBar().tabAt(position)
+        if index < 0:
+            return
+        pinned = self.is_pinned(self.widget(index))
+        menu = QMenu(self)
+        pin_action = menu.addAction("Unpin Tab" if pinned else "Pin Tab")
+        close_action = menu.addAction("Close Tab")
+        close_action.setEnabled(not pinned)
+        pin_action.triggered.connect(lambda: self.set_tab_pinned(index, not pinned))
+        close_action.triggered.connect(lambda: self.close_tab(index))
+        menu.exec_(self.tabBar().mapToGlobal(position))
+        
+    def set_tab_discarded(self, index, discarded):
+        """Show or clear the discarded state of a tab"""
+        tab_bar = self.tabBar()
+        if discarded:
+            tab_bar.setTabTextColor(index, QColor('#888888'))
+            self.setTabToolTip(index, 'Discarded to save memory - select to reload')
+        else:
+            tab_bar.setTabTextColor(index, QColor())
+            self.setTabToolTip(index, '')
         
     def add_new_tab(self):
         """Add empty new tab"""
@@ -48,7 +137,10 @@ class TabManager(QTabWidget):
         """Close tab at specified index"""
         if self.count() > 1:
             widget = self.widget(index)
+            if widget in self.pinned:
+                return
             if widget:
+                self.tab_closed.emit(widget)
                 widget.deleteLater()
             self.removeTab(index)
             
@@ -57,9 +149,15 @@ class TabManager(QTabWidget):
         current_index = self.currentIndex()
         self.close_tab(current_index)
         
-    def set_tab_title(self, browser, title):
-        """Set title for tab containing specific browser"""
-        for i in range(self.count()):
-            if self.widget(i) == browser:
-                self.setTabText(i, title[:20] + '...' if len(title) > 20 else title)
-                break
+    def set_tab_title(self, browser, title, index_hint=-1):
+        """Set title for tab containing specific browser
+        
+        index_hint is the tab's last known index; it is only checked, so the
+        lookup is O(1) unless tabs were moved or closed. Returns the index.
+        """
+        index = index_hint
+        if index < 0 or self.widget(index) is not browser:
+            index = self.indexOf(browser)
+        if index >= 0:
+            self.setTabText(index, title[:20] + '...' if len(title) > 20 else title)
+        return index
@@ -0,0 +1,343 @@
+import math
+import queue
+import re
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtWebEngineWidgets import *
+
+WORD_RE = re.compile(r'\w{2,}')
+# Rough per-entry costs used to keep the index within its memory budget
+POSTING_BYTES = 96
+TERM_BYTES = 80
+
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+
+def page_key(url):
+    """URL without its fragment; in-page navigation keeps the indexed text"""
+    return url.adjusted(QUrl.RemoveFragment).toString()
+
+
+class TabContentIndex(QObject):
+    """In-memory inverted index of the text of open tabs
+
+    Text is pulled with toPlainText a moment after a tab finishes loading;
+    tokenizing, indexing and searching run on a worker thread. Tabs are
+    dropped from the index when they navigate away or close. When the
+    estimated size exceeds max_bytes the least recently indexed tabs are
+    dropped first and indexed again after their next load.
+    """
+
+    search_finished = pyqtSignal(int, list)
+    documents_evicted = pyqtSignal(list)
+
+    def __init__(self, tab_manager, max_bytes=32 * 1024 * 1024, max_chars_per_tab=200000,
+                 debounce=1500, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        self.max_bytes = max_bytes
+        self.max_chars_per_tab = max_chars_per_tab
+
+        # GUI thread: tab widget <-> document id
+        self.doc_ids = {}
+        self.widgets = {}
+        self.doc_urls = {}
+        self.next_id = 1
+        self.pending = set()
+        self.search_seq = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce)
+        self.timer.timeout.connect(self.extract_pending)
+
+        # Worker thread only
+        self.postings = {}  # term -> {doc id: count}
+        self.docs = OrderedDict()  # doc id -> (title, text, terms, bytes), oldest first
+        self.index_bytes = 0
+
+        self.stats_lock = threading.Lock()
+        self.stats = {'documents': 0, 'terms': 0, 'memory_bytes': 0, 'evictions': 0}
+
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="tab-search", daemon=True)
+        self.thread.start()
+
+        self.documents_evicted.connect(self.on_documents_evicted)
+        self.tab_manager.tab_closed.connect(self.drop)
+        self.tab_manager.tab_replaced.connect(self.on_tab_replaced)
+
+    def attach(self, browser):
+        """Index browser's text after each load"""
+        browser.loadFinished.connect(lambda ok: ok and self.schedule(browser))
+        browser.urlChanged.connect(lambda url: self.on_url_changed(browser, url))
+
+    def schedule(self, browser):
+        self.pending.add(browser)
+        self.timer.start()
+
+    def on_url_changed(self, browser, url):
+        doc_id = self.doc_ids.get(browser)
+        if doc_id is not None and self.doc_urls.get(doc_id) != page_key(url):
+            self.drop(browser)
+
+    def on_tab_replaced(self, old, new):
+        # Discarded tabs stay searchable through their placeholder
+        doc_id = self.doc_ids.pop(old, None)
+        self.pending.discard(old)
+        if doc_id is not None:
+            self.doc_ids[new] = doc_id
+            self.widgets[doc_id] = new
+
+    def drop(self, widget):
+        self.pending.discard(widget)
+        doc_id = self.doc_ids.pop(widget, None)
+        if doc_id is not None:
+            self.widgets.pop(doc_id, None)
+            self.doc_urls.pop(doc_id, None)
+            self.requests.put(('remove', doc_id))
+
+    def on_documents_evicted(self, doc_ids):
+        for doc_id in doc_ids:
+            widget = self.widgets.pop(doc_id, None)
+            self.doc_urls.pop(doc_id, None)
+            if widget is not None and self.doc_ids.get(widget) == doc_id:
+                del self.doc_ids[widget]
+                # Drop text that was queued for this tab before the eviction
+                self.requests.put(('remove', doc_id))
+
+    def extract_pending(self):
+        pending, self.pending = self.pending, set()
+        for browser in pending:
+            try:
+                if self.tab_manager.indexOf(browser) < 0:
+                    continue
+                doc_id = self.doc_ids.get(browser)
+                if doc_id is None:
+                    doc_id = self.doc_ids[browser] = self.next_id
+                    self.next_id += 1
+                    self.widgets[doc_id] = browser
+                self.doc_urls[doc_id] = page_key(browser.url())
+                title = browser.title()
+                browser.page().toPlainText(
+                    lambda text, doc_id=doc_id, title=title: self.on_text(doc_id, title, text)
+                )
+            except RuntimeError:
+                # The view was deleted while the extraction was pending
+                pass
+
+    def on_text(self, doc_id, title, text):
+        if doc_id in self.widgets:
+            self.requests.put(('index', doc_id, title, text[:self.max_chars_per_tab]))
+
+    def search(self, query, limit=50):
+        """Start a search; results arrive through search_finished(seq, results)
+
+        Results are (doc id, title, score, snippet) tuples, best first; map
+        doc ids to tab widgets with widget_for. Returns the sequence number
+        of the search.
+        """
+        self.search_seq += 1
+        self.requests.put(('search', self.search_seq, query, limit))
+        return self.search_seq
+
+    def widget_for(self, doc_id):
+        return self.widgets.get(doc_id)
+
+    def get_stats(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+    def stop(self):
+        self.requests.put(('stop',))
+
+    def _run(self):
+        while True:
+            request = self.requests.get()
+            op = request[0]
+            try:
+                if op == 'stop':
+                    return
+                if op == 'index':
+                    self._index(request[1], request[2], request[3])
+                elif op == 'remove':
+                    self._remove(request[1])
+                elif op == 'search':
+                    self.search_finished.emit(request[1], self._search(request[2], request[3]))
+            except Exception as e:
+                print(f"Error indexing tab content: {e}")
+
+    def _index(self, doc_id, title, text):
+        self._remove(doc_id)
+        counts = {}
+        for term in tokenize(title) + tokenize(text):
+            counts[term] = counts.get(term, 0) + 1
+        size = len(text) + len(title)
+        for term, count in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                size += TERM_BYTES + len(term)
+            postings[doc_id] = count
+            size += POSTING_BYTES
+        self.docs[doc_id] = (title, text, tuple(counts), size)
+        self.index_bytes += size
+
+        evicted = []
+        while self.index_bytes > self.max_bytes and len(self.docs) > 1:
+            evicted.append(next(iter(self.docs)))
+            self._remove(evicted[-1])
+        self._update_stats(len(evicted))
+        if evicted:
+            self.documents_evicted.emit(evicted)
+
+    def _remove(self, doc_id):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for term in doc[2]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+        self.index_bytes -= doc[3]
+        self._update_stats()
+
+    def _update_stats(self, evictions=0):
+        with self.stats_lock:
+            self.stats['documents'] = len(self.docs)
+            self.stats['terms'] = len(self.postings)
+            self.stats['memory_bytes'] = self.index_bytes
+            self.stats['evictions'] += evictions
+
+    def _search(self, query, limit):
+        """Rank documents containing every query term; the last term may be a prefix"""
+        terms = tokenize(query)
+        if not terms or not self.docs:
+            return []
+        total = len(self.docs)
+        scores = None
+        for position, term in enumerate(terms):
+            if position == len(terms) - 1:
+                matches = [t for t in self.postings if t.startswith(term)]
+            else:
+                matches = [term] if term in self.postings else []
+            term_scores = {}
+            for match in matches:
+                postings = self.postings[match]
+                idf = math.log(1 + total / len(postings))
+                for doc_id, count in postings.items():
+                    term_scores[doc_id] = term_scores.get(doc_id, 0.0) + (1 + math.log(count)) * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(doc_id, self.docs[doc_id][0], score, self._snippet(self.docs[doc_id][1], terms[0]))
+                for doc_id, score in ranked]
+
+    def _snippet(self, text, term, width=60):
+        match = re.search(r'\b' + re.escape(term), text, re.IGNORECASE)
+        if not match:
+            return ''
+        start = max(0, match.start() - width)
+        end = min(len(text), match.end() + width)
+        snippet = ' '.join(text[start:end].split())
+        return ('...' if start else '') + snippet + ('...' if end < len(text) else '')
+
+
+class TabSearchDialog(QDialog):
+    """Quick switcher that finds tabs by the text of their pages"""
+
+    def __init__(self, index, tab_manager, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.tab_manager = tab_manager
+        self.current_seq = 0
+        self.setup_ui()
+        self.index.search_finished.connect(self.on_search_finished)
+        self.finished.connect(lambda: self.index.search_finished.disconnect(self.on_search_finished))
+
+    def setup_ui(self):
+        self.setWindowTitle("Search Tabs")
+        self.setGeometry(250, 150, 700, 450)
+
+        layout = QVBoxLayout(self)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Find text in open tabs...")
+        self.query_edit.installEventFilter(self)
+        self.query_edit.returnPressed.connect(self.activate_current)
+        layout.addWidget(self.query_edit)
+
+        self.results = QListWidget()
+        self.results.setWordWrap(True)
+        self.results.itemActivated.connect(self.activate_item)
+        layout.addWidget(self.results)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        self.update_status()
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(self.search_timer.start)
+
+    def eventFilter(self, obj, event):
+        # Arrow keys move through the results while typing
+        if obj is self.query_edit and event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Up, Qt.Key_Down):
+            step = 1 if event.key() == Qt.Key_Down else -1
+            row = max(0, min(self.results.count() - 1, self.results.currentRow() + step))
+            self.results.setCurrentRow(row)
+            return True
+        return super().eventFilter(obj, event)
+
+    def update_status(self, matches=None):
+        stats = self.index.get_stats()
+        text = (f"{stats['documents']} tabs indexed, "
+                f"{stats['memory_bytes'] / (1024 * 1024):.1f} of {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+        if matches is not None:
+            text = f"{matches} matching tabs - " + text
+        self.status_label.setText(text)
+
+    def run_search(self):
+        self.current_seq = self.index.search(self.query_edit.text())
+
+    def on_search_finished(self, seq, results):
+        if seq != self.current_seq:
+            return
+        self.results.clear()
+        for doc_id, title, score, snippet in results:
+            widget = self.index.widget_for(doc_id)
+            if widget is None:
+                continue
+            item = QListWidgetItem(f"{title or widget.url().toString()}\n{snippet}")
+            item.setData(Qt.UserRole, widget)
+            item.setToolTip(widget.url().toString())
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+        self.update_status(self.results.count())
+
+    def activate_current(self):
+        item = self.results.currentItem()
+        if item:
+            self.activate_item(item)
+
+    def activate_item(self, item):
+        index = self.tab_manager.indexOf(item.data(Qt.UserRole))
+        if index >= 0:
+            self.tab_manager.setCurrentIndex(index)
+        self.accept()
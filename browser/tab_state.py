@@ -0,0 +1,120 @@
+from PyQt5.QtCore import *
+from .bookmark_manager import normalize_url
+
+ALL_FIELDS = frozenset({'url', 'title', 'progress', 'load', 'bookmarked'})
+
+
+class TabState:
+    """Cached state of one tab's browser view"""
+
+    __slots__ = ('browser', 'url', 'url_key', 'title', 'progress', 'load_state', 'bookmarked', 'tab_index', 'dirty')
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = ''
+        self.url_key = None  # normalized url
+        self.title = ''
+        self.progress = 0
+        self.load_state = 'idle'  # idle, loading, finished or failed
+        self.bookmarked = False
+        self.tab_index = -1
+        self.dirty = set()
+
+
+class TabStateRegistry(QObject):
+    """Per-tab state kept up to date from each view's signals
+
+    Signal handlers only update the TabState in O(1) and mark fields dirty.
+    Dirty tabs are flushed at most once per frame: tab titles are updated
+    and, for the current tab, render_callback(state, fields) repaints the
+    window chrome. Tab switches render straight from the cached state.
+    """
+
+    def __init__(self, tab_manager, bookmark_manager, render_callback, frame_interval=16, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        self.bookmark_manager = bookmark_manager
+        self.render_callback = render_callback
+        self.states = {}  # browser -> TabState
+        self.states_by_url = {}  # normalized url -> set of TabState
+        self.dirty_states = set()
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(frame_interval)
+        self.flush_timer.timeout.connect(self.flush)
+
+        self.bookmark_manager.add_listener(self.on_bookmarks_changed)
+
+    def register(self, browser):
+        """Create the state for a new browser view and follow its signals"""
+        state = TabState(browser)
+        self.states[browser] = state
+        browser.urlChanged.connect(lambda url: self.on_url_changed(state, url))
+        browser.titleChanged.connect(lambda title: self.update(state, 'title', title=title))
+        browser.loadStarted.connect(lambda: self.update(state, 'load', load_state='loading', progress=0))
+        browser.loadProgress.connect(lambda progress: self.update(state, 'progress', progress=progress))
+        browser.loadFinished.connect(
+            lambda ok: self.update(state, 'load', load_state='finished' if ok else 'failed', progress=0)
+        )
+        browser.destroyed.connect(lambda: self.forget(browser))
+        return state
+
+    def forget(self, browser):
+        state = self.states.pop(browser, None)
+        if state:
+            self.dirty_states.discard(state)
+            self.index_url(state, None)
+
+    def get(self, browser):
+        """State for browser, or None for untracked widgets"""
+        return self.states.get(browser)
+
+    def sync_from_view(self, state):
+        """Refresh url and title from the view, e.g. after a tab was restored"""
+        self.on_url_changed(state, state.browser.url())
+        self.update(state, 'title', title=state.browser.title())
+
+    def index_url(self, state, key):
+        if key == state.url_key:
+            return
+        if state.url_key is not None:
+            states = self.states_by_url.get(state.url_key)
+            if states is not None:
+                states.discard(state)
+                if not states:
+                    del self.states_by_url[state.url_key]
+        state.url_key = key
+        if key is not None:
+            self.states_by_url.setdefault(key, set()).add(state)
+
+    def on_url_changed(self, state, url):
+        url = url.toString()
+        self.index_url(state, normalize_url(url) if url else None)
+        self.update(state, 'url', url=url, bookmarked=self.bookmark_manager.is_bookmarked(url))
+        state.dirty.add('bookmarked')
+
+    def on_bookmarks_changed(self, change, bookmarks):
+        # One dict lookup per bookmark, however many tabs are open
+        for bookmark in bookmarks:
+            for state in self.states_by_url.get(normalize_url(bookmark['url']), ()):
+                self.update(state, 'bookmarked', bookmarked=(change == 'added'))
+
+    def update(self, state, field, **values):
+        for name, value in values.items():
+            setattr(state, name, value)
+        state.dirty.add(field)
+        self.dirty_states.add(state)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        """Apply all pending state changes to the UI"""
+        current = self.tab_manager.currentWidget()
+        dirty_states, self.dirty_states = self.dirty_states, set()
+        for state in dirty_states:
+            fields, state.dirty = state.dirty, set()
+            if 'title' in fields:
+                state.tab_index = self.tab_manager.set_tab_title(state.browser, state.title, state.tab_index)
+            if state.browser is current:
+                self.render_callback(state, fields)
@@ -0,0 +1,252 @@
+import json
+import os
+import queue
+import signal
+import threading
+import time
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from .tab_discarder import read_process_rss_mb
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def read_process_cpu_ticks(pid):
+    """User plus system CPU time of a process in clock ticks, or None"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            data = f.read()
+        # The command name may contain spaces, so split after its closing paren
+        fields = data[data.rindex(')') + 2:].split()
+        return int(fields[11]) + int(fields[12])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ProcessSampler(QObject):
+    """Reads /proc stats for a set of pids on a worker thread"""
+
+    sampled = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.requests = queue.Queue()
+        self.previous = {}  # pid -> (cpu ticks, monotonic time)
+        self.thread = threading.Thread(target=self._run, name="process-sampler", daemon=True)
+        self.thread.start()
+
+    def request(self, pids):
+        """Queue a sample of pids; the result arrives through sampled"""
+        self.requests.put(set(pids))
+
+    def _run(self):
+        while True:
+            pids = self.requests.get()
+            # Only the latest request matters if several piled up
+            while not self.requests.empty():
+                pids = self.requests.get_nowait()
+            self.sampled.emit(self.sample(pids))
+
+    def sample(self, pids):
+        """Map each pid to {'rss_mb', 'cpu_percent'}"""
+        now = time.monotonic()
+        stats = {}
+        current = {}
+        for pid in pids:
+            rss = read_process_rss_mb(pid)
+            ticks = read_process_cpu_ticks(pid)
+            if rss is None or ticks is None:
+                continue
+            cpu_percent = 0.0
+            if pid in self.previous:
+                prev_ticks, prev_time = self.previous[pid]
+                elapsed = now - prev_time
+                if elapsed > 0:
+                    cpu_percent = (ticks - prev_ticks) / CLOCK_TICKS / elapsed * 100
+            current[pid] = (ticks, now)
+            stats[pid] = {'rss_mb': rss, 'cpu_percent': cpu_percent}
+        self.previous = current
+        return stats
+
+
+class TaskManagerService(QObject):
+    """Periodic per-tab renderer memory and CPU samples
+
+    Sampling only runs while something is interested: an open task manager
+    window or a periodic metrics dump.
+    """
+
+    samples_updated = pyqtSignal(list)
+
+    def __init__(self, tab_manager, interval=2000, dump_path=None, dump_interval=0, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        self.samples = []
+        self.tabs = []
+        self.watchers = 0
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.last_dump = 0
+
+        self.sampler = ProcessSampler(self)
+        self.sampler.sampled.connect(self.on_sampled)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.sample)
+        if self.dump_path and self.dump_interval:
+            self.timer.start()
+
+    def watch(self):
+        self.watchers += 1
+        self.sample()
+        self.timer.start()
+
+    def unwatch(self):
+        self.watchers = max(0, self.watchers - 1)
+        if not self.watchers and not (self.dump_path and self.dump_interval):
+            self.timer.stop()
+
+    def tab_processes(self):
+        """(browser, pid) for every live tab"""
+        tabs = []
+        for i in range(self.tab_manager.count()):
+            browser = self.tab_manager.widget(i)
+            if not hasattr(browser, 'page'):
+                continue
+            page = browser.page()
+            pid = page.renderProcessPid() if hasattr(page, 'renderProcessPid') else 0
+            tabs.append((browser, pid))
+        return tabs
+
+    def sample(self):
+        self.tabs = self.tab_processes()
+        self.sampler.request([os.getpid()] + [pid for _, pid in self.tabs if pid])
+
+    def on_sampled(self, stats):
+        samples = []
+        browser_stats = stats.get(os.getpid())
+        if browser_stats:
+            samples.append({'browser': None, 'title': 'Browser', 'url': '', 'pid': os.getpid(), **browser_stats})
+        for browser, pid in self.tabs:
+            try:
+                if pid not in stats or self.tab_manager.indexOf(browser) < 0:
+                    continue
+            except RuntimeError:
+                # The tab was closed or discarded since the sample was requested
+                continue
+            samples.append({
+                'browser': browser,
+                'title': browser.title(),
+                'url': browser.url().toString(),
+                'pid': pid,
+                **stats[pid]
+            })
+        self.samples = samples
+        self.samples_updated.emit(samples)
+
+        if self.dump_path and self.dump_interval and time.time() - self.last_dump >= self.dump_interval:
+            self.dump(samples)
+
+    def dump(self, samples):
+        """Append the samples to the metrics log as one JSON line"""
+        self.last_dump = time.time()
+        record = {
+            'time': self.last_dump,
+            'processes': [{k: v for k, v in s.items() if k != 'browser'} for s in samples],
+        }
+        try:
+            with open(self.dump_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+
+class TaskManagerDialog(QDialog):
+    COLUMNS = ["Tab", "URL", "PID", "Memory (MB)", "CPU %"]
+
+    def __init__(self, service, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.setup_ui()
+        self.service.samples_updated.connect(self.show_samples)
+        self.finished.connect(self.on_finished)
+        self.service.watch()
+        self.show_samples(self.service.samples)
+
+    def setup_ui(self):
+        self.setWindowTitle("Task Manager")
+        self.setGeometry(200, 200, 750, 400)
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(3, Qt.DescendingOrder)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        reload_btn = QPushButton("Reload Tab")
+        reload_btn.clicked.connect(self.reload_selected)
+        kill_btn = QPushButton("End Process")
+        kill_btn.clicked.connect(self.kill_selected)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+
+        button_layout.addWidget(reload_btn)
+        button_layout.addWidget(kill_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def show_samples(self, samples):
+        selected = self.selected_sample()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(samples))
+        for row, sample in enumerate(samples):
+            values = [sample['title'], sample['url'], sample['pid'],
+                      round(sample['rss_mb'], 1), round(sample['cpu_percent'], 1)]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                item.setData(Qt.UserRole, row)
+                self.table.setItem(row, column, item)
+        self.rows = samples
+        self.table.setSortingEnabled(True)
+
+        if selected is not None:
+            for row in range(self.table.rowCount()):
+                if self.rows[self.table.item(row, 0).data(Qt.UserRole)]['browser'] is selected['browser']:
+                    self.table.selectRow(row)
+                    break
+
+    def selected_sample(self):
+        items = self.table.selectedItems()
+        if not items or not getattr(self, 'rows', None):
+            return None
+        return self.rows[items[0].data(Qt.UserRole)]
+
+    def reload_selected(self):
+        sample = self.selected_sample()
+        if sample and sample['browser'] is not None:
+            sample['browser'].reload()
+
+    def kill_selected(self):
+        """Terminate the renderer process of the selected tab"""
+        sample = self.selected_sample()
+        if not sample or sample['browser'] is None:
+            return
+        try:
+            os.kill(sample['pid'], signal.SIGKILL)
+        except OSError as e:
+            QMessageBox.warning(self, "Task Manager", f"Failed to end process: {e}")
+
+    def on_finished(self):
+        self.service.unwatch()
+        self.service.samples_updated.disconnect(self.show_samples)
@@ -0,0 +1,326 @@
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtWebEngineWidgets import *
+from .bookmark_manager import normalize_url
+
+THUMBNAIL_SIZE = QSize(320, 200)
+
+
+def thumbnail_key(widget):
+    """Cache key of the page shown by a tab widget, or None"""
+    url = widget.url().toString() if hasattr(widget, 'url') else ''
+    if not url or url == 'about:blank':
+        return None
+    return normalize_url(url)
+
+
+class ThumbnailService(QObject):
+    """Downscaled tab snapshots in a byte-budgeted LRU
+
+    Snapshots are only grabbed from the visible current tab: after it
+    finishes loading and just before the user switches away from it with
+    the tab bar. Only the grab runs on the GUI thread; scaling, compression
+    and disk access run on a worker thread. Thumbnails evicted from memory
+    are optionally spilled to disk as JPEG and read back on demand.
+    """
+
+    thumbnail_ready = pyqtSignal(str, QImage)
+    image_scaled = pyqtSignal(str, QImage)
+
+    def __init__(self, tab_manager, max_bytes=16 * 1024 * 1024, spill_dir=None,
+                 max_disk_bytes=64 * 1024 * 1024, capture_delay=500, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self.cache = OrderedDict()  # key -> QImage, least recently used first
+        self.cache_bytes = 0
+        self.stats = {'captures': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+
+        # Only touched by the worker thread
+        self.disk_index = OrderedDict()  # key -> (path, size)
+        self.disk_bytes = 0
+
+        self.pending_capture = None
+        self.capture_timer = QTimer(self)
+        self.capture_timer.setSingleShot(True)
+        self.capture_timer.setInterval(capture_delay)
+        self.capture_timer.timeout.connect(self.capture_pending)
+
+        self.requests = queue.Queue()
+        self.image_scaled.connect(self.on_image_scaled)
+        self.thread = threading.Thread(target=self._run, name="thumbnails", daemon=True)
+        self.thread.start()
+        if self.spill_dir:
+            self.requests.put(('clear',))
+
+        self.tab_manager.tabBarClicked.connect(self.on_tab_bar_clicked)
+
+    def attach(self, browser):
+        """Capture browser's page whenever it finishes loading"""
+        browser.loadFinished.connect(lambda ok: ok and self.schedule_capture(browser))
+
+    def schedule_capture(self, browser):
+        # Give the page a moment to paint before grabbing it
+        self.pending_capture = browser
+        self.capture_timer.start()
+
+    def capture_pending(self):
+        browser, self.pending_capture = self.pending_capture, None
+        try:
+            self.capture(browser)
+        except RuntimeError:
+            # The view was deleted while the capture was pending
+            pass
+
+    def on_tab_bar_clicked(self, index):
+        if index != self.tab_manager.currentIndex():
+            self.capture(self.tab_manager.currentWidget())
+
+    def capture(self, browser):
+        """Snapshot a visible browser view; returns False if it can't be captured"""
+        if not isinstance(browser, QWebEngineView) or browser is not self.tab_manager.currentWidget():
+            return False
+        if not browser.isVisible() or browser.window().isMinimized() or browser.width() <= 0:
+            return False
+        key = thumbnail_key(browser)
+        if not key:
+            return False
+        self.stats['captures'] += 1
+        self.requests.put(('scale', key, browser.grab().toImage()))
+        return True
+
+    def get(self, key):
+        """Cached thumbnail for key, or None
+
+        On a miss the thumbnail is looked up on disk in the background and
+        announced through thumbnail_ready if found.
+        """
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return image
+        self.stats['misses'] += 1
+        if self.spill_dir and key:
+            self.requests.put(('load', key))
+        return None
+
+    def on_image_scaled(self, key, image):
+        old = self.cache.pop(key, None)
+        if old is not None:
+            self.cache_bytes -= old.sizeInBytes()
+        self.cache[key] = image
+        self.cache_bytes += image.sizeInBytes()
+        while self.cache_bytes > self.max_bytes and len(self.cache) > 1:
+            evicted_key, evicted = self.cache.popitem(last=False)
+            self.cache_bytes -= evicted.sizeInBytes()
+            self.stats['evictions'] += 1
+            if self.spill_dir:
+                self.requests.put(('spill', evicted_key, evicted))
+        self.thumbnail_ready.emit(key, image)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['entries'] = len(self.cache)
+        stats['memory_bytes'] = self.cache_bytes
+        return stats
+
+    def stop(self):
+        self.requests.put(('stop',))
+
+    def _run(self):
+        while True:
+            request = self.requests.get()
+            op = request[0]
+            try:
+                if op == 'stop':
+                    return
+                if op == 'scale':
+                    _, key, image = request
+                    self._remove_spilled(key)
+                    scaled = image.scaled(THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    self.image_scaled.emit(key, scaled)
+                elif op == 'spill':
+                    self._spill(request[1], request[2])
+                elif op == 'load':
+                    self._load(request[1])
+                elif op == 'clear':
+                    self._clear_spill_dir()
+            except Exception as e:
+                print(f"Error processing thumbnail: {e}")
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.jpg')
+
+    def _spill(self, key, image):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self._remove_spilled(key)
+        path = self._spill_path(key)
+        if not image.save(path, 'JPG', 80):
+            return
+        size = os.path.getsize(path)
+        self.disk_index[key] = (path, size)
+        self.disk_bytes += size
+        while self.disk_bytes > self.max_disk_bytes and self.disk_index:
+            self._remove_spilled(next(iter(self.disk_index)))
+
+    def _load(self, key):
+        entry = self.disk_index.get(key)
+        if entry is None:
+            return
+        image = QImage(entry[0])
+        if image.isNull():
+            self._remove_spilled(key)
+            return
+        self.disk_index.move_to_end(key)
+        self.image_scaled.emit(key, image)
+
+    def _remove_spilled(self, key):
+        entry = self.disk_index.pop(key, None)
+        if entry is None:
+            return
+        self.disk_bytes -= entry[1]
+        try:
+            os.remove(entry[0])
+        except OSError:
+            pass
+
+    def _clear_spill_dir(self):
+        """Remove thumbnails left over from an earlier session"""
+        if not os.path.isdir(self.spill_dir):
+            return
+        for entry in os.scandir(self.spill_dir):
+            if entry.name.endswith('.jpg'):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class TabHoverPreview(QObject):
+    """Shows a tab's thumbnail below the tab bar while the mouse is over it"""
+
+    def __init__(self, service, tab_manager, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.tab_manager = tab_manager
+        self.tab_bar = tab_manager.tabBar()
+        self.hover_index = -1
+        self.hover_key = None
+
+        self.popup = QLabel(None, Qt.ToolTip)
+        self.popup.setStyleSheet("border: 1px solid #555; background-color: #2b2b2b;")
+
+        self.tab_bar.setMouseTracking(True)
+        self.tab_bar.installEventFilter(self)
+        self.service.thumbnail_ready.connect(self.on_thumbnail_ready)
+
+    def eventFilter(self, obj, event):
+        if obj is self.tab_bar:
+            if event.type() == QEvent.MouseMove:
+                self.on_hover(self.tab_bar.tabAt(event.pos()))
+            elif event.type() in (QEvent.Leave, QEvent.MouseButtonPress, QEvent.Hide):
+                self.hide_preview()
+        return False
+
+    def on_hover(self, index):
+        if index == self.hover_index:
+            return
+        self.hover_index = index
+        if index < 0 or index == self.tab_manager.currentIndex():
+            self.popup.hide()
+            self.hover_key = None
+            return
+        self.hover_key = thumbnail_key(self.tab_manager.widget(index))
+        image = self.service.get(self.hover_key) if self.hover_key else None
+        if image is None:
+            self.popup.hide()
+        else:
+            self.show_preview(image)
+
+    def on_thumbnail_ready(self, key, image):
+        if key == self.hover_key and self.hover_index >= 0:
+            self.show_preview(image)
+
+    def show_preview(self, image):
+        self.popup.setPixmap(QPixmap.fromImage(image))
+        self.popup.adjustSize()
+        rect = self.tab_bar.tabRect(self.hover_index)
+        self.popup.move(self.tab_bar.mapToGlobal(rect.bottomLeft()) + QPoint(0, 4))
+        self.popup.show()
+
+    def hide_preview(self):
+        self.hover_index = -1
+        self.hover_key = None
+        self.popup.hide()
+
+
+class TabOverviewDialog(QDialog):
+    """Grid of tab thumbnails; activating one switches to that tab"""
+
+    def __init__(self, service, tab_manager, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.tab_manager = tab_manager
+        self.items = {}  # key -> [QListWidgetItem]
+        self.setup_ui()
+        self.service.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.finished.connect(lambda: self.service.thumbnail_ready.disconnect(self.on_thumbnail_ready))
+        self.populate()
+
+    def setup_ui(self):
+        self.setWindowTitle("Tab Overview")
+        self.setGeometry(150, 150, 1100, 700)
+
+        layout = QVBoxLayout(self)
+        self.grid = QListWidget()
+        self.grid.setViewMode(QListView.IconMode)
+        self.grid.setIconSize(THUMBNAIL_SIZE)
+        self.grid.setResizeMode(QListView.Adjust)
+        self.grid.setMovement(QListView.Static)
+        self.grid.setUniformItemSizes(True)
+        self.grid.setSpacing(12)
+        self.grid.itemActivated.connect(self.activate_item)
+        layout.addWidget(self.grid)
+
+    def populate(self):
+        placeholder = QPixmap(THUMBNAIL_SIZE)
+        placeholder.fill(QColor('#3b3b3b'))
+        placeholder_icon = QIcon(placeholder)
+        current = self.tab_manager.currentIndex()
+
+        for index in range(self.tab_manager.count()):
+            widget = self.tab_manager.widget(index)
+            key = thumbnail_key(widget)
+            item = QListWidgetItem(self.tab_manager.tabText(index))
+            item.setData(Qt.UserRole, widget)
+            item.setToolTip(widget.url().toString() if hasattr(widget, 'url') else '')
+            image = self.service.get(key) if key else None
+            item.setIcon(QIcon(QPixmap.fromImage(image)) if image is not None else placeholder_icon)
+            if key:
+                self.items.setdefault(key, []).append(item)
+            self.grid.addItem(item)
+            if index == current:
+                self.grid.setCurrentItem(item)
+
+    def on_thumbnail_ready(self, key, image):
+        items = self.items.get(key)
+        if items:
+            icon = QIcon(QPixmap.fromImage(image))
+            for item in items:
+                item.setIcon(icon)
+
+    def activate_item(self, item):
+        index = self.tab_manager.indexOf(item.data(Qt.UserRole))
+        if index >= 0:
+            self.tab_manager.setCurrentIndex(index)
+        self.accept()
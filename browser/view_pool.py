@@ -0,0 +1,99 @@
+import os
+import statistics
+from collections import deque
+from PyQt5.QtCore import *
+from .tab_discarder import read_process_rss_mb
+
+
+class ViewPool(QObject):
+    """Pre-created browser views handed out to new tabs
+
+    Views are built by factory ahead of time, one per timer tick after a
+    short delay so refilling stays out of the way of input and painting.
+    The memory a view costs is measured from the process RSS while it is
+    created, and the pool stops growing when its views would exceed
+    memory_cap_mb or when can_grow() returns False.
+    """
+
+    def __init__(self, factory, size=2, memory_cap_mb=64, can_grow=None, refill_delay=500, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.size = size
+        self.memory_cap_mb = memory_cap_mb
+        self.can_grow = can_grow
+        self.views = deque()
+        self.view_cost_mb = None
+        self.started = False
+        self.hits = 0
+        self.misses = 0
+        self.open_times = deque(maxlen=200)
+
+        self.refill_timer = QTimer(self)
+        self.refill_timer.setSingleShot(True)
+        self.refill_timer.setInterval(refill_delay)
+        self.refill_timer.timeout.connect(self.refill_one)
+
+    def start(self):
+        """Begin filling the pool; call once the window is up"""
+        self.started = True
+        self.schedule_refill()
+
+    def schedule_refill(self):
+        if self.started and len(self.views) < self.size and not self.refill_timer.isActive():
+            self.refill_timer.start()
+
+    def refill_one(self):
+        if len(self.views) >= self.size:
+            return
+        if self.view_cost_mb and (len(self.views) + 1) * self.view_cost_mb > self.memory_cap_mb:
+            return
+        if self.can_grow and not self.can_grow():
+            return
+
+        before = read_process_rss_mb(os.getpid())
+        view = self.factory()
+        after = read_process_rss_mb(os.getpid())
+        if before is not None and after is not None:
+            cost = max(0.0, after - before)
+            self.view_cost_mb = cost if self.view_cost_mb is None else 0.8 * self.view_cost_mb + 0.2 * cost
+        self.views.append(view)
+        self.schedule_refill()
+
+    def checkout(self):
+        """A ready view from the pool, or a new one on a miss"""
+        if self.views:
+            self.hits += 1
+            view = self.views.popleft()
+        else:
+            self.misses += 1
+            view = self.factory()
+        self.schedule_refill()
+        return view
+
+    def record_open_time(self, ms):
+        self.open_times.append(ms)
+
+    def clear(self):
+        self.started = False
+        self.refill_timer.stop()
+        while self.views:
+            self.views.popleft().deleteLater()
+
+    def get_stats(self):
+        """Pool hit rate and recent tab-open latencies in ms"""
+        checkouts = self.hits + self.misses
+        stats = {
+            'size': len(self.views),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / checkouts if checkouts else 0.0,
+            'view_cost_mb': self.view_cost_mb,
+        }
+        if self.open_times:
+            ordered = sorted(self.open_times)
+            stats['tab_open_ms'] = {
+                'mean': statistics.mean(ordered),
+                'median': statistics.median(ordered),
+                'p90': ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+            }
+        return stats
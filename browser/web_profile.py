@@ -0,0 +1,54 @@
+import os
+from PyQt5.QtCore import *
+from PyQt5.QtWebEngineWidgets import *
+from .storage import get_data_dir
+
+
+PROFILE_NAME = "LightPy"
+
+
+def get_cache_dir():
+    """Per-user directory for the HTTP and code caches"""
+    path = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    if not path:
+        path = os.path.join(get_data_dir(), 'cache')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def apply_page_defaults(profile):
+    """Set the web settings every page inherits from the profile"""
+    settings = profile.settings()
+    settings.setAttribute(QWebEngineSettings.JavascriptEnabled, True)
+    settings.setAttribute(QWebEngineSettings.PluginsEnabled, True)
+    settings.setAttribute(QWebEngineSettings.FullScreenSupportEnabled, True)
+    settings.setAttribute(QWebEngineSettings.ScrollAnimatorEnabled, True)
+    settings.setAttribute(QWebEngineSettings.JavascriptCanOpenWindows, True)
+    settings.setAttribute(QWebEngineSettings.JavascriptCanAccessClipboard, True)
+    settings.setAttribute(QWebEngineSettings.LocalStorageEnabled, True)
+    settings.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, True)
+    settings.setAttribute(QWebEngineSettings.AllowRunningInsecureContent, True)
+
+
+def create_profile(settings, ephemeral=False, parent=None):
+    """Create the web profile shared by all tabs
+
+    The default profile keeps its HTTP cache, code cache and cookies on disk
+    so later sessions start warm. In ephemeral mode an off-the-record profile
+    is used instead and nothing is written to disk. Page settings are
+    applied to the profile once and inherited by every page.
+    """
+    if ephemeral:
+        profile = QWebEngineProfile(parent)
+        profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+        apply_page_defaults(profile)
+        return profile
+
+    profile = QWebEngineProfile(PROFILE_NAME, parent)
+    profile.setPersistentStoragePath(os.path.join(get_data_dir(), 'web_data'))
+    profile.setCachePath(os.path.join(get_cache_dir(), 'web_cache'))
+    profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+    profile.setHttpCacheMaximumSize(int(settings.get('cache_max_size_mb', 256)) * 1024 * 1024)
+    profile.setPersistentCookiesPolicy(QWebEngineProfile.AllowPersistentCookies)
+    apply_page_defaults(profile)
+    return profile
@@ -1,44 +1,68 @@
+import time
+START_TIME = time.perf_counter()
+
 import sys
 import os
-from PyQt5.QtCore import *
-from PyQt5.QtWidgets import *
-from PyQt5.QtWebEngineWidgets import *
-from PyQt5.QtGui import *
-from browser.browser_window import BrowserWindow
+import argparse
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+# QtWebEngineWidgets must be imported before the QApplication is created
+from PyQt5 import QtWebEngineWidgets
+from browser.startup_trace import startup_trace
+from browser.settings import PERFORMANCE_PROFILES, apply_performance_profile, read_settings, resolve_performance_profile
+
+def parse_args(argv):
+    """Parse browser command line options, leaving Qt options untouched"""
+    parser = argparse.ArgumentParser(description="LightPy Browser")
+    parser.add_argument('--ephemeral', action='store_true',
+                        help="use an off-the-record profile that keeps no cache or cookies on disk")
+    parser.add_argument('--startup-trace', action='store_true',
+                        help="print a timeline of startup milestones")
+    parser.add_argument('--perf-profile', choices=sorted(PERFORMANCE_PROFILES),
+                        help="engine performance profile; defaults to the 'performance_profile' setting")
+    
+    batch = parser.add_argument_group("batch mode", "render a list of URLs without a window")
+    batch.add_argument('--batch', metavar='URLS_FILE',
+                       help="file with one URL per line to render offscreen")
+    batch.add_argument('--out', default='batch_output', help="output directory")
+    batch.add_argument('--format', choices=['pdf', 'png', 'mhtml'], default='pdf', help="output format")
+    batch.add_argument('--concurrency', type=int, default=4, help="pages rendering in parallel")
+    batch.add_argument('--settle', type=int, default=1000, metavar='MS',
+                       help="time to wait after the page has loaded before capturing")
+    batch.add_argument('--timeout', type=float, default=30, metavar='SECONDS', help="per-URL time limit")
+    batch.add_argument('--viewport', default='1280x800', metavar='WxH', help="page size for PNG captures")
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
 
 def main():
+    args = parse_args(sys.argv)
+    startup_trace.start(START_TIME, enabled=args.startup_trace)
+    startup_trace.mark("imports-done")
+    
     # Enable high DPI scaling
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
-    # Clean up any old browser data
-    if os.path.exists("./web_data"):
-        import shutil
-        shutil.rmtree("./web_data")
-    if os.path.exists("./web_cache"):
-        import shutil
-        shutil.rmtree("./web_cache")
-    
-    # Enhanced flags for better compatibility
-    chrome_flags = [
-        '--ignore-certificate-errors',
-        '--ignore-ssl-errors',
-        '--no-sandbox',
-        '--disable-web-security',
-        '--allow-running-insecure-content',
-        '--disable-features=BlockInsecurePrivateNetworkRequests',
-        '--enable-features=NetworkServiceInProcess',
-        '--disable-site-isolation-trials',
-        '--disable-background-timer-throttling',
-        '--disable-renderer-backgrounding'
-    ]
+    # Chromium flags come from the selected performance profile
+    QApplication.setApplicationName("LightPy Browser")
+    settings = read_settings()
+    profile_name = resolve_performance_profile(args.perf_profile, settings)
+    flags = apply_performance_profile(profile_name, settings.get('extra_chromium_flags', []))
+    print(f"Performance profile: {profile_name} - {PERFORMANCE_PROFILES[profile_name]['description']}")
+    print(f"Chromium flags: {' '.join(flags)}")
     
-    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = ' '.join(chrome_flags)
     os.environ['QTWEBENGINE_DISABLE_SANDBOX'] = '1'
+    if args.batch:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
     
     app = QApplication(sys.argv)
     app.setApplicationName("LightPy Browser")
     app.setApplicationVersion("1.0.0")
+    startup_trace.mark("app-created")
+    
+    if args.batch:
+        from browser.batch import run_batch
+        sys.exit(run_batch(app, args))
     
     # Set style
     app.setStyle('Fusion')
@@ -46,9 +70,13 @@ def main():
     # Apply dark theme
     apply_dark_theme(app)
     
-    # Create and show main window
-    window = BrowserWindow()
+    # Create and show main window; the first tab is created after it paints
+    from browser.browser_window import BrowserWindow
+    startup_trace.mark("browser-imported")
+    window = BrowserWindow(ephemeral=args.ephemeral, performance_profile=profile_name)
+    startup_trace.mark("window-created")
     window.show()
+    startup_trace.mark("window-shown")
     
     sys.exit(app.exec_())
 
@@ -0,0 +1,91 @@
+import io
+import json
+
+from browser.bookmark_formats import (
+    READ_CHUNK, detect_format, parse_chrome_json, parse_netscape_html,
+    write_chrome_json, write_netscape_html,
+)
+
+TRICKY = [
+    {'url': 'https://example.com/search?q=a&b="c"', 'title': 'Fish & Chips <best> "ever"'},
+    {'url': 'https://example.org/', 'title': "It's <b>bold</b>"},
+    {'url': 'https://example.net/path', 'title': 'Plain'},
+]
+
+
+def round_trip(write, parse, bookmarks):
+    f = io.StringIO()
+    write(bookmarks, f)
+    return list(parse(io.StringIO(f.getvalue())))
+
+
+def test_detect_format():
+    assert detect_format('/tmp/bookmarks.html') == 'html'
+    assert detect_format('Export.HTM') == 'html'
+    assert detect_format('bookmarks.json') == 'json'
+    assert detect_format('/home/me/.config/google-chrome/Default/Bookmarks') == 'json'
+    assert detect_format('bookmarks.txt') is None
+
+
+def test_netscape_round_trip_escapes_titles_and_urls():
+    assert round_trip(write_netscape_html, parse_netscape_html, TRICKY) == TRICKY
+
+
+def test_chrome_json_round_trip():
+    assert round_trip(write_chrome_json, parse_chrome_json, TRICKY) == TRICKY
+
+
+def test_netscape_export_uses_url_for_empty_title():
+    f = io.StringIO()
+    write_netscape_html([{'url': 'https://example.com/', 'title': ''}], f)
+    assert list(parse_netscape_html(io.StringIO(f.getvalue()))) == [
+        {'url': 'https://example.com/', 'title': 'https://example.com/'}
+    ]
+
+
+def test_netscape_parses_folders_and_skips_script_urls():
+    source = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+    <DT><H3 ADD_DATE="1">Toolbar</H3>
+    <DL><p>
+        <DT><A HREF="https://a.example/" ADD_DATE="1700000000">A &amp; B &lt;tag&gt;</A>
+        <DT><A HREF="javascript:alert(1)">Bookmarklet</A>
+        <DT><A HREF="place:sort=8">Recent</A>
+    </DL><p>
+    <DT><A HREF="https://b.example/?x=1&amp;y=2">B</A>
+</DL><p>
+"""
+    assert list(parse_netscape_html(io.StringIO(source))) == [
+        {'url': 'https://a.example/', 'title': 'A & B <tag>'},
+        {'url': 'https://b.example/?x=1&y=2', 'title': 'B'},
+    ]
+
+
+def test_netscape_entries_split_across_read_chunks():
+    bookmarks = [{'url': f'https://site{i}.example/page', 'title': f'Site & {i}'} for i in range(5000)]
+    f = io.StringIO()
+    write_netscape_html(bookmarks, f)
+    assert len(f.getvalue()) > 3 * READ_CHUNK
+    assert list(parse_netscape_html(io.StringIO(f.getvalue()))) == bookmarks
+
+
+def test_chrome_json_flattens_folders_in_order_and_skips_script_urls():
+    data = {
+        'roots': {
+            'bookmark_bar': {'type': 'folder', 'children': [
+                {'type': 'url', 'name': 'One', 'url': 'https://one.example/'},
+                {'type': 'folder', 'name': 'Nested', 'children': [
+                    {'type': 'url', 'name': 'Two', 'url': 'https://two.example/'},
+                    {'type': 'url', 'name': 'Script', 'url': 'javascript:void(0)'},
+                ]},
+                {'type': 'url', 'name': 'Three', 'url': 'https://three.example/'},
+            ]},
+            'other': {'type': 'folder', 'children': [
+                {'type': 'url', 'name': 'Four', 'url': 'https://four.example/'},
+            ]},
+            'sync_transaction_version': '12',
+        },
+        'version': 1,
+    }
+    bookmarks = list(parse_chrome_json(io.StringIO(json.dumps(data))))
+    assert [b['title'] for b in bookmarks] == ['One', 'Two', 'Three', 'Four']
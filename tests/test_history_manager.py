@@ -0,0 +1,68 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from browser.history_manager import FTS_PREFIX, HistoryManager, has_fts5
+
+
+@pytest.fixture
+def history(tmp_path):
+    manager = HistoryManager(str(tmp_path / 'history.db'))
+    yield manager
+    manager.close()
+
+
+def add_visits(manager, url, title, count):
+    for i in range(count):
+        manager.add_visit(url, title, visit_time=time.time() - count + i)
+
+
+def test_search_orders_matches_by_visits(history):
+    add_visits(history, 'https://python.org/', 'Welcome to Python', 1)
+    add_visits(history, 'https://docs.python.org/', 'Python docs', 5)
+    add_visits(history, 'https://example.com/', 'Example', 9)
+    history.flush()
+    assert history.search('pyth') == [
+        ('https://docs.python.org/', 'Python docs', 5),
+        ('https://python.org/', 'Welcome to Python', 1),
+    ]
+    assert history.search('   ') == []
+
+
+def test_search_async_delivers_rows_on_the_search_thread(history):
+    add_visits(history, 'https://python.org/', 'Python', 2)
+    history.flush()
+    done = threading.Event()
+    results = []
+
+    def callback(rows):
+        results.append((threading.current_thread().name, rows))
+        done.set()
+
+    history.search_async('py', callback)
+    assert done.wait(5)
+    assert results == [('history-search', [('https://python.org/', 'Python', 2)])]
+
+
+@pytest.mark.skipif(not has_fts5(), reason="sqlite3 built without FTS5")
+def test_fts_table_without_prefix_indexes_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'history.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, "
+                 "title TEXT NOT NULL DEFAULT '', visit_count INTEGER NOT NULL DEFAULT 0, "
+                 "last_visit REAL NOT NULL DEFAULT 0)")
+    conn.execute("CREATE VIRTUAL TABLE urls_fts USING fts5(title, url, content='urls', content_rowid='id')")
+    conn.execute("INSERT INTO urls (url, title, visit_count, last_visit) VALUES ('https://a.example/', 'Alpha', 3, ?)",
+                 (time.time(),))
+    conn.commit()
+    conn.close()
+
+    manager = HistoryManager(path)
+    try:
+        sql = manager.reader.execute("SELECT sql FROM sqlite_master WHERE name = 'urls_fts'").fetchone()[0]
+        assert FTS_PREFIX in sql
+        assert manager.search('al') == [('https://a.example/', 'Alpha', 3)]
+    finally:
+        manager.close()
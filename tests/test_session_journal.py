@@ -0,0 +1,64 @@
+import json
+
+from browser.session_journal import load_session
+
+
+def write_journal(path, records, tail=''):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records) + tail)
+
+
+def tab(tab_id, url, pinned=False):
+    return {'op': 'tab', 'id': tab_id, 'url': url, 'title': url, 'history': None, 'pinned': pinned}
+
+
+def test_replays_order_closes_and_active_tab(tmp_path):
+    path = tmp_path / 'session.jsonl'
+    write_journal(path, [
+        tab(1, 'https://a.example/'),
+        tab(2, 'https://b.example/', pinned=True),
+        tab(3, 'https://c.example/'),
+        {'op': 'order', 'ids': [2, 1, 3]},
+        {'op': 'active', 'id': 3},
+        {'op': 'close', 'id': 1},
+        tab(3, 'https://c.example/next'),
+        {'op': 'order', 'ids': [2, 3]},
+    ])
+
+    tabs, active = load_session(str(path))
+
+    assert [t['url'] for t in tabs] == ['https://b.example/', 'https://c.example/next']
+    assert tabs[0]['pinned'] is True
+    assert active == 1
+
+
+def test_skips_torn_trailing_line(tmp_path):
+    path = tmp_path / 'session.jsonl'
+    write_journal(path, [
+        tab(1, 'https://a.example/'),
+        {'op': 'order', 'ids': [1]},
+        {'op': 'active', 'id': 1},
+    ], tail='{"op": "tab", "id": 2, "url": "https://b.exa')
+
+    tabs, active = load_session(str(path))
+
+    assert [t['url'] for t in tabs] == ['https://a.example/']
+    assert active == 0
+
+
+def test_tabs_missing_from_order_are_appended(tmp_path):
+    # A crash between a tab record and its order record must not lose the tab
+    path = tmp_path / 'session.jsonl'
+    write_journal(path, [
+        tab(1, 'https://a.example/'),
+        {'op': 'order', 'ids': [1]},
+        tab(2, 'https://b.example/'),
+    ])
+
+    tabs, active = load_session(str(path))
+
+    assert [t['url'] for t in tabs] == ['https://a.example/', 'https://b.example/']
+    assert active == 0
+
+
+def test_missing_journal_is_empty_session(tmp_path):
+    assert load_session(str(tmp_path / 'missing.jsonl')) == ([], 0)